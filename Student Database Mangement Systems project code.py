@@ -1,21 +1,26 @@
+from sdms import startup
+startup.begin() # Startup milestones are timed from here (see python -m sdms.startup)
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import sqlite3
 import os
 from ttkbootstrap import Style
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont, ImageTk
 import io
-import hashlib  # For password hashing
-
-# --- PDF Export Libraries ---
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-
-# --- Database Initialization ---
-DATABASE_NAME = "student_database.db"
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from sdms.backend import BackendError, make_backend
+from sdms.db import get_db_connection, manager as db_manager
+from sdms.jobs import JobRunner
+from sdms.media import ingest_photo, resolve_photo, split_photo
+from sdms.records import RecordError, RecordNotFound, format_receipt
+from sdms.result_cache import result_cache
+from sdms.search import row_matches
+from sdms import analytics, reports
+from sdms.thumbnails import LRUCache, thumbnail_cache
+startup.mark("imports")
+# Feature modules that pull in reportlab, PIL drawing, spreadsheets or the
+# migrations are imported where they are first used, not at startup.
 
 # --- Image Paths (update these paths as needed) ---
 LOGO_PATH = "logo.png"  # Path to your app logo image
@@ -23,154 +28,36 @@ COLLEGE_INFO_PATH = "college_info.png"  # Path to your college info image
 COLLEGE_VIEW_PATH = "college_view_bg.png"  # Path to your college view background image
 IDENTITY_CARD_BACKGROUND_PATH = "id_card_bg.png"  # Path to your ID card background image
 
-def hash_password(password):
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+# --- Window background ---
+BACKGROUND_FAST_MS = 30  # While resizing, rescale (with a cheap filter) at most this often
+BACKGROUND_SETTLE_MS = 200  # Redraw with the high-quality filter once resizing pauses this long
 
-def init_db():
-    conn = sqlite3.connect(DATABASE_NAME)
-    cursor = conn.cursor()
-
-    # Create users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            user_id TEXT PRIMARY KEY,
-            password_hash TEXT NOT NULL,
-            name TEXT NOT NULL,
-            role TEXT NOT NULL
-        )
-    ''')
-
-    # Insert a default admin user if not exists (for testing)
-    cursor.execute("INSERT OR IGNORE INTO users (user_id, password_hash, name, role) VALUES (?, ?, ?, ?)", ('admin', hash_password('admin'), 'Administrator', 'admin'))
-
-# Create faculties table
-conn = sqlite3.connect(DATABASE_NAME)
-cursor = conn.cursor()
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS faculties (
-        faculty_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        faculty_name TEXT NOT NULL UNIQUE
-    )
-''')
-# Insert sample faculties if not exists
-faculties = [('BCA',), ('BBA',), ('MCA',), ('IBCA',), ('IMCA',)]
-for faculty in faculties:
-    cursor.execute("INSERT OR IGNORE INTO faculties (faculty_name) VALUES (?)", faculty)
-
-# Create academic_years table
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS academic_years (
-        year_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        year_name TEXT NOT NULL UNIQUE
-    )
-''')
-# Insert sample academic years if not exists
-academic_years = [('First Year',), ('Second Year',), ('Third Year',), ('Fourth Year',), ('Fifth Year',)]
-for year in academic_years:
-    cursor.execute("INSERT OR IGNORE INTO academic_years (year_name) VALUES (?)", year)
-
-# Create students table with expanded fields
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS students (
-        student_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        roll_number TEXT UNIQUE NOT NULL,
-        user_id TEXT UNIQUE, -- Link to users table for login
-        name TEXT NOT NULL,
-        contact_number TEXT,
-        email TEXT,
-        address TEXT,
-        aadhaar_no TEXT UNIQUE,
-        date_of_birth TEXT,
-        gender TEXT,
-        tenth_percent REAL,
-        twelfth_percent REAL,
-        blood_group TEXT,
-        mother_name TEXT,
-        enrollment_status INTEGER DEFAULT 1, -- 1 for Yes, 0 for No
-        enrollment_date TEXT NOT NULL,
-        course_id INTEGER,
-        academic_year_id INTEGER,
-        faculty_id INTEGER,
-        profile_picture_path TEXT,
-        FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-        FOREIGN KEY (course_id) REFERENCES courses(course_id),
-        FOREIGN KEY (academic_year_id) REFERENCES academic_years(year_id),
-        FOREIGN KEY (faculty_id) REFERENCES faculties(faculty_id)
-    )
-''')
-
-# Create courses table (existing, ensure it's compatible)
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS courses (
-        course_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        course_name TEXT NOT NULL UNIQUE,
-        course_code TEXT UNIQUE,
-        duration TEXT,
-        department TEXT
-    )
-''')
-# Insert sample courses if not exists (ensure these match faculties)
-courses = [
-    ('Computer Applications', 'MCA', '2 Years', 'Computer Science'),
-    ('Business Administration', 'MBA', '2 Years', 'Management'),
-    ('Science', 'B.Sc', '3 Years', 'Science'),
-    ('Computer Applications', 'BCA', '3 Years', 'Computer Science'),
-    ('Computer Applications', 'IBCA', '5 Years', 'Computer Science'), # Integrated BCA
-    ('Computer Applications', 'IMCA', '5 Years', 'Computer Science')  # Integrated MCA
-]
-for course_name, course_code, duration, department in courses:
-    cursor.execute("INSERT OR IGNORE INTO courses (course_name, course_code, duration, department) VALUES (?, ?, ?, ?)",
-                   (course_name, course_code, duration, department))
-
-# Create marks table (existing)
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS marks (
-        mark_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        student_id INTEGER,
-        course_id INTEGER,
-        subject_name TEXT,
-        semester INTEGER,
-        marks_obtained REAL,
-        max_marks REAL,
-        grade TEXT,
-        FOREIGN KEY (student_id) REFERENCES students(student_id),
-        FOREIGN KEY (course_id) REFERENCES courses(course_id)
-    )
-''')
-
-# Create payments table (existing)
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS payments (
-        payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        student_id INTEGER,
-        amount_paid REAL NOT NULL,
-        payment_date TEXT NOT NULL,
-        payment_type TEXT,
-        receipt_number TEXT UNIQUE,
-        description TEXT,
-        FOREIGN KEY (student_id) REFERENCES students(student_id)
-    )
-''')
-
-# Create feedback table
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS feedback (
-        feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT,
-        email TEXT,
-        feedback_text TEXT NOT NULL,
-        timestamp TEXT NOT NULL
-    )
-''')
+# --- Data backend ---
+# Point SDMS_SERVER_URL at a shared "python -m sdms serve" process (e.g. http://office-pc:8765)
+# to work against its database; unset, the database file is opened directly.
+SERVER_URL = os.environ.get("SDMS_SERVER_URL")
+backend = make_backend(SERVER_URL)
+
+# --- Search-as-you-type ---
+SEARCH_DEBOUNCE_MS = 300  # Wait this long after the search text last changed before searching
+SEARCH_POLL_MS = 30  # How often the Tk loop checks for a finished background search
 
-conn.commit()
-conn.close()
+# --- Streaming report output ---
+REPORT_POLL_MS = 30  # How often queued report text is moved into its Text widget
+REPORT_QUEUE_CHUNKS = 16  # Chunks buffered ahead of the widget; the worker waits beyond this
 
-def get_db_connection():
-    return sqlite3.connect(DATABASE_NAME)
+def init_db():
+    """Creates or upgrades the database schema; a current database costs one PRAGMA read."""
+    from sdms.migrations import migrate, schema_is_current
+
+    conn = get_db_connection()
+    if not schema_is_current(conn):
+        migrate(conn)
 
 def load_image(path, size=None):
     try:
+        from PIL import Image, ImageTk
+
         img = Image.open(path)
         if size:
             img = img.resize(size, Image.LANCZOS)
@@ -310,24 +197,19 @@ class RegistrationWindow:
             return
 
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE user_id=?", (username,))
-            if cursor.fetchone():
-                messagebox.showerror("Registration Failed", "User ID already exists. Please choose a different one.", parent=self.reg_root)
-                conn.close()
-                return
-            hashed_pw = hash_password(password)
-            # Default role is 'student', email left blank for now
-            cursor.execute("INSERT INTO users (user_id, password_hash, name, role) VALUES (?, ?, ?, ?)", (username, hashed_pw, fullname, 'student'))
-            conn.commit()
-            messagebox.showinfo("Registration Successful", f"User '{fullname}' registered successfully! You can now log in.", parent=self.reg_root)
-            self.on_reg_window_close()
+            # New users get the 'student' role
+            backend.register_user(username, password, fullname)
+        except BackendError as e:
+            messagebox.showerror("Database Error", f"An error occurred during registration: {e}", parent=self.reg_root)
+            return
+        except RecordError as e:
+            messagebox.showerror("Registration Failed", str(e), parent=self.reg_root)
+            return
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"An error occurred during registration: {e}", parent=self.reg_root)
-        finally:
-            if conn:
-                conn.close()
+            return
+        messagebox.showinfo("Registration Successful", f"User '{fullname}' registered successfully! You can now log in.", parent=self.reg_root)
+        self.on_reg_window_close()
 
     def on_reg_window_close(self):
         self.reg_root.destroy()
@@ -403,22 +285,18 @@ class UpdatePasswordWindow:
             return
 
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT password_hash FROM users WHERE user_id=?", (username,))
-            row = cursor.fetchone()
-            if not row or hash_password(old_password) != row[0]:
-                messagebox.showerror("Authentication Failed", "User ID or old password is incorrect.", parent=self.update_root)
-                return
-            cursor.execute("UPDATE users SET password_hash=? WHERE user_id=?", (hash_password(new_password), username))
-            conn.commit()
-            messagebox.showinfo("Password Updated", "Password updated successfully! Please login with your new password.", parent=self.update_root)
-            self.on_update_window_close()
+            backend.change_password(username, old_password, new_password)
+        except BackendError as e:
+            messagebox.showerror("Database Error", f"An error occurred: {e}", parent=self.update_root)
+            return
+        except RecordError as e:
+            messagebox.showerror("Authentication Failed", str(e), parent=self.update_root)
+            return
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"An error occurred: {e}", parent=self.update_root)
-        finally:
-            if conn:
-                conn.close()
+            return
+        messagebox.showinfo("Password Updated", "Password updated successfully! Please login with your new password.", parent=self.update_root)
+        self.on_update_window_close()
 
     def on_update_window_close(self):
         self.update_root.destroy()
@@ -482,23 +360,17 @@ class LoginWindow:
             return
 
         try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
-            hashed_pw = hash_password(password)
-            cursor.execute("SELECT * FROM users WHERE user_id=? AND password_hash=?", (username, hashed_pw))
-            user = cursor.fetchone()
-            if user:
-                messagebox.showinfo("Login Successful", "Welcome to the Student Database Management System!", parent=self.login_root)
-                self.login_root.destroy()
-                self.master.deiconify()
-                MainApplication(self.master)
-            else:
-                messagebox.showerror("Login Failed", "Invalid User ID or password.", parent=self.login_root)
-        except sqlite3.Error as e:
+            user = backend.login(username, password)
+        except (sqlite3.Error, RecordError) as e:
             messagebox.showerror("Database Error", f"An error occurred: {e}", parent=self.login_root)
-        finally:
-            if conn:
-                conn.close()
+            return
+        if user:
+            messagebox.showinfo("Login Successful", "Welcome to the Student Database Management System!", parent=self.login_root)
+            self.login_root.destroy()
+            self.master.deiconify()
+            MainApplication(self.master)
+        else:
+            messagebox.showerror("Login Failed", "Invalid User ID or password.", parent=self.login_root)
 
     def open_registration_window(self):
         self.login_root.withdraw()
@@ -535,28 +407,77 @@ class MainApplication:
         # Load images for the application
         self.app_logo = load_image(LOGO_PATH, size=(50, 50))
         self.college_info_img = load_image(COLLEGE_INFO_PATH, size=(600, 150)) # Adjusted size for home page
-        self.college_view_bg = None # Will be loaded dynamically and resized
-        self.load_college_view_background() # Load it initially
+        self.college_view_bg = None # PhotoImage currently on the canvas, drawn on the first <Configure>
+        self.college_view_renderer = None
+        self._background_size = None # Canvas size the background should be drawn at
+        self._background_fast_id = None # Pending after() for a quick rescale while resizing
+        self._background_settle_id = None # Pending after() for the high-quality redraw
+        self.load_college_view_background()
 
+        self._profile_photos = LRUCache(256) # Thumbnail cache key -> ImageTk.PhotoImage
+
+        # Background jobs: results come back on the Tk thread via after()
+        self.jobs = JobRunner(self.master.after, on_change=self._update_job_status)
+        self._text_streams = {} # Text widget -> job currently streaming a report into it
+        self._last_report = None # (name, make_lines) of the report last shown on the Reports tab
 
         self.create_main_widgets()
+        self.create_status_bar()
+        # The custom title bar's close button and the window manager both end the application here
+        self.title_bar.close_button.config(command=self.on_main_window_close)
+        self.master.protocol("WM_DELETE_WINDOW", self.on_main_window_close)
+        startup.mark_first_paint(self.master, "main window painted")
+
+    def on_main_window_close(self):
+        """Cancels background work so its non-daemon threads don't keep the process alive, then closes."""
+        self.jobs.shutdown()
+        search_executor = getattr(self, "_search_executor", None) # Only there once the students tab was built
+        if search_executor is not None:
+            search_executor.shutdown(wait=False, cancel_futures=True)
+        self.master.destroy()
     
     def load_college_view_background(self):
-        """Loads and sets the college view background image."""
-        if os.path.exists(COLLEGE_VIEW_PATH):
-            original_image = Image.open(COLLEGE_VIEW_PATH)
-            # Resize it to fit the current window size
-            win_width = self.master.winfo_width()
-            win_height = self.master.winfo_height() - self.title_bar.winfo_height()
-            if win_width > 0 and win_height > 0:
-                resized_image = original_image.resize((win_width, win_height), Image.LANCZOS)
-                self.college_view_bg = ImageTk.PhotoImage(resized_image)
-            else:
-                # Default size if window size is not yet determined
-                self.college_view_bg = ImageTk.PhotoImage(original_image.resize((1200, 800 - self.title_bar.winfo_height()), Image.LANCZOS))
-        else:
+        """Prepares the college view background; it is scaled to the canvas as the window is sized."""
+        if not os.path.exists(COLLEGE_VIEW_PATH):
             messagebox.showerror("Image Error", f"College View Image file not found: {COLLEGE_VIEW_PATH}")
+            return
+        from PIL import ImageTk
+        from sdms.background import ScaledBackground
 
+        # The canvas never outgrows the screen, so neither does the master copy
+        screen_size = (self.master.winfo_screenwidth(), self.master.winfo_screenheight())
+        self.college_view_renderer = ScaledBackground(COLLEGE_VIEW_PATH, screen_size, convert=ImageTk.PhotoImage)
+
+    def _schedule_background(self, size):
+        """Redraws the background for size: quickly now and then, properly once resizing stops."""
+        if size == self._background_size:
+            return
+        self._background_size = size
+        if self.college_view_bg is None:
+            self._draw_background(fast=False) # First paint: go straight to the final image
+            return
+        if self._background_fast_id is None:
+            self._background_fast_id = self.master.after(BACKGROUND_FAST_MS, self._draw_background, True)
+        if self._background_settle_id is not None:
+            self.master.after_cancel(self._background_settle_id)
+        self._background_settle_id = self.master.after(BACKGROUND_SETTLE_MS, self._draw_background, False)
+
+    def _draw_background(self, fast):
+        if fast:
+            self._background_fast_id = None
+        else:
+            self._background_settle_id = None
+        width, height = self._background_size
+        if width < 2 or height < 2:
+            return
+        try:
+            self.college_view_bg = self.college_view_renderer.render((width, height), fast=fast)
+        except OSError as e:
+            self.college_view_renderer = None
+            messagebox.showerror("Image Error", f"Error loading image {COLLEGE_VIEW_PATH}: {e}")
+            return
+        self.canvas.itemconfigure(self.bg_image_id, image=self.college_view_bg)
+        self.canvas.tag_lower(self.bg_image_id)
 
     def create_main_widgets(self):
         # Create a main frame to hold the notebook (tabs)
@@ -565,8 +486,8 @@ class MainApplication:
         self.canvas.place(x=0, y=self.title_bar.winfo_height(), relwidth=1, relheight=1)
         self.canvas.bind('<Configure>', self._on_canvas_resize) # Bind resize event to canvas
 
-        if self.college_view_bg:
-            self.bg_image_id = self.canvas.create_image(0, 0, image=self.college_view_bg, anchor="nw")
+        if self.college_view_renderer:
+            self.bg_image_id = self.canvas.create_image(0, 0, anchor="nw")
         
         # Create a frame inside the canvas to hold the notebook
         self.content_frame = ttk.Frame(self.canvas, padding=10, style="Transparent.TFrame") # Transparent frame
@@ -592,54 +513,143 @@ class MainApplication:
         self.notebook = ttk.Notebook(self.content_frame)
         self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
 
-        # Tab 0: Home Page
-        home_frame = ttk.Frame(self.notebook, style="Transparent.TFrame") # Apply transparent style
-        self.notebook.add(home_frame, text="Home")
-        self.setup_home_tab(home_frame)
-
-        # Tab 1: Student Management
-        student_frame = ttk.Frame(self.notebook)
-        self.notebook.add(student_frame, text="Student Management")
-        self.setup_student_management_tab(student_frame)
-
-        # Tab 2: Reports
-        reports_frame = ttk.Frame(self.notebook)
-        self.notebook.add(reports_frame, text="Reports")
-        self.setup_reports_tab(reports_frame)
-
-        # Tab 3: ID Card Generation
-        id_card_frame = ttk.Frame(self.notebook)
-        self.notebook.add(id_card_frame, text="ID Card Generation")
-        self.setup_id_card_tab(id_card_frame)
-
-        # Tab 4: Receipt Generation
-        receipt_frame = ttk.Frame(self.notebook)
-        self.notebook.add(receipt_frame, text="Receipt Generation")
-        self.setup_receipt_tab(receipt_frame)
-
-        # Tab 5: Analytics & Insights
-        analytics_frame = ttk.Frame(self.notebook)
-        self.notebook.add(analytics_frame, text="Analytics & Insights")
-        self.setup_analytics_tab(analytics_frame)
-
-        # Tab 6: Feedback
-        feedback_frame = ttk.Frame(self.notebook)
-        self.notebook.add(feedback_frame, text="Feedback")
-        self.setup_feedback_tab(feedback_frame)
-
-        # Tab 7: Marks Entry
-        marks_entry_frame = ttk.Frame(self.notebook)
-        self.notebook.add(marks_entry_frame, text="Marks Entry")
-        self.setup_marks_entry_tab(marks_entry_frame)
+        # Tabs are built the first time they are selected, so only Home is built before the window shows
+        self._tab_builders = {} # Notebook tab id -> setup method, until the tab is built
+        self._add_tab("Home", self.setup_home_tab, style="Transparent.TFrame") # Tab 0
+        self._add_tab("Student Management", self.setup_student_management_tab) # Tab 1
+        self._add_tab("Reports", self.setup_reports_tab) # Tab 2
+        self._add_tab("ID Card Generation", self.setup_id_card_tab) # Tab 3
+        self._add_tab("Receipt Generation", self.setup_receipt_tab) # Tab 4
+        self._add_tab("Analytics & Insights", self.setup_analytics_tab) # Tab 5
+        self._add_tab("Feedback", self.setup_feedback_tab) # Tab 6
+        self._add_tab("Marks Entry", self.setup_marks_entry_tab) # Tab 7
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._build_tab(self.notebook.select())
+
+    def _add_tab(self, text, setup, style=None):
+        frame = ttk.Frame(self.notebook, style=style) if style else ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self._tab_builders[str(frame)] = setup
+
+    def _on_tab_changed(self, event):
+        self._build_tab(self.notebook.select())
+
+    def _build_tab(self, tab_id):
+        setup = self._tab_builders.pop(tab_id, None)
+        if setup is not None:
+            setup(self.notebook.nametowidget(tab_id))
+
+    def create_status_bar(self):
+        """Thin bar along the bottom edge listing running background jobs."""
+        self.status_bar = ttk.Frame(self.master, padding=(10, 2))
+        self.status_bar.place(relx=0, rely=1, relwidth=1, anchor="sw")
+        self.job_status_label = ttk.Label(self.status_bar, text="Ready", font=("Helvetica", 9))
+        self.job_status_label.pack(side="left")
+        self.job_cancel_button = ttk.Button(self.status_bar, text="Cancel", command=self.jobs.cancel_all, bootstyle="danger-link")
+        self.job_progress = ttk.Progressbar(self.status_bar, mode="indeterminate", length=120, bootstyle="info")
+
+    def _update_job_status(self, jobs):
+        if not hasattr(self, "job_status_label"):
+            return
+        if not jobs:
+            if backend.is_local:
+                stats = result_cache.stats()
+                self.job_status_label.config(text=f"Ready (report cache: {stats['hits']} hits, {stats['misses']} misses)")
+            else:
+                self.job_status_label.config(text=f"Ready (server: {SERVER_URL})")
+            self.job_progress.stop()
+            self.job_progress.pack_forget()
+            self.job_cancel_button.pack_forget()
+            return
+        self.job_status_label.config(text="Running: " + "; ".join(job.describe() for job in jobs))
+        if not self.job_progress.winfo_ismapped():
+            self.job_cancel_button.pack(side="right")
+            self.job_progress.pack(side="right", padx=5)
+            self.job_progress.start(15)
+        self.status_bar.lift()
+
+    def _needs_local_database(self, action, command=None):
+        """True if action may run here; otherwise explains that it needs the database file, and returns False.
+
+        Bulk imports, exports, PDFs and ID cards read and write the database
+        file directly and have no server endpoint, so with SDMS_SERVER_URL set
+        they are run on the server machine with the command line instead.
+        Photos live in the media store next to the database file, so uploads
+        are local only too.
+        """
+        if backend.is_local:
+            return True
+        message = (f"{action} works on the database file directly, so it is not available while "
+                   f"connected to {SERVER_URL}.")
+        if command:
+            message += f"\n\nRun it on the server machine instead:\n    python -m sdms {command}"
+        messagebox.showinfo("Not Available", message, parent=self.master)
+        return False
+
+    def run_job(self, name, func, *args, on_done=None, on_failed=None, error_title="Error", error_message=None, **kwargs):
+        """Runs func(job, *args) in the background and shows failures in a message box."""
+        def on_error(e):
+            messagebox.showerror(error_title, f"{error_message}: {e}" if error_message else str(e), parent=self.master)
+            if on_failed:
+                on_failed(e)
+        return self.jobs.submit(name, func, *args, on_done=on_done, on_error=on_error, **kwargs)
+
+    def _show_text(self, text_widget, content):
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete(1.0, tk.END)
+        text_widget.insert(tk.END, content)
+        text_widget.config(state=tk.DISABLED)
+
+    def stream_report(self, text_widget, name, make_lines):
+        """Runs make_lines() on a worker and shows its lines in text_widget as they are produced.
+
+        Text moves through a bounded queue in chunks, so the first lines appear
+        at once and a huge report never sits in memory or in one Tk insert.
+        """
+        previous = self._text_streams.get(text_widget)
+        if previous is not None:
+            previous.cancel()
+        chunks = queue.Queue(maxsize=REPORT_QUEUE_CHUNKS)
+
+        def produce(job):
+            for chunk in reports.iter_chunks(make_lines()):
+                while True:
+                    job.check_cancelled()
+                    try:
+                        chunks.put(chunk, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass # The widget is behind; wait rather than buffer
+
+        def drain():
+            if self._text_streams.get(text_widget) is not job:
+                return # Replaced by a newer report
+            text_widget.config(state=tk.NORMAL)
+            while True:
+                try:
+                    text_widget.insert(tk.END, chunks.get_nowait())
+                except queue.Empty:
+                    break
+            text_widget.config(state=tk.DISABLED)
+            if job.future.done() and chunks.empty():
+                del self._text_streams[text_widget]
+            else:
+                self.master.after(REPORT_POLL_MS, drain)
+
+        self._show_text(text_widget, "")
+        job = self.run_job(name, produce)
+        self._text_streams[text_widget] = job
+        self.master.after(REPORT_POLL_MS, drain)
+        return job
 
     def _on_canvas_resize(self, event):
-        """Resizes the content frame to fit the new canvas size (no background image)."""
+        """Resizes the content frame to fit the new canvas size and rescales the background."""
         new_width = event.width
         new_height = event.height
         self.canvas.coords(self.content_window_id, 0, 0)
         self.canvas.itemconfigure(self.content_window_id, width=new_width, height=new_height)
-        if self.college_view_bg:
-            self.canvas.tag_lower(self.bg_image_id)
+        if self.college_view_renderer:
+            self._schedule_background((new_width, new_height))
 
     # --- Home Tab ---
     def setup_home_tab(self, parent_frame):
@@ -754,16 +764,16 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
 
         row += 1
         ttk.Label(input_frame, text="Course:").grid(row=row, column=0, padx=5, pady=2, sticky="w")
-        self.student_course_combobox = ttk.Combobox(input_frame, values=self._get_course_names())
+        self.student_course_combobox = self._reference_combobox(input_frame, "courses")
         self.student_course_combobox.grid(row=row, column=1, padx=5, pady=2, sticky="ew")
 
         ttk.Label(input_frame, text="Academic Year:").grid(row=row, column=2, padx=5, pady=2, sticky="w")
-        self.student_academic_year_combobox = ttk.Combobox(input_frame, values=self._get_academic_year_names())
+        self.student_academic_year_combobox = self._reference_combobox(input_frame, "academic_years")
         self.student_academic_year_combobox.grid(row=row, column=3, padx=5, pady=2, sticky="ew")
 
         row += 1
         ttk.Label(input_frame, text="Faculty:").grid(row=row, column=0, padx=5, pady=2, sticky="w")
-        self.student_faculty_combobox = ttk.Combobox(input_frame, values=self._get_faculty_names())
+        self.student_faculty_combobox = self._reference_combobox(input_frame, "faculties")
         self.student_faculty_combobox.grid(row=row, column=1, padx=5, pady=2, sticky="ew")
 
         # Profile Picture Upload
@@ -773,7 +783,7 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         self.profile_pic_label.pack(fill="both", expand=True)
         upload_button = ttk.Button(profile_pic_frame, text="Upload Image", command=self.upload_profile_picture)
         upload_button.pack(pady=5)
-        self.profile_picture_path = "" # Store the path to the uploaded image
+        self.profile_photo = "" # Photo store hash (or legacy path) of the shown picture
 
         # CRUD Buttons
         button_frame = ttk.Frame(parent_frame, padding=10)
@@ -782,13 +792,23 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         ttk.Button(button_frame, text="Update Student", command=self.update_student, bootstyle="info").pack(side="left", padx=5)
         ttk.Button(button_frame, text="Delete Student", command=self.delete_student, bootstyle="danger").pack(side="left", padx=5)
         ttk.Button(button_frame, text="Clear Fields", command=self.clear_student_fields, bootstyle="secondary").pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Import Students (CSV/XLSX)", command=self.import_students_file, bootstyle="warning").pack(side="left", padx=5)
 
         # Search and Display
         search_frame = ttk.LabelFrame(parent_frame, text="Search & View Students", padding=10, bootstyle="primary")
         search_frame.pack(pady=10, padx=10, fill="both", expand=True)
-        ttk.Label(search_frame, text="Search by Roll No/Name:").pack(side="left", padx=5)
-        self.search_entry = ttk.Entry(search_frame, width=40)
+        ttk.Label(search_frame, text="Search by Roll No/Name/Email/Contact:").pack(side="left", padx=5)
+        # Traced rather than bound to key releases, so arrows, Shift or Tab don't search but a paste does
+        self.search_text = tk.StringVar()
+        self.search_text.trace_add("write", self._on_search_text_changed)
+        self.search_entry = ttk.Entry(search_frame, width=40, textvariable=self.search_text)
         self.search_entry.pack(side="left", padx=5, fill="x", expand=True)
+        self.search_entry.bind("<Return>", lambda event: self.search_students())
+        self._search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="student-search")
+        self._search_after_id = None
+        self._search_generation = 0 # Bumped on every new search so stale results are dropped
+        self._student_list_search = "" # Search term whose results student_tree shows; "" for all students
+        self._student_rows = {} # Treeview iid (the student_id) -> StudentRow it shows, read back by the detail form
         ttk.Button(search_frame, text="Search", command=self.search_students, bootstyle="primary").pack(side="left", padx=5)
         ttk.Button(search_frame, text="Refresh", command=lambda: self.display_students(), bootstyle="primary").pack(side="left", padx=5)
 
@@ -828,10 +848,10 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
                    command=lambda: export_student_marks_pdf(self),
                    bootstyle="info").pack(side="left", padx=5)
 
-        # Scrollbar for treeview
-        scrollbar = ttk.Scrollbar(search_frame, orient="vertical", command=self.student_tree.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.student_tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar for treeview; scrolling near the bottom loads the next page of students
+        self.student_scrollbar = ttk.Scrollbar(search_frame, orient="vertical", command=self.student_tree.yview)
+        self.student_scrollbar.pack(side="right", fill="y")
+        self.student_tree.configure(yscrollcommand=self._on_student_tree_scroll)
 
         hscrollbar = ttk.Scrollbar(search_frame, orient="horizontal", command=self.student_tree.xview)
         hscrollbar.pack(side="bottom", fill="x")
@@ -841,143 +861,102 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         self.display_students() # Initial display
 
 
-    def _get_course_names(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT course_name FROM courses")
-        courses = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return courses
-
-    def _get_academic_year_names(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT year_name FROM academic_years")
-        years = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return years
-
-    def _get_faculty_names(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT faculty_name FROM faculties")
-        faculties = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return faculties
+    def _reference_combobox(self, parent, kind, blank=False, **options):
+        """Combobox of course, academic year or faculty names; re-filled on opening if the registry has changed."""
+        combobox = ttk.Combobox(parent, **options)
+        shown_version = None
+
+        def refresh():
+            nonlocal shown_version
+            reference = backend.reference_names()
+            if reference["version"] != shown_version:
+                shown_version = reference["version"]
+                combobox["values"] = [""] + reference[kind] if blank else reference[kind]
+
+        combobox.configure(postcommand=refresh)
+        refresh()
+        return combobox
 
     def upload_profile_picture(self):
+        if not self._needs_local_database("Uploading a photo"):
+            return
         file_path = filedialog.askopenfilename(
             title="Select Profile Picture",
             filetypes=[("Image files", "*.jpg *.jpeg *.png *.gif")]
         )
         if file_path:
+            # Decoding, cropping and re-encoding a camera photo takes a moment; keep the form responsive
+            self.profile_pic_label.config(image="", text="Processing...")
+            self.run_job("Photo upload", lambda job: ingest_photo(file_path),
+                         on_done=self._show_profile_photo, on_failed=lambda e: self._show_profile_photo(""),
+                         error_title="Image Error", error_message="Failed to load image")
+        else:
+            self._show_profile_photo("")
+
+    def _show_profile_photo(self, photo):
+        """Shows a stored photo (store hash or legacy path) on the form and remembers it for saving."""
+        path = resolve_photo(photo)
+        if path:
             try:
-                self.profile_picture_path = file_path
-                img = Image.open(file_path)
-                img = img.resize((100, 100), Image.LANCZOS)
-                self.profile_pic_display = ImageTk.PhotoImage(img)
+                self.profile_photo = photo
+                self.profile_pic_display = self._profile_photo(path, (100, 100))
                 self.profile_pic_label.config(image=self.profile_pic_display, text="")
                 self.profile_pic_label.image = self.profile_pic_display
-            except Exception as e:
-                messagebox.showerror("Image Error", f"Failed to load image: {e}")
-                self.profile_picture_path = ""
-                self.profile_pic_label.config(image="", text="No Image")
-        else:
-            self.profile_picture_path = ""
-            self.profile_pic_label.config(image="", text="No Image")
+                return
+            except Exception:
+                pass
+        self.profile_photo = ""
+        self.profile_pic_label.config(image="", text="No Image")
 
-    def add_student(self):
-        roll_number = self.student_roll_entry.get().strip()
-        name = self.student_name_entry.get().strip()
-        contact_number = self.student_contact_entry.get().strip()
-        email = self.student_email_entry.get().strip()
-        address = self.student_address_entry.get().strip()
-        aadhaar_no = self.student_aadhaar_entry.get().strip()
-        date_of_birth = self.student_dob_entry.get().strip()
-        gender = self.student_gender_combobox.get().strip()
-        tenth_percent = self.student_tenth_entry.get().strip()
-        twelfth_percent = self.student_twelfth_entry.get().strip()
-        blood_group = self.student_blood_group_entry.get().strip()
-        mother_name = self.student_mother_name_entry.get().strip()
-        enrollment_status = 1 if self.student_enrollment_status_combobox.get() == "Yes" else 0
-        enrollment_date = self.student_enrollment_date_entry.get().strip()
-        course_name = self.student_course_combobox.get().strip()
-        academic_year_name = self.student_academic_year_combobox.get().strip()
-        faculty_name = self.student_faculty_combobox.get().strip()
-        profile_picture_path = self.profile_picture_path
-
-        if not all([roll_number, name, enrollment_date, course_name, academic_year_name, faculty_name]):
-            messagebox.showwarning("Input Error", "Roll Number, Name, Enrollment Date, Course, Academic Year, and Faculty are required fields.")
-            return
-
-        # Validate numeric fields
-        try:
-            tenth_percent = float(self.student_tenth_entry.get().strip()) if self.student_tenth_entry.get().strip() else None
-            twelfth_percent = float(self.student_twelfth_entry.get().strip()) if self.student_twelfth_entry.get().strip() else None
-        except ValueError:
-            messagebox.showerror("Input Error", "10th % and 12th % must be numbers.")
-            return
+    def _profile_photo(self, path, size):
+        """PhotoImage of a profile picture at size, served from the thumbnail caches."""
+        key = thumbnail_cache.key(path, size)
+        photo = self._profile_photos.get(key)
+        if photo is None:
+            from PIL import ImageTk
+
+            photo = ImageTk.PhotoImage(thumbnail_cache.open(path, size))
+            self._profile_photos.put(key, photo)
+        return photo
+
+    def _student_form_record(self):
+        """The student form as a record for sdms.records (validated there)."""
+        photo_hash, profile_picture_path = split_photo(self.profile_photo)
+        return {
+            "roll_number": self.student_roll_entry.get(),
+            "name": self.student_name_entry.get(),
+            "contact_number": self.student_contact_entry.get(),
+            "email": self.student_email_entry.get(),
+            "address": self.student_address_entry.get(),
+            "aadhaar_no": self.student_aadhaar_entry.get(),
+            "date_of_birth": self.student_dob_entry.get(),
+            "gender": self.student_gender_combobox.get(),
+            "tenth_percent": self.student_tenth_entry.get(),
+            "twelfth_percent": self.student_twelfth_entry.get(),
+            "blood_group": self.student_blood_group_entry.get(),
+            "mother_name": self.student_mother_name_entry.get(),
+            "enrollment_status": self.student_enrollment_status_combobox.get(),
+            "enrollment_date": self.student_enrollment_date_entry.get(),
+            "course_name": self.student_course_combobox.get(),
+            "academic_year_name": self.student_academic_year_combobox.get(),
+            "faculty_name": self.student_faculty_combobox.get(),
+            "profile_picture_path": profile_picture_path,
+            "photo_hash": photo_hash,
+        }
 
-        # Validate date fields
+    def add_student(self):
         try:
-            if self.student_dob_entry.get().strip():
-                datetime.strptime(self.student_dob_entry.get().strip(), "%Y-%m-%d")
-            datetime.strptime(self.student_enrollment_date_entry.get().strip(), "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Input Error", "Date fields must be in YYYY-MM-DD format.")
+            student_id = backend.add_student(self._student_form_record())
+        except RecordError as e:
+            messagebox.showerror("Error", str(e))
             return
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            # Get course_id
-            cursor.execute("SELECT course_id FROM courses WHERE course_name=?", (course_name,))
-            course_id = cursor.fetchone()
-            if not course_id:
-                messagebox.showerror("Error", f"Course '{course_name}' not found.")
-                return
-            course_id = course_id[0]
-
-            # Get academic_year_id
-            cursor.execute("SELECT year_id FROM academic_years WHERE year_name=?", (academic_year_name,))
-            academic_year_id = cursor.fetchone()
-            if not academic_year_id:
-                messagebox.showerror("Error", f"Academic Year '{academic_year_name}' not found.")
-                return
-            academic_year_id = academic_year_id[0]
-
-            # Get faculty_id
-            cursor.execute("SELECT faculty_id FROM faculties WHERE faculty_name=?", (faculty_name,))
-            faculty_id = cursor.fetchone()
-            if not faculty_id:
-                messagebox.showerror("Error", f"Faculty '{faculty_name}' not found.")
-                return
-            faculty_id = faculty_id[0]
-            
-            cursor.execute("""
-                INSERT INTO students (
-                    roll_number, name, contact_number, email, address, aadhaar_no,
-                    date_of_birth, gender, tenth_percent, twelfth_percent, blood_group,
-                    mother_name, enrollment_status, enrollment_date, course_id,
-                    academic_year_id, faculty_id, profile_picture_path
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                roll_number, name, contact_number, email, address, aadhaar_no,
-                date_of_birth, gender, tenth_percent, twelfth_percent, blood_group,
-                mother_name, enrollment_status, enrollment_date, course_id,
-                academic_year_id, faculty_id, profile_picture_path
-            ))
-            conn.commit()
-            messagebox.showinfo("Success", "Student added successfully!")
-            self.clear_student_fields()
-            self.display_students()
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Error", "Roll Number or Aadhaar Number already exists.")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
-        finally:
-            if conn:
-                conn.close()
+            return
+        messagebox.showinfo("Success", "Student added successfully!")
+        self.clear_student_fields()
+        # Newest first, as the list is ordered; while search results are shown, only if the student matches
+        self._reload_student_item(student_id, index=0, search_term=self._student_list_search)
 
     def update_student(self):
         selected_item = self.student_tree.focus()
@@ -985,95 +964,18 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
             messagebox.showwarning("No Selection", "Please select a student to update.")
             return
 
-        student_id = self.student_tree.item(selected_item, "values")[0]
-
-        roll_number = self.student_roll_entry.get().strip()
-        name = self.student_name_entry.get().strip()
-        contact_number = self.student_contact_entry.get().strip()
-        email = self.student_email_entry.get().strip()
-        address = self.student_address_entry.get().strip()
-        aadhaar_no = self.student_aadhaar_entry.get().strip()
-        date_of_birth = self.student_dob_entry.get().strip()
-        gender = self.student_gender_combobox.get().strip()
-        tenth_percent = self.student_tenth_entry.get().strip()
-        twelfth_percent = self.student_twelfth_entry.get().strip()
-        blood_group = self.student_blood_group_entry.get().strip()
-        mother_name = self.student_mother_name_entry.get().strip()
-        enrollment_status = 1 if self.student_enrollment_status_combobox.get() == "Yes" else 0
-        enrollment_date = self.student_enrollment_date_entry.get().strip()
-        course_name = self.student_course_combobox.get().strip()
-        academic_year_name = self.student_academic_year_combobox.get().strip()
-        faculty_name = self.student_faculty_combobox.get().strip()
-        profile_picture_path = self.profile_picture_path
-
-        if not all([roll_number, name, enrollment_date, course_name, academic_year_name, faculty_name]):
-            messagebox.showwarning("Input Error", "Roll Number, Name, Enrollment Date, Course, Academic Year, and Faculty are required fields.")
-            return
-
+        student_id = int(selected_item)
         try:
-            tenth_percent = float(self.student_tenth_entry.get().strip()) if self.student_tenth_entry.get().strip() else None
-            twelfth_percent = float(self.student_twelfth_entry.get().strip()) if self.student_twelfth_entry.get().strip() else None
-        except ValueError:
-            messagebox.showerror("Input Error", "10th % and 12th % must be numbers.")
-            return
-        try:
-            if self.student_dob_entry.get().strip():
-                datetime.strptime(self.student_dob_entry.get().strip(), "%Y-%m-%d")
-            datetime.strptime(self.student_enrollment_date_entry.get().strip(), "%Y-%m-%d")
-        except ValueError:
-            messagebox.showerror("Input Error", "Date fields must be in YYYY-MM-DD format.")
+            backend.update_student(student_id, self._student_form_record())
+        except RecordError as e:
+            messagebox.showerror("Error", str(e))
             return
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            # Get course_id
-            cursor.execute("SELECT course_id FROM courses WHERE course_name=?", (course_name,))
-            course_id = cursor.fetchone()
-            if not course_id:
-                messagebox.showerror("Error", f"Course '{course_name}' not found.")
-                return
-            course_id = course_id[0]
-
-            # Get academic_year_id
-            cursor.execute("SELECT year_id FROM academic_years WHERE year_name=?", (academic_year_name,))
-            academic_year_id = cursor.fetchone()
-            if not academic_year_id:
-                messagebox.showerror("Error", f"Academic Year '{academic_year_name}' not found.")
-                return
-            academic_year_id = academic_year_id[0]
-
-            # Get faculty_id
-            cursor.execute("SELECT faculty_id FROM faculties WHERE faculty_name=?", (faculty_name,))
-            faculty_id = cursor.fetchone()
-            if not faculty_id:
-                messagebox.showerror("Error", f"Faculty '{faculty_name}' not found.")
-                return
-            faculty_id = faculty_id[0]
-
-            cursor.execute("""
-                UPDATE students SET
-                    roll_number=?, name=?, contact_number=?, email=?, address=?, aadhaar_no=?,
-                    date_of_birth=?, gender=?, tenth_percent=?, twelfth_percent=?, blood_group=?,
-                    mother_name=?, enrollment_status=?, enrollment_date=?, course_id=?,
-                    academic_year_id=?, faculty_id=?, profile_picture_path=?
-                WHERE student_id=?
-            """, (
-                roll_number, name, contact_number, email, address, aadhaar_no,
-                date_of_birth, gender, tenth_percent, twelfth_percent, blood_group,
-                mother_name, enrollment_status, enrollment_date, course_id,
-                academic_year_id, faculty_id, profile_picture_path, student_id
-            ))
-            conn.commit()
-            messagebox.showinfo("Success", "Student updated successfully!")
-            self.clear_student_fields()
-            self.display_students()
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Error", "Roll Number or Aadhaar Number already exists for another student.")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {e}")
-        finally:
-            if conn:
-                conn.close()
+            return
+        messagebox.showinfo("Success", "Student updated successfully!")
+        self._reload_student_item(student_id)
+        self.load_selected_student(None) # The form shows the values as stored
 
     def delete_student(self):
         selected_item = self.student_tree.focus()
@@ -1081,23 +983,52 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
             messagebox.showwarning("No Selection", "Please select a student to delete.")
             return
 
-        student_id = self.student_tree.item(selected_item, "values")[0]
-        name = self.student_tree.item(selected_item, "values")[2] # Get name for confirmation
+        student_id = int(selected_item)
+        name = self._student_rows[selected_item].name # Get name for confirmation
 
-        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete student: {name} (ID: {student_id})?"):
-            conn = get_db_connection()
-            cursor = conn.cursor()
+        if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete student: {name} (ID: {student_id})?\n\nTheir marks will be deleted too."):
             try:
-                cursor.execute("DELETE FROM students WHERE student_id=?", (student_id,))
-                conn.commit()
-                messagebox.showinfo("Success", "Student deleted successfully!")
-                self.clear_student_fields()
-                self.display_students()
+                backend.delete_student(student_id)
+            except BackendError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            except RecordError as e:
+                messagebox.showwarning("Cannot Delete", str(e))
+                return
             except Exception as e:
                 messagebox.showerror("Error", f"An error occurred: {e}")
-            finally:
-                if conn:
-                    conn.close()
+                return
+            messagebox.showinfo("Success", "Student deleted successfully!")
+            self.clear_student_fields()
+            self._remove_student_item(student_id)
+
+    def import_students_file(self):
+        """Bulk-imports students from a spreadsheet in the background."""
+        if not self._needs_local_database("Importing students", "import students.csv"):
+            return
+        file_path = filedialog.askopenfilename(
+            title="Select Student Spreadsheet",
+            filetypes=[("Spreadsheets", "*.csv *.xlsx"), ("CSV files", "*.csv"), ("Excel files", "*.xlsx")]
+        )
+        if not file_path:
+            return
+        self.run_job(f"Importing {os.path.basename(file_path)}",
+                     self._import_students_job, file_path,
+                     error_title="Import Error", error_message="Failed to import students",
+                     on_done=self._on_students_imported)
+
+    def _import_students_job(self, job, file_path):
+        from sdms.importer import import_students
+
+        return import_students(get_db_connection(), file_path, job)
+
+    def _on_students_imported(self, result):
+        if result.errors:
+            messagebox.showwarning("Import Finished", result.summary())
+        else:
+            messagebox.showinfo("Import Finished", result.summary())
+        if result.inserted:
+            self.display_students()
 
     def clear_student_fields(self):
         self.student_roll_entry.delete(0, tk.END)
@@ -1118,121 +1049,167 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         self.student_course_combobox.set("")
         self.student_academic_year_combobox.set("")
         self.student_faculty_combobox.set("")
-        self.profile_picture_path = ""
-        self.profile_pic_label.config(image="", text="No Image")
+        self._show_profile_photo("")
 
 
     def display_students(self):
-        for item in self.student_tree.get_children():
-            self.student_tree.delete(item)
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT s.*, c.course_name, a.year_name, f.faculty_name
-            FROM students s
-            LEFT JOIN courses c ON s.course_id = c.course_id
-            LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
-            LEFT JOIN faculties f ON s.faculty_id = f.faculty_id
-            ORDER BY s.student_id DESC
-        """)
-        students = cursor.fetchall()
-        conn.close()
-
-        for student in students:
-            # Ensure all values are strings for insertion into Treeview
-            student_data = [str(x) if x is not None else "N/A" for x in student]
-            # Replace enrollment status (1=Yes, 0=No)
-            enroll_status_text = "Yes" if student[13] == 1 else "No"
-            student_data[13] = enroll_status_text # Update the status in the list
+        """Shows the newest students first; older pages load as the list is scrolled."""
+        self._search_generation += 1
+        self._reset_student_list(backend.students_page)
 
-            self.student_tree.insert("", "end", values=student_data)
+    def _on_search_text_changed(self, *args):
+        if self._search_after_id is not None:
+            self.master.after_cancel(self._search_after_id)
+        self._search_after_id = self.master.after(SEARCH_DEBOUNCE_MS, self.search_students)
 
     def search_students(self):
-        search_term = self.search_entry.get().strip()
-        for item in self.student_tree.get_children():
-            self.student_tree.delete(item)
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        query = """
-            SELECT s.*, c.course_name, a.year_name, f.faculty_name
-            FROM students s
-            LEFT JOIN courses c ON s.course_id = c.course_id
-            LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
-            LEFT JOIN faculties f ON s.faculty_id = f.faculty_id
-            WHERE s.roll_number LIKE ? OR s.name LIKE ?
-            ORDER BY s.student_id DESC
+        """Ranked prefix search over name, roll number, email, contact and mother's name.
+
+        The query runs on a background thread; only the newest search's results
+        reach student_tree.
         """
-        cursor.execute(query, (f"%{search_term}%", f"%{search_term}%"))
-        students = cursor.fetchall()
-        conn.close()
+        if self._search_after_id is not None:
+            self.master.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        search_term = self.search_text.get().strip()
+        if not search_term:
+            self.display_students()
+            return
+        self._search_generation += 1
+        page_loader = lambda cursor: backend.search_students(search_term, cursor)
+        future = self._search_executor.submit(page_loader, None)
+        self._poll_search(future, self._search_generation, page_loader, search_term)
+
+    def _poll_search(self, future, generation, page_loader, search_term):
+        if generation != self._search_generation:
+            future.cancel() # Superseded by a newer keystroke or a refresh
+            return
+        if not future.done():
+            self.master.after(SEARCH_POLL_MS, self._poll_search, future, generation, page_loader, search_term)
+            return
+        try:
+            first_page = future.result()
+        except (sqlite3.Error, RecordError) as e:
+            messagebox.showerror("Database Error", f"Search failed: {e}")
+            return
+        self._reset_student_list(page_loader, first_page, search_term)
+
+    def _reset_student_list(self, page_loader, first_page=None, search_term=""):
+        """Empties student_tree and fills it from page_loader(cursor) -> (rows, next_cursor).
 
+        first_page, if given, is an already fetched (rows, next_cursor) result;
+        search_term is the search those rows answer, if any.
+        """
+        self.student_tree.delete(*self.student_tree.get_children())
+        self._student_rows.clear()
+        self._student_list_search = search_term
+        self._student_page_loader = page_loader
+        self._student_page_cursor = None
+        self._student_list_exhausted = False
+        self._student_page_pending = False
+        self._load_next_student_page(first_page)
+
+    def _load_next_student_page(self, page=None):
+        self._student_page_pending = False
+        if self._student_list_exhausted:
+            return
+        if page is None:
+            try:
+                page = self._student_page_loader(self._student_page_cursor)
+            except (sqlite3.Error, RecordError) as e:
+                # The list keeps what it has; scrolling to the end again retries
+                messagebox.showerror("Database Error", f"Failed to load students: {e}")
+                return
+        students, self._student_page_cursor = page
         for student in students:
-            student_data = [str(x) if x is not None else "N/A" for x in student]
-            enroll_status_text = "Yes" if student[13] == 1 else "No"
-            student_data[13] = enroll_status_text
-            self.student_tree.insert("", "end", values=student_data)
+            self._put_student_item(student)
+        if self._student_page_cursor is None:
+            self._student_list_exhausted = True
+
+    # Single-student changes touch only that student's item, keyed by student_id,
+    # so an edit costs the same however many students are listed and keeps the
+    # scroll position and selection. Only Refresh, searches and imports reload the list.
+    def _put_student_item(self, student, index="end"):
+        """Updates the student's item in place, or inserts one at index if it is not listed."""
+        iid = str(student.student_id)
+        if self.student_tree.exists(iid):
+            self.student_tree.item(iid, values=student.list_values())
+        else:
+            self.student_tree.insert("", index, iid=iid, values=student.list_values())
+        self._student_rows[iid] = student
+
+    def _remove_student_item(self, student_id):
+        iid = str(student_id)
+        if self.student_tree.exists(iid):
+            self.student_tree.delete(iid)
+        self._student_rows.pop(iid, None)
+
+    def _reload_student_item(self, student_id, index="end", search_term=""):
+        """Reads one student back after a change and shows it with _put_student_item.
+
+        With a search_term, a student not yet listed is only added if it matches.
+        """
+        try:
+            student = backend.get_student(student_id)
+        except RecordNotFound:
+            self._remove_student_item(student_id)
+            return
+        except Exception:
+            self.display_students() # The change was saved but cannot be read back; show the list afresh
+            return
+        if search_term and not self.student_tree.exists(str(student_id)) and not row_matches(student, search_term):
+            return
+        self._put_student_item(student, index)
+
+    def _on_student_tree_scroll(self, first, last):
+        self.student_scrollbar.set(first, last)
+        # Fetch the next page once the last tenth of the loaded rows is visible
+        if float(last) >= 0.9 and not self._student_list_exhausted and not self._student_page_pending:
+            self._student_page_pending = True
+            self.student_tree.after_idle(self._load_next_student_page)
 
     def load_selected_student(self, event):
         selected_item = self.student_tree.focus()
         if not selected_item:
             return
 
-        values = self.student_tree.item(selected_item, "values")
-        # values[0] is student_id, values[1] is roll_number, etc.
-        # Ensure there are enough values before trying to access them
-        if len(values) < 18: # Check against the number of columns in the treeview
-            messagebox.showwarning("Data Error", "Incomplete student data selected.")
-            self.clear_student_fields()
+        # The row fetched for the list already holds every field the form shows, photo included
+        student = self._student_rows.get(selected_item)
+        if student is None:
             return
 
         self.clear_student_fields() # Clear previous data
 
-        self.student_roll_entry.insert(0, values[1])
-        self.student_name_entry.insert(0, values[2])
-        self.student_contact_entry.insert(0, values[3])
-        self.student_email_entry.insert(0, values[4])
-        self.student_address_entry.insert(0, values[5])
-        self.student_aadhaar_entry.insert(0, values[6])
-        self.student_dob_entry.insert(0, values[7])
-        self.student_gender_combobox.set(values[8])
-        self.student_tenth_entry.insert(0, values[9])
-        self.student_twelfth_entry.insert(0, values[10])
-        self.student_blood_group_entry.insert(0, values[11])
-        self.student_mother_name_entry.insert(0, values[12])
-        self.student_enrollment_status_combobox.set(values[13])
-        self.student_enrollment_date_entry.insert(0, values[14])
-        self.student_course_combobox.set(values[15])
-        self.student_academic_year_combobox.set(values[16])
-        self.student_faculty_combobox.set(values[17])
-
-        # Load profile picture if path exists
-        student_id = values[0]
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT profile_picture_path FROM students WHERE student_id=?", (student_id,))
-        profile_path = cursor.fetchone()
-        conn.close()
-
-        if profile_path and profile_path[0] and os.path.exists(profile_path[0]):
-            try:
-                self.profile_picture_path = profile_path[0]
-                img = Image.open(self.profile_picture_path)
-                img = img.resize((100, 100), Image.LANCZOS)
-                self.profile_pic_display = ImageTk.PhotoImage(img)
-                self.profile_pic_label.config(image=self.profile_pic_display, text="")
-                self.profile_pic_label.image = self.profile_pic_display
-            except Exception:
-                self.profile_picture_path = ""
-                self.profile_pic_label.config(image="", text="No Image")
-        else:
-            self.profile_picture_path = ""
-            self.profile_pic_label.config(image="", text="No Image")
+        for entry, value in (
+            (self.student_roll_entry, student.roll_number),
+            (self.student_name_entry, student.name),
+            (self.student_contact_entry, student.contact_number),
+            (self.student_email_entry, student.email),
+            (self.student_address_entry, student.address),
+            (self.student_aadhaar_entry, student.aadhaar_no),
+            (self.student_dob_entry, student.date_of_birth),
+            (self.student_tenth_entry, student.tenth_percent),
+            (self.student_twelfth_entry, student.twelfth_percent),
+            (self.student_blood_group_entry, student.blood_group),
+            (self.student_mother_name_entry, student.mother_name),
+            (self.student_enrollment_date_entry, student.enrollment_date),
+        ):
+            entry.delete(0, tk.END) # The enrollment date starts out as today's
+            if value is not None:
+                entry.insert(0, value)
+        self.student_gender_combobox.set(student.gender or "")
+        self.student_enrollment_status_combobox.set("Yes" if student.enrollment_status == 1 else "No")
+        self.student_course_combobox.set(student.course_name or "")
+        self.student_academic_year_combobox.set(student.year_name or "")
+        self.student_faculty_combobox.set(student.faculty_name or "")
+
+        self._show_profile_photo(student.photo or "")
 
 
     # --- Reports Tab ---
     def setup_reports_tab(self, parent_frame):
+        from sdms.export import EXPORT_FORMATS, export_names
+
         ttk.Label(parent_frame, text="Reports and Data Export", font=("Helvetica", 16, "bold"), bootstyle="primary").pack(pady=10)
 
         reports_frame = ttk.LabelFrame(parent_frame, text="Generate Reports", padding=15, bootstyle="info")
@@ -1246,7 +1223,7 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         ttk.Label(reports_frame, text="Marks Report (by Course & Semester):", font=("Helvetica", 12)).grid(row=1, column=0, padx=5, pady=5, sticky="w")
         
         ttk.Label(reports_frame, text="Course:").grid(row=2, column=0, padx=5, pady=2, sticky="w")
-        self.report_marks_course_combobox = ttk.Combobox(reports_frame, values=self._get_course_names())
+        self.report_marks_course_combobox = self._reference_combobox(reports_frame, "courses")
         self.report_marks_course_combobox.grid(row=2, column=1, padx=5, pady=2, sticky="ew")
 
         ttk.Label(reports_frame, text="Semester:").grid(row=3, column=0, padx=5, pady=2, sticky="w")
@@ -1254,126 +1231,162 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         self.report_marks_semester_entry.grid(row=3, column=1, padx=5, pady=2, sticky="ew")
         
         ttk.Button(reports_frame, text="Generate Marks Report", command=self.generate_marks_report, bootstyle="primary").grid(row=4, column=1, padx=5, pady=5, sticky="e")
+        class_pdf_frame = ttk.Frame(reports_frame)
+        class_pdf_frame.grid(row=4, column=0, padx=5, pady=5, sticky="w")
+        ttk.Button(class_pdf_frame, text="Class PDFs to Folder...", command=lambda: self.generate_class_marks_pdfs(merged=False), bootstyle="info").pack(side="left", padx=(0, 5))
+        ttk.Button(class_pdf_frame, text="Merged Class PDF...", command=lambda: self.generate_class_marks_pdfs(merged=True), bootstyle="info").pack(side="left")
 
         # Report 3: Payment History Report
         ttk.Label(reports_frame, text="Payment History Report:", font=("Helvetica", 12)).grid(row=5, column=0, padx=5, pady=5, sticky="w")
         ttk.Button(reports_frame, text="Generate Payment Report", command=self.generate_payment_report, bootstyle="primary").grid(row=5, column=1, padx=5, pady=5, sticky="e")
 
+        # Export: reports and full tables to machine-readable files (marks uses the Course/Semester above)
+        ttk.Label(reports_frame, text="Export Data (CSV/JSONL/Parquet):", font=("Helvetica", 12)).grid(row=6, column=0, padx=5, pady=5, sticky="w")
+        self.export_name_combobox = ttk.Combobox(reports_frame, values=export_names(), state="readonly")
+        self.export_name_combobox.grid(row=7, column=0, padx=5, pady=2, sticky="ew")
+        self.export_name_combobox.set("enrollment")
+        self.export_format_combobox = ttk.Combobox(reports_frame, values=EXPORT_FORMATS, state="readonly", width=10)
+        self.export_format_combobox.grid(row=7, column=1, padx=5, pady=2, sticky="w")
+        self.export_format_combobox.set("csv")
+        ttk.Button(reports_frame, text="Export...", command=self.export_report_file, bootstyle="info").grid(row=7, column=1, padx=5, pady=2, sticky="e")
+
         # Report Output Area
         ttk.Label(parent_frame, text="Report Output:", font=("Helvetica", 12, "bold")).pack(pady=(10, 5))
         self.report_output_text = tk.Text(parent_frame, wrap="word", height=10, font=("Consolas", 10))
         self.report_output_text.pack(pady=10, padx=20, fill="both", expand=True)
         self.report_output_text.config(state=tk.DISABLED) # Make it read-only
+        ttk.Button(parent_frame, text="Save Output As...", command=self.save_report_output, bootstyle="info").pack(pady=(0, 10))
+
+    def _stream_report_output(self, name, make_lines):
+        self._last_report = (name, make_lines)
+        self.stream_report(self.report_output_text, name, make_lines)
 
     def generate_enrollment_report(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT s.roll_number, s.name, s.enrollment_date, c.course_name, a.year_name, f.faculty_name,
-                CASE WHEN s.enrollment_status = 1 THEN 'Active' ELSE 'Inactive' END AS status
-            FROM students s
-            LEFT JOIN courses c ON s.course_id = c.course_id
-            LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
-            LEFT JOIN faculties f ON s.faculty_id = f.faculty_id
-            ORDER BY s.enrollment_date DESC
-        """)
-        data = cursor.fetchall()
-        conn.close()
-
-        output_content = "Student Enrollment Report\n"
-        output_content += "----------------------------------------------------------------------------------------------------\n"
-        output_content += f"{'Roll No':<10}{'Name':<25}{'Enroll Date':<15}{'Course':<20}{'Acad Year':<15}{'Faculty':<15}{'Status':<10}\n"
-        output_content += "----------------------------------------------------------------------------------------------------\n"
-        for row in data:
-            output_content += f"{row[0]:<10}{row[1]:<25}{row[2]:<15}{row[3]:<20}{row[4]:<15}{row[5]:<15}{row[6]:<10}\n"
-        
-        self.report_output_text.config(state=tk.NORMAL)
-        self.report_output_text.delete(1.0, tk.END)
-        self.report_output_text.insert(tk.END, output_content)
-        self.report_output_text.config(state=tk.DISABLED)
+        self._stream_report_output("Enrollment report", lambda: backend.report_lines("enrollment"))
 
-    def generate_marks_report(self):
+    def _marks_report_params(self):
+        """Returns (course_name, semester) from the Marks Report fields, or None after warning the user."""
         course_name = self.report_marks_course_combobox.get().strip()
         semester_str = self.report_marks_semester_entry.get().strip()
 
         if not course_name or not semester_str:
             messagebox.showwarning("Input Error", "Please select a Course and enter a Semester for the Marks Report.")
-            return
+            return None
 
         try:
             semester = int(semester_str)
         except ValueError:
             messagebox.showerror("Input Error", "Semester must be a number.")
+            return None
+        return course_name, semester
+
+    def generate_marks_report(self):
+        params = self._marks_report_params()
+        if params is None:
             return
+        course_name, semester = params
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT course_id FROM courses WHERE course_name=?", (course_name,))
-        course_id_data = cursor.fetchone()
-        if not course_id_data:
-            messagebox.showerror("Error", f"Course '{course_name}' not found.")
-            conn.close()
-            return
-        course_id = course_id_data[0]
-
-        cursor.execute("""
-            SELECT s.roll_number, s.name, m.subject_name, m.marks_obtained, m.max_marks, m.grade
-            FROM marks m
-            JOIN students s ON m.student_id = s.student_id
-            WHERE m.course_id = ? AND m.semester = ?
-            ORDER BY s.name, m.subject_name
-        """, (course_id, semester))
-        data = cursor.fetchall()
-        conn.close()
-
-        output_content = f"Marks Report for {course_name}, Semester {semester}\n"
-        output_content += "----------------------------------------------------------------------\n"
-        output_content += f"{'Roll No':<10}{'Name':<20}{'Subject':<25}{'Marks':<8}{'Max':<8}{'Grade':<8}\n"
-        output_content += "----------------------------------------------------------------------\n"
-        if not data:
-            output_content += "No marks found for the selected criteria.\n"
-        else:
-            for row in data:
-                output_content += f"{row[0]:<10}{row[1]:<20}{row[2]:<25}{row[3]:<8.2f}{row[4]:<8.2f}{row[5]:<8}\n"
-        
-        self.report_output_text.config(state=tk.NORMAL)
-        self.report_output_text.delete(1.0, tk.END)
-        self.report_output_text.insert(tk.END, output_content)
-        self.report_output_text.config(state=tk.DISABLED)
+        self._stream_report_output("Marks report", lambda: backend.report_lines("marks", course_name, semester))
 
         # Reset the form fields after report generation
         self.report_marks_course_combobox.set("")
         self.report_marks_semester_entry.delete(0, tk.END)
 
     def generate_payment_report(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT s.roll_number, s.name, p.amount_paid, p.payment_date, p.payment_type, p.receipt_number, p.description
-            FROM payments p
-            JOIN students s ON p.student_id = s.student_id
-            ORDER BY p.payment_date DESC
-        """)
-        data = cursor.fetchall()
-        conn.close()
-
-        output_content = "Payment History Report\n"
-        output_content += "----------------------------------------------------------------------------------------------------\n"
-        output_content += f"{'Roll No':<10}{'Student Name':<25}{'Amount':<10}{'Date':<15}{'Type':<15}{'Receipt No':<15}{'Description':<25}\n"
-        output_content += "----------------------------------------------------------------------------------------------------\n"
-        if not data:
-            output_content += "No payment records found.\n"
+        self._stream_report_output("Payment report", lambda: backend.report_lines("payments"))
+
+    def save_report_output(self):
+        """Writes the last report shown to a text or PDF file, streaming it again from the backend."""
+        if self._last_report is None:
+            messagebox.showwarning("No Report", "Generate a report first.")
+            return
+        name, make_lines = self._last_report
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("PDF files", "*.pdf")],
+            initialfile=name.replace(" ", "_") + ".txt",
+            title="Save Report As"
+        )
+        if not file_path:
+            return
+        def save(job):
+            if file_path.lower().endswith(".pdf"):
+                from sdms.pdf_reports import write_report_pdf
+
+                write_report_pdf(make_lines(), file_path)
+            else:
+                reports.write_report_file(make_lines(), file_path)
+
+        self.run_job(f"Saving {name}", save,
+                     error_title="Save Error", error_message="Failed to save report",
+                     on_done=lambda _: messagebox.showinfo("Report Saved", f"Report saved to:\n{file_path}"))
+
+    def generate_class_marks_pdfs(self, merged):
+        """Marks report PDFs for every student in the selected course and semester."""
+        if not self._needs_local_database("Class marks PDFs", "marks-pdfs --course COURSE --semester N"):
+            return
+        params = self._marks_report_params()
+        if params is None:
+            return
+        course_name, semester = params
+        output_dir = merged_path = None
+        if merged:
+            merged_path = filedialog.asksaveasfilename(
+                defaultextension=".pdf",
+                filetypes=[("PDF files", "*.pdf")],
+                initialfile=f"MarksReports_{course_name}_Sem{semester}.pdf",
+                title="Save Merged Marks Report"
+            )
+            if not merged_path:
+                return
         else:
-            for row in data:
-                output_content += f"{row[0]:<10}{row[1]:<25}{row[2]:<10.2f}{row[3]:<15}{row[4]:<15}{row[5] if row[5] else 'N/A':<15}{row[6] if row[6] else 'N/A':<25}\n"
-        
-        self.report_output_text.config(state=tk.NORMAL)
-        self.report_output_text.delete(1.0, tk.END)
-        self.report_output_text.insert(tk.END, output_content)
-        self.report_output_text.config(state=tk.DISABLED)
+            output_dir = filedialog.askdirectory(title="Select Output Folder for Marks Reports")
+            if not output_dir:
+                return
+
+        def build_reports(job):
+            from sdms.pdf_reports import fetch_cohort_marks, generate_marks_pdfs
+
+            students = fetch_cohort_marks(get_db_connection(), course_name, semester)
+            if not students:
+                raise reports.ReportError(f"No marks found for {course_name}, Semester {semester}.")
+            return generate_marks_pdfs(students, output_dir=output_dir, merged_path=merged_path, job=job)
+
+        self.run_job("Class marks PDFs", build_reports, error_title="Report Generation", error_message="Failed to generate PDF reports",
+                     on_done=lambda result: messagebox.showinfo("Report Generation", f"{result.summary()}\n\nSaved to: {merged_path or output_dir}"))
 
 
+    def export_report_file(self):
+        if not self._needs_local_database("Exporting data", "export NAME FILE"):
+            return
+        name = self.export_name_combobox.get()
+        fmt = self.export_format_combobox.get()
+        params = {}
+        if name == "marks":
+            course_name = self.report_marks_course_combobox.get().strip()
+            semester_str = self.report_marks_semester_entry.get().strip()
+            if not course_name or not semester_str.isdigit():
+                messagebox.showwarning("Input Error", "Select a Course and enter a numeric Semester above to export marks.")
+                return
+            params = {"course_name": course_name, "semester": int(semester_str)}
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=f".{fmt}",
+            filetypes=[(f"{fmt.upper()} files", f"*.{fmt}"), ("All files", "*.*")],
+            initialfile=f"{name.replace('table:', '')}.{fmt}",
+            title="Export Data"
+        )
+        if not file_path:
+            return
+        def run_export(job):
+            from sdms.export import export
+
+            return export(get_db_connection(), name, file_path, fmt, job, **params)
+
+        self.run_job(f"Exporting {name}", run_export,
+                     error_title="Export Error", error_message="Export failed",
+                     on_done=lambda count: messagebox.showinfo("Export Complete", f"Exported {count} rows to:\n{file_path}"))
+
     # --- ID Card Generation Tab ---
     def setup_id_card_tab(self, parent_frame):
         ttk.Label(parent_frame, text="Generate Student ID Cards", font=("Helvetica", 16, "bold"), bootstyle="primary").pack(pady=10)
@@ -1386,6 +1399,25 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         self.id_card_roll_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
 
         ttk.Button(input_frame, text="Generate ID Card", command=self.generate_id_card, bootstyle="success").grid(row=0, column=2, padx=10, pady=5)
+
+        # Batch generation for a whole course / academic year / faculty (blank = any)
+        batch_frame = ttk.LabelFrame(parent_frame, text="Batch Generation", padding=10, bootstyle="info")
+        batch_frame.pack(pady=10, padx=10, fill="x", expand=False)
+
+        ttk.Label(batch_frame, text="Course:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.batch_course_combobox = self._reference_combobox(batch_frame, "courses", blank=True, width=22)
+        self.batch_course_combobox.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        ttk.Label(batch_frame, text="Academic Year:").grid(row=0, column=2, padx=5, pady=5, sticky="w")
+        self.batch_year_combobox = self._reference_combobox(batch_frame, "academic_years", blank=True, width=15)
+        self.batch_year_combobox.grid(row=0, column=3, padx=5, pady=5, sticky="ew")
+        ttk.Label(batch_frame, text="Faculty:").grid(row=0, column=4, padx=5, pady=5, sticky="w")
+        self.batch_faculty_combobox = self._reference_combobox(batch_frame, "faculties", blank=True, width=10)
+        self.batch_faculty_combobox.grid(row=0, column=5, padx=5, pady=5, sticky="ew")
+
+        self.batch_resume_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(batch_frame, text="Resume (skip cards already generated)", variable=self.batch_resume_var).grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+        ttk.Button(batch_frame, text="Generate to Folder...", command=lambda: self.generate_id_card_batch(to_zip=False), bootstyle="success").grid(row=1, column=3, padx=5, pady=5)
+        ttk.Button(batch_frame, text="Generate to ZIP...", command=lambda: self.generate_id_card_batch(to_zip=True), bootstyle="success").grid(row=1, column=4, columnspan=2, padx=5, pady=5)
         
         # ID Card Display Area
         ttk.Label(parent_frame, text="Generated ID Card Preview:", font=("Helvetica", 12, "bold")).pack(pady=(10, 5))
@@ -1394,89 +1426,66 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         self.id_card_photo = None # To hold the PhotoImage
 
     def generate_id_card(self):
+        if not self._needs_local_database("ID card generation", "idcards cards.zip"):
+            return
         roll_number = self.id_card_roll_entry.get().strip()
         if not roll_number:
             messagebox.showwarning("Input Error", "Please enter a student roll number.")
             return
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT s.name, s.roll_number, c.course_name, a.year_name, s.date_of_birth, s.blood_group,
-                s.contact_number, s.profile_picture_path, s.enrollment_date
-            FROM students s
-
-            LEFT JOIN courses c ON s.course_id = c.course_id
-            LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
-            WHERE s.roll_number = ?
-        """, (roll_number,))
-       
-        student_data = cursor.fetchone()
-        conn.close()
-
-        if not student_data:
-            messagebox.showerror("Not Found", f"No student found with Roll Number: {roll_number}")
-            return
+        def build_card(job):
+            from sdms.idcards import fetch_id_card_student, render_id_card
 
-        name, roll_number, course_name, academic_year, dob, blood_group, contact_number, profile_pic_path, enrollment_date = student_data
+            student_data = fetch_id_card_student(get_db_connection(), roll_number)
+            if not student_data:
+                return None
+            job.check_cancelled()
+            return render_id_card(student_data, IDENTITY_CARD_BACKGROUND_PATH)
 
-        # ID Card Dimensions
-        card_width = 400
-        card_height = 250
+        self.run_job(f"ID card {roll_number}", build_card,
+                     error_title="ID Card Error", error_message="Failed to generate ID Card",
+                     on_done=lambda id_card_image: self._show_id_card(roll_number, id_card_image))
 
-        try:
-            # Use the provided background image
-            if os.path.exists(IDENTITY_CARD_BACKGROUND_PATH):
-                id_card_image = Image.open(IDENTITY_CARD_BACKGROUND_PATH).resize((card_width, card_height), Image.LANCZOS)
-            else:
-                id_card_image = Image.new('RGB', (card_width, card_height), color = (255, 255, 255)) # White background if not found
-                messagebox.showwarning("Image Warning", f"Identity card background image not found: {IDENTITY_CARD_BACKGROUND_PATH}. Using plain white background.")
+    def generate_id_card_batch(self, to_zip):
+        if not self._needs_local_database("ID card generation", "idcards cards.zip"):
+            return
+        course_name = self.batch_course_combobox.get().strip() or None
+        year_name = self.batch_year_combobox.get().strip() or None
+        faculty_name = self.batch_faculty_combobox.get().strip() or None
+        if to_zip:
+            output_path = filedialog.asksaveasfilename(
+                defaultextension=".zip",
+                filetypes=[("ZIP archives", "*.zip")],
+                initialfile="ID_Cards.zip",
+                title="Save ID Cards As",
+                confirmoverwrite=False # Existing archives are resumed, not replaced
+            )
+        else:
+            output_path = filedialog.askdirectory(title="Select Output Folder for ID Cards")
+        if not output_path:
+            return
+        resume = self.batch_resume_var.get()
 
+        def build_cards(job):
+            from sdms.idcards import fetch_id_card_students, generate_id_cards
 
-            draw = ImageDraw.Draw(id_card_image)
+            students = fetch_id_card_students(get_db_connection(), course_name, year_name, faculty_name)
+            return generate_id_cards(students, output_path, IDENTITY_CARD_BACKGROUND_PATH, resume=resume, job=job)
 
-            # Define fonts (adjust paths if fonts are not system-wide)
-            try:
-                font_title = ImageFont.truetype("arialbd.ttf", 20)
-                font_header = ImageFont.truetype("arialbd.ttf", 14)
-                font_normal = ImageFont.truetype("arial.ttf", 12)
-            except IOError:
-                font_title = ImageFont.load_default()
-                font_header = ImageFont.load_default()
-                font_normal = ImageFont.load_default()
-
-            # College Name and Address
-            college_name = "Saraswati College, Shegaon"
-            college_address = "Gaulkhed Road, Shegaon Dist:- Buldhana, State:-Maharashtra (INDIA) Pin: 444 203"
-
-            draw.text((card_width / 2, 20), college_name, fill=(0, 0, 0), font=font_title, anchor="mm")
-            draw.text((card_width / 2, 45), "STUDENT IDENTITY CARD", fill=(0, 0, 0), font=font_header, anchor="mm")
-            draw.text((card_width / 2, 65), college_address, fill=(0, 0, 0), font=font_normal, anchor="mm")
-
-
-            # Student details
-            y_offset = 90
-            text_color = (0, 0, 0) # Black color for text
-
-            # Profile Picture
-            if profile_pic_path and os.path.exists(profile_pic_path):
-                profile_img = Image.open(profile_pic_path)
-                profile_img = profile_img.resize((80, 80), Image.LANCZOS)
-                # Paste the profile picture onto the card
-                id_card_image.paste(profile_img, (20, y_offset), profile_img if profile_img.mode == 'RGBA' else None) # Use mask for transparency
-            else:
-                draw.text((20, y_offset + 30), "No Photo", fill=text_color, font=font_normal)
+        self.run_job("ID card batch", build_cards, error_title="ID Card Error", error_message="Batch generation failed",
+                     on_done=lambda result: messagebox.showinfo("ID Cards Generated", f"{result.summary()}\n\nSaved to: {output_path}"))
 
-            x_start_details = 120
-            draw.text((x_start_details, y_offset), f"Name: {name}", fill=text_color, font=font_normal)
-            draw.text((x_start_details, y_offset + 20), f"Roll No: {roll_number}", fill=text_color, font=font_normal)
-            draw.text((x_start_details, y_offset + 40), f"Course: {course_name} ({academic_year})", fill=text_color, font=font_normal)
-            draw.text((x_start_details, y_offset + 60), f"DOB: {dob}", fill=text_color, font=font_normal)
-            draw.text((x_start_details, y_offset + 80), f"Blood Group: {blood_group}", fill=text_color, font=font_normal)
-            draw.text((x_start_details, y_offset + 100), f"Contact: {contact_number}", fill=text_color, font=font_normal)
-            draw.text((x_start_details, y_offset + 120), f"Enrollment Date: {enrollment_date}", fill=text_color, font=font_normal)
+    def _show_id_card(self, roll_number, id_card_image):
+        if id_card_image is None:
+            messagebox.showerror("Not Found", f"No student found with Roll Number: {roll_number}")
+            return
+        if not os.path.exists(IDENTITY_CARD_BACKGROUND_PATH):
+            messagebox.showwarning("Image Warning", f"Identity card background image not found: {IDENTITY_CARD_BACKGROUND_PATH}. Using plain white background.")
 
+        try:
             # Display the generated ID card
+            from PIL import ImageTk
+
             self.id_card_photo = ImageTk.PhotoImage(id_card_image)
             self.id_card_canvas.delete("all")
             self.id_card_canvas.create_image(0, 0, anchor="nw", image=self.id_card_photo)
@@ -1535,7 +1544,6 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
         amount_paid_str = self.receipt_amount_entry.get().strip()
         payment_type = self.receipt_type_combobox.get().strip()
         description = self.receipt_description_entry.get().strip()
-        payment_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         if not roll_number or not amount_paid_str:
             messagebox.showwarning("Input Error", "Please enter student Roll Number and Amount Paid.")
@@ -1549,71 +1557,18 @@ Email: enquiry@saraswaticollege.edu.in , principal@saraswaticollege.edu.in
             messagebox.showerror("Input Error", "Amount Paid must be a valid positive number.")
             return
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
         try:
-            cursor.execute("SELECT student_id, name, course_id FROM students WHERE roll_number=?", (roll_number,))
-            student_data = cursor.fetchone()
-
-            if not student_data:
-                messagebox.showerror("Error", f"No student found with Roll Number: {roll_number}")
-                return
-            
-            student_id, student_name, course_id = student_data
-
-            # Get course name from course_id
-            course_name = "N/A"
-            if course_id:
-                cursor.execute("SELECT course_name FROM courses WHERE course_id=?", (course_id,))
-                course_result = cursor.fetchone()
-                if course_result:
-                    course_name = course_name[0]
-
-            # Generate a simple receipt number (e.g., timestamp + roll_number)
-            receipt_number = f"REC-{datetime.now().strftime('%Y%m%d%H%M%S')}-{roll_number}"
-
-            cursor.execute("""
-                INSERT INTO payments (student_id, amount_paid, payment_date, payment_type, receipt_number, description)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (student_id, amount_paid, payment_date, payment_type, receipt_number, description))
-            conn.commit()
-
-            receipt_content = f"""
----------------------------------------------------
-        Saraswati College,Shegaon
-        PAYMENT RECEIPT
----------------------------------------------------
-
-Receipt No:   {receipt_number}
-Date:         {payment_date}
-
-Student Name: {student_name}
-Roll Number:  {roll_number}
-Course:       {course_name}
-
-Amount Paid:  INR {amount_paid:.2f}
-Payment Type: {payment_type}
-Description:  {description if description else 'N/A'}
-                                
-
-                                signature
----------------------------------------------------
-Thank you for your payment!
----------------------------------------------------
-            """
-            self.receipt_output_text.config(state=tk.NORMAL)
-            self.receipt_output_text.delete(1.0, tk.END)
-            self.receipt_output_text.insert(tk.END, receipt_content)
-            self.receipt_output_text.config(state=tk.DISABLED)
-
-            messagebox.showinfo("Receipt Generated", "Receipt generated and recorded successfully!", parent=self.master)
-            self.clear_receipt_fields()
-
+            receipt = backend.record_payment(roll_number, amount_paid, payment_type, description)
+        except RecordError as e:
+            messagebox.showerror("Error", str(e), parent=self.master)
+            return
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Failed to generate receipt: {e}", parent=self.master)
-        finally:
-            conn.close()
+            return
+        self._show_text(self.receipt_output_text, format_receipt(receipt))
+
+        messagebox.showinfo("Receipt Generated", "Receipt generated and recorded successfully!", parent=self.master)
+        self.clear_receipt_fields()
 
     def clear_receipt_fields(self):
         self.receipt_roll_entry.delete(0, tk.END)
@@ -1630,12 +1585,7 @@ Thank you for your payment!
         analytics_frame.pack(pady=20, padx=20, fill="x")
 
         ttk.Label(analytics_frame, text="Choose Insight:", font=("Helvetica", 12)).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        self.analytics_combobox = ttk.Combobox(analytics_frame, values=[
-            "Students per Course",
-            "Average Marks per Course",
-            "Enrollment Status Breakdown",
-            "Faculty Academic Performance"
-        ])
+        self.analytics_combobox = ttk.Combobox(analytics_frame, values=list(reports.INSIGHTS) + list(analytics.INSIGHTS))
         self.analytics_combobox.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         self.analytics_combobox.set("Students per Course") # Default
 
@@ -1649,123 +1599,11 @@ Thank you for your payment!
 
     def generate_analytics(self):
         selected_insight = self.analytics_combobox.get()
-        self.performance_output_text.config(state=tk.NORMAL)
-        self.performance_output_text.delete(1.0, tk.END)
-
-        if selected_insight == "Students per Course":
-            self._students_per_course_report()
-        elif selected_insight == "Average Marks per Course":
-            self._average_marks_per_course_report()
-        elif selected_insight == "Enrollment Status Breakdown":
-            self._enrollment_status_breakdown()
-        elif selected_insight == "Faculty Academic Performance":
-            self._faculty_academic_performance()
-        else:
-            self.performance_output_text.insert(tk.END, "Please select a valid insight to generate.")
-        
-        self.performance_output_text.config(state=tk.DISABLED)
-
-    def _students_per_course_report(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT c.course_name, COUNT(s.student_id) AS total_students
-            FROM courses c
-            LEFT JOIN students s ON c.course_id = s.course_id
-            GROUP BY c.course_name
-            ORDER BY total_students DESC
-        """)
-        data = cursor.fetchall()
-        conn.close()
-
-        output_content = "Students Enrolled Per Course\n"
-        output_content += "----------------------------------------\n"
-        output_content += f"{'Course':<25}{'Total Students':<15}\n"
-        output_content += "----------------------------------------\n"
-        for course, count in data:
-            output_content += f"{course:<25}{count:<15}\n"
-        self.performance_output_text.insert(tk.END, output_content)
-
-    def _average_marks_per_course_report(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT c.course_name, AVG(m.marks_obtained * 1.0 / m.max_marks) * 100 AS average_percentage
-            FROM marks m
-            JOIN courses c ON m.course_id = c.course_id
-            GROUP BY c.course_name
-            ORDER BY average_percentage DESC
-        """)
-        data = cursor.fetchall()
-        conn.close()
-
-        output_content = "Average Marks Percentage Per Course\n"
-        output_content += "------------------------------------------------\n"
-        output_content += f"{'Course':<25}{'Average Percentage':<20}\n"
-        output_content += "------------------------------------------------\n"
-        if not data:
-            output_content += "No marks data available for courses.\n"
-        else:
-            for course, avg_percent in data:
-                avg_percent_str = f"{avg_percent:.2f}%" if avg_percent is not None else "N/A"
-                output_content += f"{course:<25}{avg_percent_str:<20}\n"
-        
-        self.performance_output_text.config(state=tk.NORMAL)
-        self.performance_output_text.delete(1.0, tk.END)
-        self.performance_output_text.insert(tk.END, output_content)
-        self.performance_output_text.config(state=tk.DISABLED)
-
-    def _enrollment_status_breakdown(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT
-                CASE WHEN enrollment_status = 1 THEN 'Active' ELSE 'Inactive' END AS status,
-                COUNT(student_id) AS total_students
-            FROM students
-            GROUP BY status
-            ORDER BY status DESC
-        """)
-        data = cursor.fetchall()
-        conn.close()
-
-        output_content = "Student Enrollment Status Breakdown\n"
-        output_content += "-----------------------------------\n"
-        output_content += f"{'Status':<15}{'Total Students':<15}\n"
-        output_content += "-----------------------------------\n"
-        for status, count in data:
-            output_content += f"{status:<15}{count:<15}\n"
-        self.performance_output_text.insert(tk.END, output_content)
-
-    def _faculty_academic_performance(self):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT f.faculty_name,
-                AVG(s.tenth_percent) AS avg_10th_percent,
-                AVG(s.twelfth_percent) AS avg_12th_percent,
-                COUNT(s.student_id) AS total_students
-            FROM faculties f
-            LEFT JOIN students s ON f.faculty_id = s.faculty_id
-            GROUP BY f.faculty_name
-            ORDER BY avg_10th_percent DESC, avg_12th_percent DESC, COUNT(s.student_id) AS total_students
-        """)
-        data = cursor.fetchall()
-        conn.close()
-
-        output_content = "Faculty Academic Performance (Avg 10th/12th %)\n"
-        output_content += "----------------------------------------------------------------\n"
-        output_content += f"{'Faculty':<15}{'Avg 10th %':<15}{'Avg 12th %':<15}{'Total Students':<15}\n"
-        output_content += "----------------------------------------------------------------\n"
-        for faculty, avg_10th, avg_12th, total_students in data:
-            avg_10th_str = f"{avg_10th:.2f}" if avg_10th is not None else "N/A"
-            avg_12th_str = f"{avg_12th:.2f}" if avg_12th is not None else "N/A"
-            output_content += f"{faculty:<15}{avg_10th_str:<15}{avg_12th_str:<15}{total_students:<15}\n"
-        
-        self.performance_output_text.config(state=tk.NORMAL)
-        self.performance_output_text.delete(1.0, tk.END)
-        self.performance_output_text.insert(tk.END, output_content)
-        self.performance_output_text.config(state=tk.DISABLED)
+        if selected_insight not in reports.INSIGHTS and selected_insight not in analytics.INSIGHTS:
+            self._show_text(self.performance_output_text, "Please select a valid insight to generate.")
+            return
+        self.stream_report(self.performance_output_text, selected_insight,
+                           lambda: backend.insight_lines(selected_insight))
 
     # --- Feedback Tab ---
     def setup_feedback_tab(self, parent_frame):
@@ -1797,22 +1635,15 @@ Thank you for your payment!
             messagebox.showwarning("Input Error", "Please enter your feedback before submitting.")
             return
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        conn = get_db_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute("INSERT INTO feedback (name, email, feedback_text, timestamp) VALUES (?, ?, ?, ?)",
-                           (name, email, feedback, timestamp))
-            conn.commit()
-            messagebox.showinfo("Feedback Submitted", "Thank you for your feedback! It has been recorded.", parent=self.master)
-            self.feedback_name_entry.delete(0, tk.END)
-            self.feedback_email_entry.delete(0, tk.END)
-            self.feedback_text_area.delete("1.0", tk.END)
-        except sqlite3.Error as e:
+            backend.add_feedback(name, email, feedback)
+        except (sqlite3.Error, RecordError) as e:
             messagebox.showerror("Database Error", f"Failed to submit feedback: {e}", parent=self.master)
-        finally:
-            conn.close()
+            return
+        messagebox.showinfo("Feedback Submitted", "Thank you for your feedback! It has been recorded.", parent=self.master)
+        self.feedback_name_entry.delete(0, tk.END)
+        self.feedback_email_entry.delete(0, tk.END)
+        self.feedback_text_area.delete("1.0", tk.END)
 
     # --- Marks Entry Tab ---
     def setup_marks_entry_tab(self, parent_frame):
@@ -1826,7 +1657,7 @@ Thank you for your payment!
         self.marks_roll_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
     
         ttk.Label(input_frame, text="Course:").grid(row=0, column=2, padx=5, pady=5, sticky="w")
-        self.marks_course_combobox = ttk.Combobox(input_frame, values=self._get_course_names(), width=20)
+        self.marks_course_combobox = self._reference_combobox(input_frame, "courses", width=20)
         self.marks_course_combobox.grid(row=0, column=3, padx=5, pady=5, sticky="ew")
     
         ttk.Label(input_frame, text="Semester:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
@@ -1845,11 +1676,12 @@ Thank you for your payment!
         self.marks_max_entry = ttk.Entry(input_frame, width=20)
         self.marks_max_entry.grid(row=2, column=3, padx=5, pady=5, sticky="ew")
     
-        ttk.Label(input_frame, text="Grade:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        ttk.Label(input_frame, text="Grade (blank = auto):").grid(row=3, column=0, padx=5, pady=5, sticky="w")
         self.marks_grade_entry = ttk.Entry(input_frame, width=25)
         self.marks_grade_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
     
-        ttk.Button(input_frame, text="Add Marks", command=self.add_marks, bootstyle="success").grid(row=4, column=0, columnspan=4, pady=10)
+        ttk.Button(input_frame, text="Add Marks", command=self.add_marks, bootstyle="success").grid(row=4, column=0, columnspan=2, pady=10)
+        ttk.Button(input_frame, text="Import Marks Sheet (CSV/XLSX)", command=self.import_marks_file, bootstyle="warning").grid(row=4, column=2, columnspan=2, pady=10)
     
         # Marks Display
         display_frame = ttk.LabelFrame(parent_frame, text="Student Marks", padding=10, bootstyle="primary")
@@ -1872,8 +1704,8 @@ Thank you for your payment!
         max_marks = self.marks_max_entry.get().strip()
         grade = self.marks_grade_entry.get().strip()
     
-        if not all([roll, course, semester, subject, marks, max_marks, grade]):
-            messagebox.showwarning("Input Error", "All fields are required.")
+        if not all([roll, course, semester, subject, marks, max_marks]):
+            messagebox.showwarning("Input Error", "All fields except Grade are required.")
             return
     
         try:
@@ -1883,54 +1715,56 @@ Thank you for your payment!
         except ValueError:
             messagebox.showerror("Input Error", "Semester, Marks, and Max Marks must be numbers.")
             return
+        if max_marks <= 0:
+            messagebox.showerror("Input Error", "Max Marks must be greater than zero.")
+            return
     
-        conn = get_db_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute("SELECT student_id FROM students WHERE roll_number=?", (roll,))
-            student = cursor.fetchone()
-            if not student:
-                messagebox.showerror("Error", "Student not found.")
-                return
-            student_id = student[0]
-    
-            cursor.execute("SELECT course_id FROM courses WHERE course_name=?", (course,))
-            course_row = cursor.fetchone()
-            if not course_row:
-                messagebox.showerror("Error", "Course not found.")
-                return
-            course_id = course_row[0]
-    
-            cursor.execute(
-                "INSERT INTO marks (student_id, course_id, subject_name, semester, marks_obtained, max_marks, grade) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (student_id, course_id, subject, semester, marks, max_marks, grade)
-            )
-            conn.commit()
-            messagebox.showinfo("Success", "Marks added successfully!")
-            self.display_student_marks()
+            backend.add_marks(roll, course, subject, semester, marks, max_marks, grade or None)
+        except RecordError as e:
+            messagebox.showerror("Error", str(e))
+            return
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add marks: {e}")
-        finally:
-            conn.close()
+            return
+        messagebox.showinfo("Success", "Marks added successfully!")
+        self.display_student_marks()
     
+    def import_marks_file(self):
+        """Imports a whole exam marks sheet in the background."""
+        if not self._needs_local_database("Importing marks", "import marks.xlsx --marks"):
+            return
+        file_path = filedialog.askopenfilename(
+            title="Select Marks Sheet",
+            filetypes=[("Spreadsheets", "*.csv *.xlsx"), ("CSV files", "*.csv"), ("Excel files", "*.xlsx")]
+        )
+        if not file_path:
+            return
+        self.run_job(f"Importing {os.path.basename(file_path)}",
+                     self._import_marks_job, file_path,
+                     error_title="Import Error", error_message="Failed to import marks",
+                     on_done=self._on_marks_imported)
+
+    def _import_marks_job(self, job, file_path):
+        from sdms.marks_import import import_marks
+
+        return import_marks(get_db_connection(), file_path, job)
+
+    def _on_marks_imported(self, result):
+        if result.errors:
+            messagebox.showwarning("Import Finished", result.summary())
+        else:
+            messagebox.showinfo("Import Finished", result.summary())
+        self.display_student_marks()
+
     def display_student_marks(self):
         roll = self.marks_roll_entry.get().strip()
         for item in self.marks_tree.get_children():
             self.marks_tree.delete(item)
         if not roll:
             return
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT m.subject_name, m.semester, m.marks_obtained, m.max_marks, m.grade
-            FROM marks m
-            JOIN students s ON m.student_id = s.student_id
-            WHERE s.roll_number = ?
-            ORDER BY m.semester, m.subject_name
-        """, (roll,))
-        for row in cursor.fetchall():
+        for row in backend.student_marks(roll):
             self.marks_tree.insert("", "end", values=row)
-        conn.close()
 
 # --- PDF Export Function ---
 def export_student_marks_pdf(self):
@@ -1939,32 +1773,21 @@ def export_student_marks_pdf(self):
         messagebox.showwarning("No Selection", "Please select a student from the list to export marks as PDF.")
         return
 
-    student_id = self.student_tree.item(selected_item, "values")[0]
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    student = self._student_rows[selected_item]
+
+    def fetch_marks(job):
+        return student.name, student.roll_number, backend.student_marks(student.roll_number)
 
-    # Fetch student details
-    cursor.execute("SELECT name, roll_number FROM students WHERE student_id = ?", (student_id,))
-    student_info = cursor.fetchone()
+    self.run_job("Fetching marks", fetch_marks,
+                 error_title="Database Error",
+                 on_done=lambda student_marks: _save_student_marks_pdf(self, student_marks))
 
-    if not student_info:
+def _save_student_marks_pdf(self, student_marks):
+    if not student_marks:
         messagebox.showwarning("Report Generation", "Student not found.")
-        conn.close()
         return
 
-    student_name = student_info[0]
-    roll_number = student_info[1]
-
-    # Fetch marks for the student
-    cursor.execute("""
-        SELECT subject_name, semester, marks_obtained, max_marks, grade
-        FROM marks
-        WHERE student_id = ?
-        ORDER BY semester, subject_name
-    """, (student_id,))
-    marks_data = cursor.fetchall()
-    conn.close()
-
+    student_name, roll_number, marks_data = student_marks
     if not marks_data:
         messagebox.showwarning("Report Generation", f"No marks found for {student_name}.")
         return
@@ -1980,53 +1803,30 @@ def export_student_marks_pdf(self):
     if not file_path:
         return  # User cancelled
 
-    try:
-        doc = SimpleDocTemplate(file_path, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Title
-        title_style = styles['h1']
-        story.append(Paragraph("Student Marks Report", title_style))
-        story.append(Paragraph(f"Student Name: {student_name}", styles['h3']))
-        story.append(Paragraph(f"Roll Number: {roll_number}", styles['h3']))
-        story.append(Paragraph("<br/><br/>", styles['Normal']))  # Add some space
-
-        # Table Header
-        data = [['Subject', 'Semester', 'Marks Obtained', 'Max Marks', 'Grade']]
-        for row in marks_data:
-            data.append([row[0], str(row[1]), str(row[2]), str(row[3]), row[4]])
-
-        table = Table(data)
-
-        # Table Style
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(table)
-
-        doc.build(story)
-        messagebox.showinfo("Report Generation", f"PDF report saved successfully to:\n{file_path}")
+    def build_pdf(job):
+        from sdms.pdf_reports import build_student_marks_pdf
 
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to generate PDF report: {e}")
+        build_student_marks_pdf(file_path, student_name, roll_number, marks_data)
+
+    self.run_job(f"Marks PDF {roll_number}", build_pdf,
+                 error_message="Failed to generate PDF report",
+                 on_done=lambda _: messagebox.showinfo("Report Generation", f"PDF report saved successfully to:\n{file_path}"))
 
 # ...existing code...
 
 if __name__ == "__main__":
     try:
-        init_db()
+        if backend.is_local:
+            init_db() # The server keeps its own database up to date
+        startup.mark("schema checked")
     except Exception as e:
         import traceback
         messagebox.showerror("Database Initialization Error", f"An error occurred while initializing the database:\n{e}\n\n{traceback.format_exc()}")
         exit(1)
     root = tk.Tk()
     root.withdraw()  # Hide the root window until login is successful
-    LoginWindow(root)
-    root.mainloop()
\ No newline at end of file
+    login_window = LoginWindow(root)
+    startup.mark_first_paint(login_window.login_root, "login window painted",
+                             then=root.destroy if startup.should_exit_after_paint() else None)
+    root.mainloop()
+    db_manager.close_all()
\ No newline at end of file
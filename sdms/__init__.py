@@ -0,0 +1,4 @@
+"""Non-GUI building blocks of the Student Database Management System.
+
+The Tk application imports these modules; they never import tkinter themselves.
+"""
@@ -0,0 +1,6 @@
+"""python -m sdms: the headless command line, see sdms.cli."""
+import sys
+
+from sdms.cli import main
+
+sys.exit(main())
@@ -0,0 +1,342 @@
+"""Columnar analytics over students and marks with NumPy.
+
+AnalyticsSnapshot.load() reads the columns the insights need, one pass per
+table, into compact arrays: int32 codes for courses, faculties and subjects,
+float64 values with NaN for NULL. Every insight is then a vectorised group-by
+over those arrays, so percentiles, standard deviations and histograms cost no
+further scans. NumPy is optional elsewhere in the application but required
+here.
+
+Compare against per-query SQL on a synthetic database with:
+
+    python -m sdms.analytics benchmark --marks 1000000
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import time
+
+from sdms.reference import reference_data
+from sdms.reports import ReportError, table_lines
+
+ANALYTICS_LOAD_BATCH = 50000
+PERCENTILES = (25, 50, 75, 90)
+HISTOGRAM_BINS = 10  # Equal-width bins over 0-100%
+
+STUDENT_COLUMNS_SQL = """
+    SELECT COALESCE(course_id, -1), COALESCE(faculty_id, -1), enrollment_status = 1,
+        CAST(tenth_percent AS REAL), CAST(twelfth_percent AS REAL)
+    FROM students
+"""
+NO_SUBJECT = "(no subject)"  # Label for marks stored without a subject name
+MARK_COLUMNS_SQL = f"""
+    SELECT COALESCE(course_id, -1), COALESCE(subject_name, '{NO_SUBJECT}'), marks_obtained * 1.0 / max_marks
+    FROM marks
+"""
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise ReportError("Columnar analytics require the 'numpy' package.") from None
+    return np
+
+
+def _load_columns(conn, sql, converters, batch_size):
+    """Reads a query into one array per column, converting fetchmany() batches as they arrive."""
+    np = _numpy()
+    cursor = conn.execute(sql)
+    chunks = [[] for _ in converters]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for chunk, convert, column in zip(chunks, converters, zip(*rows)):
+            chunk.append(convert(column))
+    return [np.concatenate(chunk) if chunk else convert(()) for chunk, convert in zip(chunks, converters)]
+
+
+def _group_stats(np, codes, values, group_count):
+    """Per-group count, mean and population standard deviation, ignoring NaN values."""
+    valid = ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    count = np.bincount(codes, minlength=group_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(codes, weights=values, minlength=group_count) / count
+        deviation = values - mean[codes]
+        std = np.sqrt(np.bincount(codes, weights=deviation * deviation, minlength=group_count) / count)
+    return count, mean, std, codes, values
+
+
+def _descending(*values):
+    """Sort key matching SQL ORDER BY ... DESC, which puts NULLs last."""
+    return tuple((value is None, -(value or 0)) for value in values)
+
+
+def _or_none(value):
+    return None if value != value else float(value)  # NaN -> None
+
+
+def _percent(value):
+    return f"{value:.2f}" if value is not None else "N/A"
+
+
+class AnalyticsSnapshot:
+    """The analytics columns of the students and marks tables at one point in time."""
+
+    def __init__(self, np, course_names, faculty_names, subjects, students, marks):
+        self.np = np
+        self.course_names = course_names  # course_id -> name
+        self.faculty_names = faculty_names  # faculty_id -> name
+        self.subjects = subjects  # subject code -> subject_name
+        self.student_course, self.student_faculty, self.student_active, self.tenth, self.twelfth = students
+        self.mark_course, self.mark_subject, self.mark_ratio = marks
+
+    @classmethod
+    def load(cls, conn, batch_size=ANALYTICS_LOAD_BATCH):
+        np = _numpy()
+        subject_codes = {}
+
+        def encode_subjects(column):
+            return np.fromiter((subject_codes.setdefault(name, len(subject_codes)) for name in column),
+                               dtype=np.int32, count=len(column))
+
+        def int32(column):
+            return np.array(column, dtype=np.int32)
+
+        def boolean(column):
+            return np.array(column, dtype=bool)  # None (NULL status) counts as inactive
+
+        def float64(column):
+            return np.array(column, dtype=np.float64)  # None becomes NaN
+
+        students = _load_columns(conn, STUDENT_COLUMNS_SQL, (int32, int32, boolean, float64, float64), batch_size)
+        marks = _load_columns(conn, MARK_COLUMNS_SQL, (int32, encode_subjects, float64), batch_size)
+        reference = reference_data.tables(conn)
+        course_names = dict(reference["courses"].names_by_id)
+        faculty_names = dict(reference["faculties"].names_by_id)
+        subjects = [name for name, _ in sorted(subject_codes.items(), key=lambda item: item[1])]
+        return cls(np, course_names, faculty_names, subjects, students, marks)
+
+    @property
+    def size(self):
+        return len(self.student_course), len(self.mark_course)
+
+    # --- Group-by results ---
+    def students_per_course(self):
+        counts = self.np.bincount(self.student_course[self.student_course >= 0])
+        rows = [(name, int(counts[course_id]) if course_id < len(counts) else 0)
+                for course_id, name in self.course_names.items()]
+        return sorted(rows, key=lambda row: _descending(row[1]))
+
+    def average_marks_per_course(self):
+        keys, codes = self.np.unique(self.mark_course, return_inverse=True)
+        counts = self.np.bincount(codes, minlength=len(keys))
+        _, mean, _, _, _ = _group_stats(self.np, codes, self.mark_ratio, len(keys))
+        rows = [(self.course_names[course_id], _or_none(mean[i] * 100))
+                for i, course_id in enumerate(keys.tolist()) if counts[i] and course_id in self.course_names]
+        return sorted(rows, key=lambda row: _descending(row[1]))
+
+    def enrollment_status_breakdown(self):
+        active = int(self.student_active.sum())
+        rows = [("Inactive", len(self.student_active) - active), ("Active", active)]
+        return [row for row in rows if row[1]]
+
+    def faculty_academic_performance(self):
+        known = self.student_faculty >= 0
+        faculty = self.student_faculty[known]
+        group_count = max(max(self.faculty_names, default=0), int(faculty.max(initial=0))) + 1
+        counts = self.np.bincount(faculty, minlength=group_count)
+        _, tenth, _, _, _ = _group_stats(self.np, faculty, self.tenth[known], group_count)
+        _, twelfth, _, _, _ = _group_stats(self.np, faculty, self.twelfth[known], group_count)
+        rows = [(name, _or_none(tenth[faculty_id]), _or_none(twelfth[faculty_id]), int(counts[faculty_id]))
+                for faculty_id, name in self.faculty_names.items()]
+        return sorted(rows, key=lambda row: _descending(row[1], row[2], row[3]))
+
+    def _mark_groups(self, by):
+        """Dense group codes and labels for marks grouped by "course" or "subject"."""
+        if by == "subject":
+            return self.mark_subject, self.subjects
+        keys, codes = self.np.unique(self.mark_course, return_inverse=True)
+        return codes, [self.course_names.get(course_id, "Unknown") for course_id in keys.tolist()]
+
+    def mark_distribution(self, by="course"):
+        """[(group, marks, mean %, std %, *percentiles %)] of the marks percentage per group."""
+        np = self.np
+        codes, labels = self._mark_groups(by)
+        count, mean, std, codes, values = _group_stats(np, codes, self.mark_ratio * 100, len(labels))
+        order = np.lexsort((values, codes))
+        ends = np.cumsum(count)
+        rows = []
+        for group, label in enumerate(labels):
+            if not count[group]:
+                continue
+            group_values = values[order[ends[group] - count[group]:ends[group]]]
+            percentiles = np.percentile(group_values, PERCENTILES)
+            rows.append((label, int(count[group]), float(mean[group]), float(std[group]), *percentiles.tolist()))
+        return sorted(rows)
+
+    def mark_histogram(self, by="course", bins=HISTOGRAM_BINS):
+        """[(group, [count per bin])] over equal-width bins of 0-100%."""
+        np = self.np
+        codes, labels = self._mark_groups(by)
+        valid = ~np.isnan(self.mark_ratio)
+        bin_index = np.clip((self.mark_ratio[valid] * bins).astype(np.int64), 0, bins - 1)
+        counts = np.bincount(codes[valid].astype(np.int64) * bins + bin_index,
+                             minlength=len(labels) * bins).reshape(len(labels), bins)
+        return sorted((label, counts[group].tolist()) for group, label in enumerate(labels) if counts[group].any())
+
+    # --- Report lines ---
+    def mark_distribution_lines(self, by="course"):
+        label = by.capitalize()
+        percentile_header = "".join(f"{'P' + str(p):<8}" for p in PERCENTILES)
+        return table_lines(
+            f"Marks Distribution per {label} (% of max marks)",
+            "-" * (25 + 8 * 3 + 8 * len(PERCENTILES)),
+            f"{label:<25}{'Marks':<8}{'Mean':<8}{'StdDev':<8}{percentile_header}",
+            self.mark_distribution(by),
+            lambda row: f"{row[0]:<25}{row[1]:<8}" + "".join(f"{value:<8.2f}" for value in row[2:]),
+            "No marks data available.")
+
+    def mark_histogram_lines(self, by="course", bins=HISTOGRAM_BINS):
+        label = by.capitalize()
+        width = 100 // bins
+        return table_lines(
+            f"Marks Histogram per {label} (count of marks by % band)",
+            "-" * (25 + 8 * bins),
+            f"{label:<25}" + "".join(f"{f'{i * width}-{(i + 1) * width}':<8}" for i in range(bins)),
+            self.mark_histogram(by, bins),
+            lambda row: f"{row[0]:<25}" + "".join(f"{count:<8}" for count in row[1]),
+            "No marks data available.")
+
+    def all_insight_lines(self):
+        """Every insight, classic and distribution, from this one load."""
+        sections = [
+            table_lines("Students Enrolled Per Course", "-" * 40, f"{'Course':<25}{'Total Students':<15}",
+                        self.students_per_course(), lambda row: f"{row[0]:<25}{row[1]:<15}"),
+            table_lines("Average Marks Percentage Per Course", "-" * 48, f"{'Course':<25}{'Average Percentage':<20}",
+                        self.average_marks_per_course(),
+                        lambda row: f"{row[0]:<25}{_percent(row[1]) + '%' if row[1] is not None else 'N/A':<20}",
+                        "No marks data available for courses."),
+            table_lines("Student Enrollment Status Breakdown", "-" * 35, f"{'Status':<15}{'Total Students':<15}",
+                        self.enrollment_status_breakdown(), lambda row: f"{row[0]:<15}{row[1]:<15}"),
+            table_lines("Faculty Academic Performance (Avg 10th/12th %)", "-" * 64,
+                        f"{'Faculty':<15}{'Avg 10th %':<15}{'Avg 12th %':<15}{'Total Students':<15}",
+                        self.faculty_academic_performance(),
+                        lambda row: f"{row[0]:<15}{_percent(row[1]):<15}{_percent(row[2]):<15}{row[3]:<15}"),
+            self.mark_distribution_lines("course"),
+            self.mark_distribution_lines("subject"),
+            self.mark_histogram_lines("course"),
+        ]
+        for index, lines in enumerate(sections):
+            if index:
+                yield "\n"
+            yield from lines
+
+
+# Insight name (as shown in the Analytics tab) -> line generator
+INSIGHTS = {
+    "Marks Distribution per Course": lambda conn: AnalyticsSnapshot.load(conn).mark_distribution_lines("course"),
+    "Marks Distribution per Subject": lambda conn: AnalyticsSnapshot.load(conn).mark_distribution_lines("subject"),
+    "Marks Histogram per Course": lambda conn: AnalyticsSnapshot.load(conn).mark_histogram_lines("course"),
+    "All Insights (single pass)": lambda conn: AnalyticsSnapshot.load(conn).all_insight_lines(),
+}
+INSIGHT_TABLES = {name: ("students", "marks", "courses", "faculties") for name in INSIGHTS}
+
+
+# --- Benchmark ---
+# The per-query SQL equivalent of one snapshot: each statement scans a base table
+BASELINE_SQL = (
+    """SELECT c.course_name, COUNT(s.student_id) FROM courses c
+       LEFT JOIN students s ON c.course_id = s.course_id GROUP BY c.course_name""",
+    """SELECT c.course_name, AVG(m.marks_obtained * 1.0 / m.max_marks) * 100 FROM marks m
+       JOIN courses c ON m.course_id = c.course_id GROUP BY c.course_name""",
+    """SELECT CASE WHEN enrollment_status = 1 THEN 'Active' ELSE 'Inactive' END AS status, COUNT(*)
+       FROM students GROUP BY status""",
+    """SELECT f.faculty_name, AVG(s.tenth_percent), AVG(s.twelfth_percent), COUNT(s.student_id) FROM faculties f
+       LEFT JOIN students s ON f.faculty_id = s.faculty_id GROUP BY f.faculty_name""",
+    """SELECT course_id, COUNT(*), AVG(marks_obtained * 100.0 / max_marks),
+           AVG((marks_obtained * 100.0 / max_marks) * (marks_obtained * 100.0 / max_marks))
+       FROM marks GROUP BY course_id""",
+    """SELECT subject_name, COUNT(*), AVG(marks_obtained * 100.0 / max_marks),
+           AVG((marks_obtained * 100.0 / max_marks) * (marks_obtained * 100.0 / max_marks))
+       FROM marks GROUP BY subject_name""",
+    """SELECT course_id, MIN(CAST(marks_obtained * 10.0 / max_marks AS INTEGER), 9) AS band, COUNT(*)
+       FROM marks GROUP BY course_id, band""",
+)
+
+
+def build_benchmark_database(mark_rows, student_rows, seed=0):
+    """An in-memory database with the application schema and synthetic students and marks."""
+    from sdms.migrations import migrate
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    course_ids = [row[0] for row in conn.execute("SELECT course_id FROM courses")]
+    faculty_ids = [row[0] for row in conn.execute("SELECT faculty_id FROM faculties")]
+    year_ids = [row[0] for row in conn.execute("SELECT year_id FROM academic_years")]
+    with conn:
+        conn.executemany(
+            """INSERT INTO students (roll_number, name, enrollment_date, course_id, academic_year_id, faculty_id,
+                   tenth_percent, twelfth_percent, enrollment_status) VALUES (?, ?, '2024-06-01', ?, ?, ?, ?, ?, ?)""",
+            ((f"B{i:07d}", f"Student {i}", rng.choice(course_ids), rng.choice(year_ids), rng.choice(faculty_ids),
+              round(rng.uniform(35, 100), 2), round(rng.uniform(35, 100), 2), rng.random() < 0.9)
+             for i in range(student_rows)))
+        subjects = [f"Subject {i}" for i in range(12)]
+        conn.executemany(
+            """INSERT INTO marks (student_id, course_id, subject_name, semester, marks_obtained, max_marks, grade)
+               VALUES (?, ?, ?, ?, ?, 100, NULL)""",
+            ((rng.randint(1, student_rows), rng.choice(course_ids), rng.choice(subjects), rng.randint(1, 6),
+              round(rng.gauss(62, 15), 1)) for _ in range(mark_rows)))
+    return conn
+
+
+def run_benchmark(conn, repeat=3):
+    """Returns (best SQL seconds, best load seconds, best compute seconds)."""
+    sql_times, load_times, compute_times = [], [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for sql in BASELINE_SQL:
+            conn.execute(sql).fetchall()
+        sql_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        snapshot = AnalyticsSnapshot.load(conn)
+        loaded = time.perf_counter()
+        for _ in snapshot.all_insight_lines():
+            pass
+        compute_times.append(time.perf_counter() - loaded)
+        load_times.append(loaded - started)
+    return min(sql_times), min(load_times), min(compute_times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sdms.analytics", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("benchmark", help="compare the columnar engine with per-query SQL")
+    bench.add_argument("--marks", type=int, default=1000000, help="synthetic marks rows (default 1000000)")
+    bench.add_argument("--students", type=int, default=50000, help="synthetic students (default 50000)")
+    bench.add_argument("--repeat", type=int, default=3, help="runs to take the best of (default 3)")
+    args = parser.parse_args(argv)
+
+    try:
+        _numpy()
+    except ReportError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Building {args.students} students and {args.marks} marks...")
+    conn = build_benchmark_database(args.marks, args.students)
+    sql_seconds, load_seconds, compute_seconds = run_benchmark(conn, args.repeat)
+    engine_seconds = load_seconds + compute_seconds
+    print(f"Per-query SQL ({len(BASELINE_SQL)} queries): {sql_seconds:.3f}s")
+    print(f"Columnar engine: {engine_seconds:.3f}s (load {load_seconds:.3f}s, compute {compute_seconds:.3f}s)")
+    print(f"Compute from a loaded snapshot: {compute_seconds / sql_seconds:.1%} of the SQL time "
+          f"(and it also yields percentiles, which SQLite has no aggregate for).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
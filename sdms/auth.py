@@ -0,0 +1,34 @@
+"""Password hashing and user accounts, shared by the login windows, the HTTP service and the seed data."""
+import hashlib
+import sqlite3
+
+from sdms.records import RecordError
+
+
+def hash_password(password):
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+
+
+def check_login(conn, user_id, password):
+    """Returns (user_id, name, role) for valid credentials, else None."""
+    return conn.execute("SELECT user_id, name, role FROM users WHERE user_id=? AND password_hash=?",
+                        (user_id, hash_password(password))).fetchone()
+
+
+def register_user(conn, user_id, password, name):
+    """Adds a user with the student role; like the writes in sdms.records, leaves committing to the caller."""
+    if not user_id or not password or not name:
+        raise RecordError("All fields are required.")
+    try:
+        conn.execute("INSERT INTO users (user_id, password_hash, name, role) VALUES (?, ?, ?, 'student')",
+                     (user_id, hash_password(password), name))
+    except sqlite3.IntegrityError:
+        raise RecordError("User ID already exists. Please choose a different one.")
+
+
+def change_password(conn, user_id, old_password, new_password):
+    if not new_password:
+        raise RecordError("All fields are required.")
+    if check_login(conn, user_id, old_password) is None:
+        raise RecordError("User ID or old password is incorrect.")
+    conn.execute("UPDATE users SET password_hash=? WHERE user_id=?", (hash_password(new_password), user_id))
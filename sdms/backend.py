@@ -0,0 +1,278 @@
+"""Where the Tk client reads and writes its data.
+
+LocalBackend opens the database file directly, as the application always has.
+HttpBackend talks to a shared "python -m sdms serve" process (sdms.server)
+over JSON, so several front-desk machines can work against one database.
+Both have the same methods and raise RecordError (from sdms.records) or
+ReportError (from sdms.reports) for problems the user can fix.
+
+    backend = make_backend(os.environ.get("SDMS_SERVER_URL"))
+"""
+import json
+import time
+import urllib.parse
+
+from sdms import analytics, auth, records, reports
+from sdms.db import commit_changes, get_db_connection
+from sdms.result_cache import result_cache
+from sdms.search import search_students_page
+from sdms.students import STUDENT_PAGE_SIZE, StudentRow, fetch_students_page
+
+HTTP_TIMEOUT = 30  # Seconds to wait for the server before giving up on a request
+REFERENCE_REFRESH_SECONDS = 10  # How long HttpBackend reuses course/year/faculty names before asking again
+
+# Write operations: name -> (function(conn, *args), tables it changes).
+# LocalBackend commits each one on its own; sdms.server commits them in batches.
+WRITES = {
+    "add_student": (records.insert_student, ("students",)),
+    "update_student": (records.update_student, ("students",)),
+    "delete_student": (records.delete_student, ("marks", "students")),
+    "add_marks": (records.add_marks, ("marks",)),
+    "record_payment": (records.record_payment, ("payments",)),
+    "add_feedback": (records.add_feedback, ("feedback",)),
+    "register_user": (auth.register_user, ("users",)),
+    "change_password": (auth.change_password, ("users",)),
+}
+
+# Report name -> cached line generator taking (conn, *params)
+REPORTS = {
+    name: result_cache.cached(name, reports.REPORT_TABLES[name], make_lines)
+    for name, make_lines in (
+        ("enrollment", reports.enrollment_report_lines),
+        ("marks", reports.marks_report_lines),
+        ("payments", reports.payment_report_lines),
+    )
+}
+# Insight display name -> cached line generator taking (conn)
+INSIGHTS = {
+    name: result_cache.cached(name, source.INSIGHT_TABLES[name], make_lines)
+    for source in (reports, analytics)
+    for name, make_lines in source.INSIGHTS.items()
+}
+
+
+class BackendError(records.RecordError):
+    """The server could not be reached or failed; the message is shown to the user."""
+
+
+class LocalBackend:
+    """Direct SQLite access through the pooled per-thread connections."""
+
+    is_local = True
+
+    def execute_write(self, op, *args):
+        """Runs one WRITES operation in its own transaction and returns its result."""
+        func, tables = WRITES[op]
+        conn = get_db_connection()
+        try:
+            result = func(conn, *args)
+            commit_changes(conn, *tables)
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+        return result
+
+    # --- Reads ---
+    def login(self, user_id, password):
+        return auth.check_login(get_db_connection(), user_id, password)
+
+    def reference_names(self):
+        return records.reference_names(get_db_connection())
+
+    def students_page(self, before_id=None, limit=STUDENT_PAGE_SIZE):
+        """Returns (rows, next_cursor) for the plain student list."""
+        rows = fetch_students_page(get_db_connection(), before_id, limit)
+        return rows, (rows[-1].student_id if len(rows) == limit else None)
+
+    def search_students(self, search_term, cursor=None, limit=STUDENT_PAGE_SIZE):
+        return search_students_page(get_db_connection(), search_term, cursor, limit)
+
+    def get_student(self, student_id):
+        row = records.fetch_student(get_db_connection(), student_id)
+        if row is None:
+            raise records.RecordNotFound(f"No student with ID {student_id}.")
+        return row
+
+    def student_marks(self, roll_number):
+        return records.fetch_marks_by_roll(get_db_connection(), roll_number)
+
+    def payments_page(self, student_id=None, before_id=None, limit=STUDENT_PAGE_SIZE):
+        return records.fetch_payments_page(get_db_connection(), student_id, before_id, limit)
+
+    def report_lines(self, name, *params):
+        """Yields the lines of a report from REPORTS; run it on the thread that consumes it."""
+        if name not in REPORTS:
+            raise reports.ReportError(f"Unknown report '{name}'.")
+        yield from REPORTS[name](get_db_connection(), *params)
+
+    def insight_lines(self, name):
+        if name not in INSIGHTS:
+            raise reports.ReportError(f"Unknown insight '{name}'.")
+        yield from INSIGHTS[name](get_db_connection())
+
+    def insight_names(self):
+        return list(INSIGHTS)
+
+    # --- Writes ---
+    def add_student(self, record):
+        return self.execute_write("add_student", record)
+
+    def update_student(self, student_id, record):
+        self.execute_write("update_student", student_id, record)
+
+    def delete_student(self, student_id):
+        self.execute_write("delete_student", student_id)
+
+    def add_marks(self, roll_number, course_name, subject_name, semester, marks_obtained, max_marks, grade=None):
+        return self.execute_write("add_marks", roll_number, course_name, subject_name, semester,
+                                  marks_obtained, max_marks, grade)
+
+    def record_payment(self, roll_number, amount_paid, payment_type, description=""):
+        return self.execute_write("record_payment", roll_number, amount_paid, payment_type, description)
+
+    def add_feedback(self, name, email, feedback_text):
+        return self.execute_write("add_feedback", name, email, feedback_text)
+
+    def register_user(self, user_id, password, name):
+        self.execute_write("register_user", user_id, password, name)
+
+    def change_password(self, user_id, old_password, new_password):
+        self.execute_write("change_password", user_id, old_password, new_password)
+
+
+class HttpBackend:
+    """Client for the JSON API served by sdms.server."""
+
+    is_local = False
+
+    def __init__(self, base_url, timeout=HTTP_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._token = None  # Session token from login(), sent with every later request
+        self._reference = None
+        self._reference_fetched = 0.0
+
+    def _open(self, method, path, params=None, body=None):
+        import urllib.error
+        import urllib.request  # Slow to import (http.client, email, ssl); only the HTTP backend needs it
+
+        url = self.base_url + path
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self._token:
+            headers["Authorization"] = f"Bearer {self._token}"
+        request = urllib.request.Request(url, data=data, method=method, headers=headers)
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            try:
+                error = json.load(e)
+            except ValueError:
+                error = {}
+            message = error.get("error") or f"Server error {e.code}: {e.reason}"
+            if e.code == 401:
+                raise BackendError(message) from None
+            if error.get("kind") == "report":
+                raise reports.ReportError(message) from None
+            if e.code == 404:
+                raise records.RecordNotFound(message) from None
+            if e.code < 500:
+                raise records.RecordError(message) from None
+            raise BackendError(message) from None
+        except OSError as e:
+            raise BackendError(f"Cannot reach the server at {self.base_url}: {e}") from None
+
+    def _call(self, method, path, params=None, body=None):
+        with self._open(method, path, params, body) as response:
+            return json.load(response)
+
+    def _lines(self, path, params=None):
+        # Reports arrive as JSON lines, one encoded text line each, and are passed on as they are read
+        with self._open("GET", path, params) as response:
+            for raw in response:
+                line = json.loads(raw)
+                if isinstance(line, dict):
+                    raise reports.ReportError(line["error"])
+                yield line
+
+    # --- Reads ---
+    def login(self, user_id, password):
+        reply = self._call("POST", "/api/login", body={"user_id": user_id, "password": password})
+        self._token = reply["token"]
+        return tuple(reply["user"]) if reply["user"] else None
+
+    def reference_names(self):
+        # The server's registry reloads only when the tables change; a short local reuse saves the round trip
+        if self._reference is None or time.monotonic() - self._reference_fetched >= REFERENCE_REFRESH_SECONDS:
+            self._reference = self._call("GET", "/api/reference")
+            self._reference_fetched = time.monotonic()
+        return self._reference
+
+    def students_page(self, before_id=None, limit=STUDENT_PAGE_SIZE):
+        page = self._call("GET", "/api/students", {"cursor": before_id, "limit": limit})
+        return [StudentRow._make(row) for row in page["rows"]], page["next"]
+
+    def search_students(self, search_term, cursor=None, limit=STUDENT_PAGE_SIZE):
+        page = self._call("GET", "/api/students", {"q": search_term, "cursor": cursor, "limit": limit})
+        return [StudentRow._make(row) for row in page["rows"]], page["next"]
+
+    def get_student(self, student_id):
+        return StudentRow._make(self._call("GET", f"/api/students/{student_id}")["row"])
+
+    def student_marks(self, roll_number):
+        return self._call("GET", "/api/marks", {"roll_number": roll_number})["rows"]
+
+    def payments_page(self, student_id=None, before_id=None, limit=STUDENT_PAGE_SIZE):
+        return self._call("GET", "/api/payments", {"student_id": student_id, "cursor": before_id, "limit": limit})["rows"]
+
+    def report_lines(self, name, *params):
+        query = dict(zip(("course_name", "semester"), params))
+        return self._lines(f"/api/reports/{urllib.parse.quote(name)}", query)
+
+    def insight_lines(self, name):
+        return self._lines("/api/insights", {"name": name})
+
+    def insight_names(self):
+        return self._call("GET", "/api/insights")["names"]
+
+    # --- Writes ---
+    def add_student(self, record):
+        return self._call("POST", "/api/students", body=record)["student_id"]
+
+    def update_student(self, student_id, record):
+        self._call("PUT", f"/api/students/{student_id}", body=record)
+
+    def delete_student(self, student_id):
+        self._call("DELETE", f"/api/students/{student_id}")
+
+    def add_marks(self, roll_number, course_name, subject_name, semester, marks_obtained, max_marks, grade=None):
+        return self._call("POST", "/api/marks", body={
+            "roll_number": roll_number, "course_name": course_name, "subject_name": subject_name,
+            "semester": semester, "marks_obtained": marks_obtained, "max_marks": max_marks, "grade": grade,
+        })["mark_id"]
+
+    def record_payment(self, roll_number, amount_paid, payment_type, description=""):
+        return self._call("POST", "/api/payments", body={
+            "roll_number": roll_number, "amount_paid": amount_paid,
+            "payment_type": payment_type, "description": description,
+        })["receipt"]
+
+    def add_feedback(self, name, email, feedback_text):
+        return self._call("POST", "/api/feedback", body={
+            "name": name, "email": email, "feedback_text": feedback_text,
+        })["feedback_id"]
+
+    def register_user(self, user_id, password, name):
+        self._call("POST", "/api/users", body={"user_id": user_id, "password": password, "name": name})
+
+    def change_password(self, user_id, old_password, new_password):
+        self._call("PUT", f"/api/users/{urllib.parse.quote(user_id, safe='')}/password",
+                   body={"old_password": old_password, "new_password": new_password})
+
+
+def make_backend(server_url=None):
+    """HttpBackend for server_url, or LocalBackend when it is empty."""
+    return HttpBackend(server_url) if server_url else LocalBackend()
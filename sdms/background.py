@@ -0,0 +1,58 @@
+"""The main window's background photo, scaled to whatever size the window takes.
+
+The source file is decoded once into a master copy no larger than the screen,
+so a large photo costs its full decode a single time. Each window size is then
+scaled from the master: with a cheap filter while the user is still dragging
+or resizing, and with a high-quality filter once the size settles. High-quality
+results are kept per size, so returning to a size (e.g. toggling maximize)
+needs no rescale at all.
+"""
+from PIL import Image
+
+from sdms.thumbnails import LRUCache
+
+FAST_FILTER = Image.NEAREST  # ~2 ms for a full-screen frame; replaced once resizing pauses
+QUALITY_FILTER = Image.LANCZOS
+BACKGROUND_CACHED_SIZES = 4  # High-quality renderings kept; each is width * height * 4 bytes in Tk
+
+
+class ScaledBackground:
+    """One photo scaled to window sizes from a master copy decoded once."""
+
+    def __init__(self, path, max_size, convert=None, cached_sizes=BACKGROUND_CACHED_SIZES):
+        self.path = path
+        self.max_size = max_size
+        # Applied to every rendering, e.g. ImageTk.PhotoImage, so cached entries are ready to draw
+        self.convert = convert or (lambda image: image)
+        self._master = None
+        self._rendered = LRUCache(cached_sizes)  # (width, height) -> converted high-quality rendering
+
+    @property
+    def master(self):
+        if self._master is None:
+            self._master = self._load_master()
+        return self._master
+
+    def _load_master(self):
+        with Image.open(self.path) as source:
+            source.draft("RGB", self.max_size)  # JPEGs decode straight to a smaller scale when much larger
+            image = source.convert("RGB")
+        scale = max(self.max_size[0] / image.width, self.max_size[1] / image.height)
+        if scale < 1:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, QUALITY_FILTER, reducing_gap=3.0)
+        return image
+
+    def render(self, size, fast=False):
+        """Returns the photo stretched to size; fast=True skips the high-quality filter unless it is cached."""
+        rendered = self._rendered.get(size)
+        if rendered is not None:
+            return rendered
+        if fast:
+            return self.convert(self.master.resize(size, FAST_FILTER))
+        rendered = self.convert(self.master.resize(size, QUALITY_FILTER))
+        self._rendered.put(size, rendered)
+        return rendered
+
+    def is_cached(self, size):
+        return self._rendered.get(size) is not None
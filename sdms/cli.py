@@ -0,0 +1,260 @@
+"""Headless command line for reports, exports, imports and batch jobs.
+
+Runs the same queries and renderers as the Tk application without importing
+tkinter, ttkbootstrap or ImageTk, so it works from cron or on a server with no
+display. Heavy dependencies (reportlab, PIL, numpy) are imported only by the
+commands that need them.
+
+    python -m sdms report enrollment
+    python -m sdms report marks --course "Computer Applications" --semester 1 -o marks.pdf
+    python -m sdms report payments --format csv -o payments.csv
+    python -m sdms insights --name students-per-course
+    python -m sdms import students.csv
+    python -m sdms import marks.xlsx --marks
+    python -m sdms idcards cards.zip --course "Science"
+    python -m sdms marks-pdfs --course "Science" --semester 2 --merged science_sem2.pdf
+    python -m sdms export table:students students.parquet
+    python -m sdms search rebuild | summaries check | analytics benchmark | students benchmark
+    python -m sdms serve --port 8765
+    python -m sdms startup --app
+"""
+import argparse
+import re
+import sys
+import time
+
+from sdms import reports
+from sdms.db import get_db_connection, manager
+from sdms.jobs import Job
+
+REPORT_NAMES = ("enrollment", "marks", "payments")
+REPORT_FORMATS = ("text", "pdf", "csv", "jsonl", "parquet")
+PROGRESS_INTERVAL = 1.0  # Seconds between progress lines on stderr
+
+# Commands that forward their arguments to an existing module's own CLI
+MODULE_COMMANDS = {
+    "export": "sdms.export",
+    "search": "sdms.search",
+    "summaries": "sdms.summaries",
+    "analytics": "sdms.analytics",
+    "students": "sdms.students",
+    "serve": "sdms.server",
+    "startup": "sdms.startup",
+}
+
+
+class CommandError(Exception):
+    """The command cannot be completed; the message is shown to the user."""
+
+
+class ConsoleJob(Job):
+    """Job handle for running background-job functions in the foreground, with progress on stderr."""
+
+    def __init__(self, name, stream=sys.stderr):
+        super().__init__(name)
+        self.stream = stream
+        self._last_printed = 0.0
+
+    def report_progress(self, fraction=None, message=""):
+        super().report_progress(fraction, message)
+        now = time.monotonic()
+        if now - self._last_printed >= PROGRESS_INTERVAL:
+            self._last_printed = now
+            print(self.describe(), file=self.stream, flush=True)
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _all_insights():
+    """Slug -> (display name, line generator) for every insight the Analytics tab offers."""
+    from sdms import analytics
+
+    insights = {}
+    for source in (reports.INSIGHTS, analytics.INSIGHTS):
+        for name, make_lines in source.items():
+            insights[_slug(name)] = (name, make_lines)
+    return insights
+
+
+def _write_lines(lines, output, fmt):
+    if fmt == "pdf":
+        from sdms.pdf_reports import write_report_pdf
+
+        write_report_pdf(lines, output)
+    elif output:
+        reports.write_report_file(lines, output)
+    else:
+        for chunk in reports.iter_chunks(lines):
+            sys.stdout.write(chunk)
+
+
+def _output_format(args):
+    fmt = args.format
+    if fmt is None:
+        fmt = "pdf" if args.output and args.output.lower().endswith(".pdf") else "text"
+    if fmt != "text" and not args.output:
+        raise CommandError(f"--format {fmt} needs an output file (-o).")
+    return fmt
+
+
+# --- Commands ---
+def cmd_report(args, conn):
+    fmt = _output_format(args)
+    params = {}
+    if args.name == "marks":
+        if not args.course or args.semester is None:
+            raise CommandError("The marks report needs --course and --semester.")
+        params = {"course_name": args.course, "semester": args.semester}
+    if fmt in ("csv", "jsonl", "parquet"):
+        from sdms.export import export
+
+        count = export(conn, args.name, args.output, fmt, **params)
+        print(f"Exported {count} rows to {args.output}", file=sys.stderr)
+        return
+    make_lines = {
+        "enrollment": reports.enrollment_report_lines,
+        "marks": reports.marks_report_lines,
+        "payments": reports.payment_report_lines,
+    }[args.name]
+    _write_lines(make_lines(conn, *params.values()), args.output, fmt)
+
+
+def cmd_insights(args, conn):
+    insights = _all_insights()
+    if args.list:
+        for slug, (name, _) in insights.items():
+            print(f"{slug:<35}{name}")
+        return
+    fmt = _output_format(args)
+    selected = args.name or [_slug(name) for name in reports.INSIGHTS]
+    unknown = [name for name in selected if _slug(name) not in insights]
+    if unknown:
+        raise CommandError(f"Unknown insight {', '.join(unknown)}; see 'python -m sdms insights --list'.")
+
+    def all_lines():
+        for index, name in enumerate(selected):
+            if index:
+                yield "\n"
+            yield from insights[_slug(name)][1](conn)
+
+    _write_lines(all_lines(), args.output, fmt)
+
+
+def cmd_import(args, conn):
+    if args.marks:
+        from sdms.marks_import import import_marks as run_import
+    else:
+        from sdms.importer import import_students as run_import
+    result = run_import(conn, args.file, ConsoleJob("Import"))
+    print(result.summary())
+    if result.errors and args.strict:
+        raise CommandError(f"{len(result.errors)} rows were rejected.")
+
+
+def cmd_idcards(args, conn):
+    from sdms.idcards import ID_CARD_BACKGROUND_PATH, fetch_id_card_students, generate_id_cards
+
+    students = fetch_id_card_students(conn, args.course, args.year, args.faculty)
+    if not students:
+        raise CommandError("No students match the given course, year and faculty.")
+    result = generate_id_cards(students, args.output, args.background or ID_CARD_BACKGROUND_PATH,
+                               workers=args.workers, resume=not args.no_resume, job=ConsoleJob("ID cards"))
+    print(result.summary())
+    if result.failed:
+        raise CommandError(f"{len(result.failed)} cards failed.")
+
+
+def cmd_marks_pdfs(args, conn):
+    from sdms.pdf_reports import fetch_cohort_marks, generate_marks_pdfs
+
+    if not args.output_dir and not args.merged:
+        raise CommandError("Give --output-dir, --merged or both.")
+    students = fetch_cohort_marks(conn, args.course, args.semester)
+    if not students:
+        raise CommandError(f"No marks found for {args.course}, Semester {args.semester}.")
+    result = generate_marks_pdfs(students, output_dir=args.output_dir, merged_path=args.merged,
+                                 workers=args.workers, job=ConsoleJob("Marks PDFs"))
+    print(result.summary())
+    if result.failed:
+        raise CommandError(f"{len(result.failed)} reports failed.")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m sdms", description="Student database tasks without the GUI.",
+                                     epilog="Also: " + ", ".join(f"{name} ... (see python -m {module} --help)"
+                                                                 for name, module in MODULE_COMMANDS.items()))
+    parser.add_argument("--db", help=f"database file (default {manager.database})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="print or save a report")
+    report.add_argument("name", choices=REPORT_NAMES)
+    report.add_argument("--course", help="course name (marks report)")
+    report.add_argument("--semester", type=int, help="semester number (marks report)")
+    report.add_argument("--format", choices=REPORT_FORMATS, help="default: text, or pdf for a .pdf output")
+    report.add_argument("-o", "--output", help="output file (default: print text to stdout)")
+    report.set_defaults(func=cmd_report)
+
+    insights = commands.add_parser("insights", help="print or save analytics insights")
+    insights.add_argument("--name", action="append", help="insight to include (repeatable; default: the standard four)")
+    insights.add_argument("--list", action="store_true", help="list insight names and exit")
+    insights.add_argument("--format", choices=("text", "pdf"))
+    insights.add_argument("-o", "--output", help="output file (default: print text to stdout)")
+    insights.set_defaults(func=cmd_insights)
+
+    import_ = commands.add_parser("import", help="import students (or marks) from CSV/XLSX")
+    import_.add_argument("file")
+    import_.add_argument("--marks", action="store_true", help="the file is a marks sheet")
+    import_.add_argument("--strict", action="store_true", help="exit with an error if any row is rejected")
+    import_.set_defaults(func=cmd_import)
+
+    idcards = commands.add_parser("idcards", help="render ID cards to a folder or .zip")
+    idcards.add_argument("output", help="output folder, or a .zip file")
+    idcards.add_argument("--course")
+    idcards.add_argument("--year", help="academic year name")
+    idcards.add_argument("--faculty")
+    idcards.add_argument("--background", help="card background image")
+    idcards.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    idcards.add_argument("--no-resume", action="store_true", help="render every card even if already present")
+    idcards.set_defaults(func=cmd_idcards)
+
+    marks_pdfs = commands.add_parser("marks-pdfs", help="marks report PDFs for a whole course and semester")
+    marks_pdfs.add_argument("--course", required=True)
+    marks_pdfs.add_argument("--semester", type=int, required=True)
+    marks_pdfs.add_argument("--output-dir", help="folder for one PDF per student")
+    marks_pdfs.add_argument("--merged", help="single PDF with a bookmark per student")
+    marks_pdfs.add_argument("--workers", type=int, help="build processes (default: one per CPU)")
+    marks_pdfs.set_defaults(func=cmd_marks_pdfs)
+    return parser
+
+
+def main(argv=None):
+    from importlib import import_module
+
+    from sdms.export import ExportError
+    from sdms.importer import ImportFileError
+    from sdms.migrations import migrate
+
+    argv = sys.argv[1:] if argv is None else argv
+    db_args = []
+    if argv[:1] == ["--db"] and len(argv) > 1:
+        db_args, argv = argv[:2], argv[2:]
+    if argv and argv[0] in MODULE_COMMANDS:
+        if db_args:
+            manager.database = db_args[1]
+        return import_module(MODULE_COMMANDS[argv[0]]).main(argv[1:])
+
+    args = build_parser().parse_args(db_args + argv)
+    if args.db:
+        manager.database = args.db
+    try:
+        conn = get_db_connection()
+        migrate(conn)
+        args.func(args, conn)
+    except (CommandError, ExportError, ImportFileError, reports.ReportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        manager.close_all()
+    return 0
@@ -0,0 +1,212 @@
+"""Long-lived, tuned SQLite connections shared by the whole application."""
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DATABASE_NAME = "student_database.db"
+
+# Applied once when a connection is opened, instead of paying for a cold
+# connection and an empty page cache on every handler call.
+CONNECTION_PRAGMAS = (
+    ("journal_mode", "WAL"),        # readers don't block the writer
+    ("synchronous", "NORMAL"),      # safe with WAL, far fewer fsyncs
+    ("busy_timeout", 5000),         # wait up to 5s for a lock instead of failing
+    ("cache_size", -32000),         # ~32 MB page cache (negative = KiB)
+    ("mmap_size", 268435456),       # map up to 256 MB of the file
+    ("temp_store", "MEMORY"),
+    ("foreign_keys", "ON"),
+)
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionManager:
+    """Hands out one persistent connection per thread.
+
+    sqlite3 connections may only be used from the thread that created them, so
+    the Tk thread and every background worker get their own connection, opened
+    lazily and kept until close_all() is called.
+    """
+
+    def __init__(self, database=DATABASE_NAME, pragmas=CONNECTION_PRAGMAS,
+                 statement_cache_size=STATEMENT_CACHE_SIZE):
+        self.database = database
+        self.pragmas = pragmas
+        self.statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}
+
+    def _open(self):
+        conn = sqlite3.connect(self.database, timeout=5.0,
+                               cached_statements=self.statement_cache_size)
+        for name, value in self.pragmas:
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def connection(self):
+        """Returns the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections[threading.get_ident()] = conn
+        return conn
+
+    def close_thread_connection(self):
+        """Closes the calling thread's connection (call before a worker exits)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            with self._lock:
+                self._connections.pop(threading.get_ident(), None)
+            conn.close()
+
+    def close_all(self):
+        """Closes every connection handed out so far (application shutdown)."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # Owned by another, still running thread; it goes away with it.
+                pass
+        self._local = threading.local()
+        close_change_trackers()
+
+
+# --- Change tracking ---
+class ChangeTracker:
+    """Counts the commits to one database file, for caches of what was read from it.
+
+    change_token(tables) combines this process's commit counts for tables
+    with a count of changes made by other connections, seen through PRAGMA
+    data_version on a private connection.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._lock = threading.Lock()
+        self._write_counts = {}  # table -> commits by this process that touched it
+        self._external_changes = 0  # changes by other connections seen through data_version
+        self._data_version = None
+        self._monitor = None  # private connection used only to read PRAGMA data_version
+
+    def _read_data_version(self):
+        # data_version on one connection changes whenever any other connection
+        # commits, so a private connection sees every commit, ours included.
+        if self._monitor is None:
+            self._monitor = sqlite3.connect(self.database, check_same_thread=False)
+        return _data_version(self._monitor)
+
+    def _observe(self):
+        # Call with self._lock held. data_version moves once per look, however
+        # many commits happened since, so a change only says "something changed".
+        version = self._read_data_version()
+        if version != self._data_version:
+            if self._data_version is not None:
+                self._external_changes += 1
+            self._data_version = version
+
+    def commit(self, conn, *tables):
+        """Commits conn's transaction and records that it changed tables.
+
+        Outside commits made before ours are counted while our transaction
+        still holds the write lock, so they cannot be mistaken for ours. After
+        the commit the baseline has to move past our own change; conn's own
+        data_version ignores its own commits, so if it moved across the commit
+        another connection committed too, possibly inside that baseline, and it
+        is counted as an outside change.
+        """
+        with self._lock:
+            self._observe()
+        before = _data_version(conn)
+        conn.commit()
+        with self._lock:
+            self._data_version = self._read_data_version()
+            if _data_version(conn) != before:
+                self._external_changes += 1
+            for table in tables:
+                self._write_counts[table] = self._write_counts.get(table, 0) + 1
+
+    def change_token(self, tables):
+        """A value that changes whenever tables are written here, or anything is written by another connection."""
+        with self._lock:
+            self._observe()
+            return (self._external_changes,) + tuple(self._write_counts.get(table, 0) for table in tables)
+
+    def close(self):
+        with self._lock:
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+
+
+class UntrackedDatabase:
+    """Stands in for ChangeTracker on in-memory databases, whose results are never reused.
+
+    Only the connection that created an in-memory database can see it, and
+    connection objects cannot be weakly referenced, so there is nothing safe
+    to key a cache entry on once the connection is gone.
+    """
+
+    def commit(self, conn, *tables):
+        conn.commit()
+
+    def change_token(self, tables):
+        return object()  # Equal to no earlier token
+
+
+_trackers = {}  # database file -> ChangeTracker
+_trackers_lock = threading.Lock()
+_UNTRACKED = UntrackedDatabase()
+
+
+def _data_version(conn):
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def change_tracker(conn):
+    """The ChangeTracker of the database file conn has open as main."""
+    database = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not database:
+        return _UNTRACKED
+    with _trackers_lock:
+        tracker = _trackers.get(database)
+        if tracker is None:
+            tracker = _trackers[database] = ChangeTracker(database)
+        return tracker
+
+
+def close_change_trackers():
+    """Closes the trackers' private connections; they reopen on next use."""
+    with _trackers_lock:
+        trackers = list(_trackers.values())
+    for tracker in trackers:
+        tracker.close()
+
+
+manager = ConnectionManager()
+
+
+def get_db_connection():
+    """Returns the pooled connection for the current thread. Do not close it."""
+    return manager.connection()
+
+
+def commit_changes(conn, *tables):
+    """Commits conn, recording that tables changed so cached results that read them are dropped."""
+    change_tracker(conn).commit(conn, *tables)
+
+
+@contextmanager
+def write_transaction(conn, *tables):
+    """Like `with conn:`, but commits through commit_changes()."""
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    commit_changes(conn, *tables)
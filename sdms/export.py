@@ -0,0 +1,180 @@
+"""Streaming export of reports and whole tables to CSV, JSONL or Parquet.
+
+Rows are pulled from the cursor with fetchmany() and written as they arrive,
+so memory use depends on EXPORT_BATCH_SIZE rather than on the table size.
+Parquet output needs the optional pyarrow package; its schema comes from the
+columns' declared types, so it does not depend on which rows come first.
+
+    python -m sdms.export enrollment enrollment.csv
+    python -m sdms.export marks marks.jsonl --course "Computer Applications" --semester 1
+    python -m sdms.export table:students students.parquet
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from sdms import reports
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+REPORT_EXPORTS = ("enrollment", "marks", "payments")
+# users is left out on purpose: it holds password hashes.
+EXPORTABLE_TABLES = ("students", "courses", "academic_years", "faculties", "marks", "payments", "feedback")
+
+
+class ExportError(Exception):
+    """The requested export or format is not available."""
+
+
+def export_names():
+    return list(REPORT_EXPORTS) + [f"table:{table}" for table in EXPORTABLE_TABLES]
+
+
+def export_query(conn, name, course_name=None, semester=None):
+    """Returns (sql, params) for a report name or 'table:<name>' dump."""
+    if name == "enrollment":
+        return reports.ENROLLMENT_REPORT_SQL, ()
+    if name == "payments":
+        return reports.PAYMENT_REPORT_SQL, ()
+    if name == "marks":
+        if not course_name or semester is None:
+            raise ExportError("The marks export needs a course and a semester.")
+        return reports.MARKS_REPORT_SQL, (reports.resolve_course_id(conn, course_name), int(semester))
+    if name.startswith("table:") and name[len("table:"):] in EXPORTABLE_TABLES:
+        return f"SELECT * FROM {name[len('table:'):]}", ()
+    raise ExportError(f"Unknown export '{name}'. Choose one of: {', '.join(export_names())}")
+
+
+def declared_column_types(conn, sql):
+    """The declared type of each result column of sql, '' for computed columns.
+
+    Read from a temporary view over the query; parameters are bound as NULL
+    there, since only the view's column list is looked at.
+    """
+    conn.execute(f"CREATE TEMP VIEW _export_columns AS {sql.replace('?', 'NULL')}")
+    try:
+        return [row[2] for row in conn.execute("PRAGMA temp.table_info(_export_columns)")]
+    finally:
+        conn.execute("DROP VIEW temp._export_columns")
+
+
+def _arrow_type(pa, declared_type):
+    # SQLite's column affinity rules; computed columns (no declared type) are text in our reports
+    declared_type = declared_type.upper()
+    if "INT" in declared_type:
+        return pa.int64()
+    if any(name in declared_type for name in ("CHAR", "CLOB", "TEXT")) or not declared_type:
+        return pa.string()
+    if "BLOB" in declared_type:
+        return pa.binary()
+    return pa.float64()
+
+
+def iter_batches(cursor, batch_size=EXPORT_BATCH_SIZE):
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def write_csv(f, columns, batches):
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+
+
+def write_jsonl(f, columns, batches):
+    for rows in batches:
+        f.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+
+def write_parquet(path, columns, batches, declared_types):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("Parquet export requires the 'pyarrow' package.")
+    schema = pa.schema([pa.field(column, _arrow_type(pa, declared))
+                        for column, declared in zip(columns, declared_types)])
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in batches:
+            try:
+                arrays = [pa.array([row[i] for row in rows], type=field.type) for i, field in enumerate(schema)]
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ExportError(f"A value does not match its column's declared type: {e}")
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return {"json": "jsonl", "ndjson": "jsonl", "pq": "parquet"}.get(extension, extension)
+
+
+def export(conn, name, path, fmt=None, job=None, batch_size=EXPORT_BATCH_SIZE, **params):
+    """Streams one report or table into path and returns the number of rows written.
+
+    The file is written under a temporary name and only moved into place once
+    complete, so a failed or cancelled export never leaves a truncated file.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+    sql, sql_params = export_query(conn, name, **params)
+    # Read before the query starts: the view used for this is dropped again
+    declared_types = declared_column_types(conn, sql) if fmt == "parquet" else None
+    cursor = conn.execute(sql, sql_params)
+    columns = [d[0] for d in cursor.description]
+    written = 0
+
+    def counted_batches():
+        nonlocal written
+        for rows in iter_batches(cursor, batch_size):
+            if job is not None:
+                job.check_cancelled()
+            yield rows
+            written += len(rows)
+            if job is not None:
+                job.report_progress(message=f"{written} rows written")
+
+    temp_path = path + ".part"
+    try:
+        if fmt == "parquet":
+            write_parquet(temp_path, columns, counted_batches(), declared_types)
+        else:
+            with open(temp_path, "w", newline="", encoding="utf-8") as f:
+                (write_csv if fmt == "csv" else write_jsonl)(f, columns, counted_batches())
+        os.replace(temp_path, path)
+    finally:
+        cursor.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return written
+
+
+def main(argv=None):
+    from sdms.db import get_db_connection
+
+    parser = argparse.ArgumentParser(prog="python -m sdms.export", description="Export a report or table.")
+    parser.add_argument("name", help="one of: " + ", ".join(export_names()))
+    parser.add_argument("path", help="output file; the extension picks the format unless --format is given")
+    parser.add_argument("--format", choices=EXPORT_FORMATS)
+    parser.add_argument("--course", help="course name (marks export)")
+    parser.add_argument("--semester", type=int, help="semester number (marks export)")
+    args = parser.parse_args(argv)
+
+    params = {"course_name": args.course, "semester": args.semester} if args.name == "marks" else {}
+    try:
+        count = export(get_db_connection(), args.name, args.path, args.format, **params)
+    except (ExportError, reports.ReportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {count} rows to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
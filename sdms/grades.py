@@ -0,0 +1,43 @@
+"""Grade bands and grade derivation from marks.
+
+Edit GRADE_BANDS to change the grading scheme, or pass bands explicitly.
+derive_grades() works on whole columns at once; it uses NumPy when installed
+and a plain bisect over the column otherwise.
+"""
+from bisect import bisect_right
+
+# (minimum percentage, grade), highest band first
+GRADE_BANDS = (
+    (90, "O"),
+    (80, "A+"),
+    (70, "A"),
+    (60, "B+"),
+    (50, "B"),
+    (45, "C"),
+    (40, "P"),
+    (0, "F"),
+)
+
+
+def _band_table(bands):
+    ordered = sorted(bands)
+    return [minimum for minimum, _ in ordered], [grade for _, grade in ordered]
+
+
+def derive_grade(marks_obtained, max_marks, bands=GRADE_BANDS):
+    return derive_grades([marks_obtained], [max_marks], bands)[0]
+
+
+def derive_grades(marks_obtained, max_marks, bands=GRADE_BANDS):
+    """Returns the grade for every (marks_obtained, max_marks) pair of two columns."""
+    thresholds, grades = _band_table(bands)
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        percent = np.asarray(marks_obtained, dtype=float) * 100.0 / np.asarray(max_marks, dtype=float)
+        index = np.searchsorted(np.asarray(thresholds, dtype=float), percent, side="right") - 1
+        return np.asarray(grades, dtype=object)[np.clip(index, 0, len(grades) - 1)].tolist()
+    return [grades[max(bisect_right(thresholds, m * 100.0 / mx) - 1, 0)]
+            for m, mx in zip(marks_obtained, max_marks)]
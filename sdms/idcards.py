@@ -0,0 +1,263 @@
+"""Student ID card rendering with PIL, for one student or a whole cohort."""
+import io
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image, ImageDraw, ImageFont
+
+from sdms.jobs import BatchResult
+from sdms.media import resolve_photo
+from sdms.thumbnails import thumbnail_cache
+
+CARD_WIDTH = 400
+CARD_HEIGHT = 250
+COLLEGE_NAME = "Saraswati College, Shegaon"
+COLLEGE_ADDRESS = "Gaulkhed Road, Shegaon Dist:- Buldhana, State:-Maharashtra (INDIA) Pin: 444 203"
+ID_CARD_BACKGROUND_PATH = "id_card_bg.png"  # Default background, as in the application
+
+ID_CARD_COLUMNS = """
+    s.name, s.roll_number, c.course_name, a.year_name, s.date_of_birth, s.blood_group,
+    s.contact_number, COALESCE(s.photo_hash, s.profile_picture_path), s.enrollment_date
+"""
+
+
+def fetch_id_card_student(conn, roll_number):
+    """Returns the card fields for one student, or None if the roll number is unknown."""
+    return conn.execute(f"""
+        SELECT {ID_CARD_COLUMNS}
+        FROM students s
+        LEFT JOIN courses c ON s.course_id = c.course_id
+        LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
+        WHERE s.roll_number = ?
+    """, (roll_number,)).fetchone()
+
+
+def fetch_id_card_students(conn, course_name=None, year_name=None, faculty_name=None):
+    """Returns card rows for every student matching the given course/year/faculty names."""
+    conditions = []
+    params = []
+    for column, value in (("c.course_name", course_name), ("a.year_name", year_name), ("f.faculty_name", faculty_name)):
+        if value:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    query = f"""
+        SELECT {ID_CARD_COLUMNS}
+        FROM students s
+        LEFT JOIN courses c ON s.course_id = c.course_id
+        LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
+        LEFT JOIN faculties f ON s.faculty_id = f.faculty_id
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY s.roll_number"
+    return conn.execute(query, params).fetchall()
+
+
+def _load_fonts():
+    # Define fonts (adjust paths if fonts are not system-wide)
+    try:
+        return (ImageFont.truetype("arialbd.ttf", 20),
+                ImageFont.truetype("arialbd.ttf", 14),
+                ImageFont.truetype("arial.ttf", 12))
+    except IOError:
+        default = ImageFont.load_default()
+        return default, default, default
+
+
+class IdCardTemplate:
+    """The static part of every card, drawn once: scaled background, fonts and header text.
+
+    render() only copies that layer and draws the student's photo and fields.
+    """
+
+    def __init__(self, background_path):
+        self.background_path = background_path
+        self.font_title, self.font_header, self.font_normal = _load_fonts()
+
+        # Use the provided background image
+        if os.path.exists(background_path):
+            with Image.open(background_path) as background:
+                static_layer = background.resize((CARD_WIDTH, CARD_HEIGHT), Image.LANCZOS)
+        else:
+            static_layer = Image.new('RGB', (CARD_WIDTH, CARD_HEIGHT), color=(255, 255, 255))  # White background if not found
+
+        # College Name and Address
+        draw = ImageDraw.Draw(static_layer)
+        draw.text((CARD_WIDTH / 2, 20), COLLEGE_NAME, fill=(0, 0, 0), font=self.font_title, anchor="mm")
+        draw.text((CARD_WIDTH / 2, 45), "STUDENT IDENTITY CARD", fill=(0, 0, 0), font=self.font_header, anchor="mm")
+        draw.text((CARD_WIDTH / 2, 65), COLLEGE_ADDRESS, fill=(0, 0, 0), font=self.font_normal, anchor="mm")
+        self.static_layer = static_layer
+
+    def render(self, student_data):
+        """Draws the ID card for one row of ID_CARD_COLUMNS and returns the PIL image."""
+        name, roll_number, course_name, academic_year, dob, blood_group, contact_number, photo, enrollment_date = student_data
+        profile_pic_path = resolve_photo(photo)
+        id_card_image = self.static_layer.copy()
+        draw = ImageDraw.Draw(id_card_image)
+        font_normal = self.font_normal
+
+        # Student details
+        y_offset = 90
+        text_color = (0, 0, 0)  # Black color for text
+
+        # Profile Picture
+        if profile_pic_path:
+            profile_img = thumbnail_cache.open(profile_pic_path, (80, 80))
+            # Paste the profile picture onto the card
+            id_card_image.paste(profile_img, (20, y_offset), profile_img if profile_img.mode == 'RGBA' else None)  # Use mask for transparency
+        else:
+            draw.text((20, y_offset + 30), "No Photo", fill=text_color, font=font_normal)
+
+        x_start_details = 120
+        draw.text((x_start_details, y_offset), f"Name: {name}", fill=text_color, font=font_normal)
+        draw.text((x_start_details, y_offset + 20), f"Roll No: {roll_number}", fill=text_color, font=font_normal)
+        draw.text((x_start_details, y_offset + 40), f"Course: {course_name} ({academic_year})", fill=text_color, font=font_normal)
+        draw.text((x_start_details, y_offset + 60), f"DOB: {dob}", fill=text_color, font=font_normal)
+        draw.text((x_start_details, y_offset + 80), f"Blood Group: {blood_group}", fill=text_color, font=font_normal)
+        draw.text((x_start_details, y_offset + 100), f"Contact: {contact_number}", fill=text_color, font=font_normal)
+        draw.text((x_start_details, y_offset + 120), f"Enrollment Date: {enrollment_date}", fill=text_color, font=font_normal)
+        return id_card_image
+
+
+_templates = {}  # background_path -> (file signature, IdCardTemplate)
+_templates_lock = threading.Lock()
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_id_card_template(background_path):
+    """Returns the cached template, rebuilding it if the background file changed."""
+    signature = _file_signature(background_path)
+    cached = _templates.get(background_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _templates_lock:
+        cached = _templates.get(background_path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, IdCardTemplate(background_path))
+            _templates[background_path] = cached
+    return cached[1]
+
+
+def render_id_card(student_data, background_path):
+    """Draws the ID card for one row of ID_CARD_COLUMNS and returns the PIL image."""
+    return get_id_card_template(background_path).render(student_data)
+
+
+# --- Batch generation ---
+def card_file_name(roll_number):
+    return "ID_Card_" + re.sub(r"[^A-Za-z0-9._-]", "_", str(roll_number)) + ".png"
+
+
+def _render_card_png(student_data, background_path):
+    """Process-pool worker: renders one card and returns (file name, PNG bytes)."""
+    buffer = io.BytesIO()
+    render_id_card(student_data, background_path).save(buffer, "PNG")
+    return card_file_name(student_data[1]), buffer.getvalue()
+
+
+def _copy_intact_cards(paths, archive):
+    """Copies every entry that reads back with a good CRC from the archives at paths; returns their names.
+
+    Like testzip(), but it keeps going past a bad entry so the rest is saved.
+    An archive that cannot be opened at all contributes nothing.
+    """
+    copied = set()
+    for path in paths:
+        try:
+            with zipfile.ZipFile(path) as source:
+                for name in source.namelist():
+                    if name in copied:
+                        continue
+                    try:
+                        png = source.read(name)
+                    except (zipfile.BadZipFile, EOFError, OSError):
+                        continue
+                    archive.writestr(name, png)
+                    copied.add(name)
+        except (zipfile.BadZipFile, OSError):
+            continue
+    return copied
+
+
+def generate_id_cards(students, output_path, background_path, workers=None, resume=True, job=None):
+    """Renders ID cards for `students` (rows of ID_CARD_COLUMNS) in a process pool.
+
+    output_path is a directory, or a .zip file. With resume, cards already
+    present in the output are not rendered again, so an interrupted run can
+    simply be restarted. Returns a BatchResult.
+
+    A .zip is built as output_path + ".part" and renamed over output_path
+    once every card is in; an interrupted run leaves the .part behind. On
+    resume the intact cards of both are copied into the new archive first.
+    """
+    result = BatchResult(len(students), unit="cards")
+    started = time.perf_counter()
+    to_zip = output_path.lower().endswith(".zip")
+    if to_zip:
+        temp_path = output_path + ".part"
+        interrupted_path = temp_path + ".old"
+        if resume and os.path.exists(temp_path):
+            os.replace(temp_path, interrupted_path)
+        archive = zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED)  # PNG is already compressed
+        try:
+            existing = _copy_intact_cards([interrupted_path, output_path], archive) if resume else set()
+        except BaseException:
+            archive.close()
+            raise
+        if os.path.exists(interrupted_path):
+            os.remove(interrupted_path)
+    else:
+        os.makedirs(output_path, exist_ok=True)
+        existing = set(os.listdir(output_path)) if resume else set()
+        archive = None
+
+    pending = [student for student in students if card_file_name(student[1]) not in existing]
+    result.skipped = len(students) - len(pending)
+    completed = False
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_render_card_png, student, background_path): student[1] for student in pending}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        file_name, png = future.result()
+                    except Exception as e:
+                        result.failed.append((futures[future], str(e)))
+                        continue
+                    if archive is not None:
+                        archive.writestr(file_name, png)
+                    else:
+                        # Write then rename, so a crash never leaves a half card that resume would skip
+                        card_path = os.path.join(output_path, file_name)
+                        with open(card_path + ".part", "wb") as f:
+                            f.write(png)
+                        os.replace(card_path + ".part", card_path)
+                    result.rendered += 1
+                    if job is not None:
+                        job.check_cancelled()
+                        done = result.rendered + len(result.failed)
+                        rate = result.rendered / (time.perf_counter() - started)
+                        job.report_progress(done / len(pending), f"{done}/{len(pending)} cards, {rate:.1f}/s")
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        completed = True
+    finally:
+        if archive is not None:
+            archive.close()
+            if completed:
+                os.replace(temp_path, output_path)
+        result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,262 @@
+"""Bulk student import from CSV or XLSX spreadsheets.
+
+Rows are streamed from the file, validated in Python against in-memory sets
+and name -> id maps loaded once up front, and written with executemany in
+large transactions. A bad row is reported with its line number and skipped;
+it never aborts the rest of the import.
+"""
+import csv
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from sdms.db import write_transaction
+from sdms.reference import reference_data
+
+IMPORT_BATCH_SIZE = 5000
+
+# Normalised spreadsheet header -> import field
+HEADER_ALIASES = {
+    "roll_no": "roll_number",
+    "roll": "roll_number",
+    "student_name": "name",
+    "contact": "contact_number",
+    "contact_no": "contact_number",
+    "phone": "contact_number",
+    "aadhaar": "aadhaar_no",
+    "aadhaar_number": "aadhaar_no",
+    "dob": "date_of_birth",
+    "10th": "tenth_percent",
+    "10th_%": "tenth_percent",
+    "12th": "twelfth_percent",
+    "12th_%": "twelfth_percent",
+    "mother": "mother_name",
+    "mother's_name": "mother_name",
+    "enroll_status": "enrollment_status",
+    "status": "enrollment_status",
+    "enroll_date": "enrollment_date",
+    "course_name": "course",
+    "year": "academic_year",
+    "acad_year": "academic_year",
+    "academic_year_name": "academic_year",
+    "year_name": "academic_year",
+    "faculty_name": "faculty",
+}
+
+REQUIRED_FIELDS = ("roll_number", "name", "enrollment_date", "course", "academic_year", "faculty")
+
+_INSERT_STUDENT_SQL = """
+    INSERT INTO students (
+        roll_number, name, contact_number, email, address, aadhaar_no,
+        date_of_birth, gender, tenth_percent, twelfth_percent, blood_group,
+        mother_name, enrollment_status, enrollment_date, course_id,
+        academic_year_id, faculty_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class ImportFileError(Exception):
+    """The file as a whole cannot be read."""
+
+
+class RowError(ValueError):
+    """A single spreadsheet row failed validation."""
+
+
+class ImportResult:
+    """Outcome of an import: counts, per-row errors and throughput."""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.inserted = 0
+        self.updated = 0
+        self.errors = []  # (line_number, message)
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.elapsed if self.elapsed else 0.0
+
+    def summary(self, max_errors=20):
+        lines = [
+            f"Rows read: {self.rows_read}",
+            f"Imported: {self.inserted}",
+        ]
+        if self.updated:
+            lines.append(f"Updated: {self.updated}")
+        lines += [
+            f"Rejected: {len(self.errors)}",
+            f"Time: {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)",
+        ]
+        if self.errors:
+            lines.append("")
+            lines.extend(f"Line {line}: {message}" for line, message in self.errors[:max_errors])
+            if len(self.errors) > max_errors:
+                lines.append(f"... and {len(self.errors) - max_errors} more")
+        return "\n".join(lines)
+
+
+def normalise_header(header):
+    key = str(header or "").strip().lower().replace(" ", "_")
+    return HEADER_ALIASES.get(key, key)
+
+
+def iter_spreadsheet_rows(path):
+    """Yields (line_number, {field: text}) for every data row of a CSV or XLSX file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportFileError("Reading .xlsx files requires the 'openpyxl' package; save the sheet as CSV instead.")
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [normalise_header(h) for h in next(rows, ())]
+            for line_number, values in enumerate(rows, start=2):
+                if values and any(v not in (None, "") for v in values):
+                    yield line_number, {h: _cell_text(v) for h, v in zip(headers, values)}
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            headers = [normalise_header(h) for h in next(reader, [])]
+            for values in reader:
+                if any(v.strip() for v in values):
+                    yield reader.line_num, {h: v.strip() for h, v in zip(headers, values)}
+
+
+def _cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _parse_date(value, label):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise RowError(f"{label} '{value}' is not in YYYY-MM-DD format.")
+
+
+def _parse_percent(value, label):
+    if not value:
+        return None
+    try:
+        percent = float(value.rstrip("%"))
+    except ValueError:
+        raise RowError(f"{label} '{value}' is not a number.")
+    if not 0 <= percent <= 100:
+        raise RowError(f"{label} {percent} is outside 0-100.")
+    return percent
+
+
+def _parse_status(value):
+    if value.lower() in ("", "yes", "y", "1", "active", "true"):
+        return 1
+    if value.lower() in ("no", "n", "0", "inactive", "false"):
+        return 0
+    raise RowError(f"Enrollment status '{value}' must be Yes or No.")
+
+
+class StudentImporter:
+    """Validates spreadsheet rows and inserts them into students in batches."""
+
+    def __init__(self, conn, batch_size=IMPORT_BATCH_SIZE):
+        self.conn = conn
+        self.batch_size = batch_size
+        reference = reference_data.tables(conn)
+        self.course_ids = reference["courses"].ids
+        self.year_ids = reference["academic_years"].ids
+        self.faculty_ids = reference["faculties"].ids
+        self.roll_numbers = {r for (r,) in conn.execute("SELECT roll_number FROM students")}
+        self.aadhaar_numbers = {a for (a,) in conn.execute("SELECT aadhaar_no FROM students WHERE aadhaar_no IS NOT NULL AND aadhaar_no != ''")}
+
+    def validate(self, row):
+        """Returns the INSERT parameters for one row, or raises RowError."""
+        missing = [field for field in REQUIRED_FIELDS if not row.get(field)]
+        if missing:
+            raise RowError("Missing required field(s): " + ", ".join(missing))
+
+        roll_number = row["roll_number"]
+        if roll_number in self.roll_numbers:
+            raise RowError(f"Roll Number '{roll_number}' already exists.")
+        aadhaar_no = row.get("aadhaar_no") or None
+        if aadhaar_no and aadhaar_no in self.aadhaar_numbers:
+            raise RowError(f"Aadhaar Number '{aadhaar_no}' already exists.")
+
+        course_id = self.course_ids.get(row["course"])
+        if course_id is None:
+            raise RowError(f"Course '{row['course']}' not found.")
+        academic_year_id = self.year_ids.get(row["academic_year"])
+        if academic_year_id is None:
+            raise RowError(f"Academic Year '{row['academic_year']}' not found.")
+        faculty_id = self.faculty_ids.get(row["faculty"])
+        if faculty_id is None:
+            raise RowError(f"Faculty '{row['faculty']}' not found.")
+
+        date_of_birth = _parse_date(row["date_of_birth"], "Date of Birth") if row.get("date_of_birth") else ""
+        enrollment_date = _parse_date(row["enrollment_date"], "Enrollment Date")
+        tenth_percent = _parse_percent(row.get("tenth_percent", ""), "10th %")
+        twelfth_percent = _parse_percent(row.get("twelfth_percent", ""), "12th %")
+        enrollment_status = _parse_status(row.get("enrollment_status", ""))
+
+        # Reserve the unique keys so later rows in the same file are caught too
+        self.roll_numbers.add(roll_number)
+        if aadhaar_no:
+            self.aadhaar_numbers.add(aadhaar_no)
+        return (
+            roll_number, row["name"], row.get("contact_number", ""), row.get("email", ""),
+            row.get("address", ""), aadhaar_no, date_of_birth, row.get("gender", ""),
+            tenth_percent, twelfth_percent, row.get("blood_group", ""), row.get("mother_name", ""),
+            enrollment_status, enrollment_date, course_id, academic_year_id, faculty_id,
+        )
+
+    def _flush(self, batch, result):
+        """Inserts one batch in a single transaction; falls back to row by row on conflict."""
+        try:
+            with write_transaction(self.conn, "students"):
+                self.conn.executemany(_INSERT_STUDENT_SQL, [params for _, params in batch])
+            result.inserted += len(batch)
+        except sqlite3.IntegrityError:
+            # Someone else inserted a clashing student meanwhile; find the culprit rows.
+            with write_transaction(self.conn, "students"):
+                for line_number, params in batch:
+                    try:
+                        self.conn.execute(_INSERT_STUDENT_SQL, params)
+                        result.inserted += 1
+                    except sqlite3.IntegrityError as e:
+                        result.errors.append((line_number, f"Rejected by database: {e}"))
+
+    def run(self, rows, job=None):
+        """Imports (line_number, row) pairs; job, if given, receives progress."""
+        result = ImportResult()
+        started = time.perf_counter()
+        batch = []
+        for line_number, row in rows:
+            result.rows_read += 1
+            try:
+                batch.append((line_number, self.validate(row)))
+            except RowError as e:
+                result.errors.append((line_number, str(e)))
+            if len(batch) >= self.batch_size:
+                self._flush(batch, result)
+                batch = []
+                if job is not None:
+                    job.check_cancelled()
+                    job.report_progress(message=f"{result.inserted} imported, {len(result.errors)} rejected")
+        if batch:
+            self._flush(batch, result)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+def import_students(conn, path, job=None, batch_size=IMPORT_BATCH_SIZE):
+    """Imports every student row of a CSV/XLSX file and returns an ImportResult."""
+    return StudentImporter(conn, batch_size).run(iter_spreadsheet_rows(path), job)
@@ -0,0 +1,162 @@
+"""Background jobs for work that must not block the Tk event loop.
+
+Work functions run on a thread pool and receive a Job handle for progress
+reporting and cancellation. Their results, errors and progress updates are
+delivered back on the Tk thread by polling through a scheduler such as
+root.after, so callbacks may touch widgets freely. Work functions must not.
+"""
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+JOB_POLL_MS = 50
+
+
+class JobCancelled(Exception):
+    """Raised inside a work function by Job.check_cancelled()."""
+
+
+class Job:
+    """Handle shared between a running work function and the UI."""
+
+    def __init__(self, name, on_done=None, on_error=None, on_progress=None):
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self.fraction = None  # 0.0-1.0 when the job knows how far along it is
+        self.message = ""
+        self._progress_changed = False
+        self._cancel_event = threading.Event()
+
+    # --- Called from the work function ---
+    def report_progress(self, fraction=None, message=""):
+        self.fraction = fraction
+        self.message = message
+        self._progress_changed = True
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled(self.name)
+
+    # --- Called from the UI ---
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()  # Only succeeds if it has not started yet
+
+    def describe(self):
+        if self.fraction is not None:
+            text = f"{self.name} ({self.fraction:.0%})"
+        else:
+            text = self.name
+        return f"{text} - {self.message}" if self.message else text
+
+
+class JobRunner:
+    """Runs jobs on a worker pool and marshals their outcome to the Tk thread.
+
+    schedule(ms, callback) must run callback on the UI thread later; pass the
+    root window's after method. on_change(jobs) is called on the UI thread
+    whenever the set of running jobs or their progress changes.
+    """
+
+    def __init__(self, schedule, max_workers=4, poll_ms=JOB_POLL_MS, on_change=None):
+        self._schedule = schedule
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._poll_ms = poll_ms
+        self._polling = False
+        self.on_change = on_change
+        self.jobs = []
+
+    def submit(self, name, func, *args, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """Runs func(job, *args, **kwargs) in the background and returns the Job."""
+        job = Job(name, on_done=on_done, on_error=on_error, on_progress=on_progress)
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        self.jobs.append(job)
+        self._notify()
+        if not self._polling:
+            self._polling = True
+            self._schedule(self._poll_ms, self._poll)
+        return job
+
+    @staticmethod
+    def _run(job, func, args, kwargs):
+        job.check_cancelled()
+        return func(job, *args, **kwargs)
+
+    def _poll(self):
+        try:
+            self._deliver()
+        finally:
+            if self.jobs:
+                self._schedule(self._poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _deliver(self):
+        finished = [job for job in self.jobs if job.future.done()]
+        progressed = [job for job in self.jobs if job._progress_changed]
+        for job in finished:
+            self.jobs.remove(job)
+        if finished or progressed:
+            self._notify()
+        for job in progressed:
+            job._progress_changed = False
+            if job.on_progress:
+                job.on_progress(job)
+        for job in finished:
+            try:
+                result = job.future.result()
+            except (CancelledError, JobCancelled):
+                continue
+            except Exception as e:
+                if job.on_error is None:
+                    raise  # Let Tk report it
+                job.on_error(e)
+                continue
+            if job.on_done:
+                job.on_done(result)
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change(list(self.jobs))
+
+    def cancel_all(self):
+        for job in self.jobs:
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class BatchResult:
+    """Outcome of a batch that produces one output per student (ID cards, PDFs)."""
+
+    def __init__(self, total, unit="items"):
+        self.total = total
+        self.unit = unit
+        self.rendered = 0
+        self.skipped = 0  # already present from an earlier, interrupted run
+        self.failed = []  # (roll_number, message)
+        self.elapsed = 0.0
+
+    @property
+    def per_second(self):
+        return self.rendered / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        lines = [
+            f"Students selected: {self.total}",
+            f"{self.unit.capitalize()} rendered: {self.rendered}",
+            f"Skipped (already done): {self.skipped}",
+            f"Failed: {len(self.failed)}",
+            f"Time: {self.elapsed:.2f}s ({self.per_second:.1f} {self.unit}/s)",
+        ]
+        lines.extend(f"{roll}: {message}" for roll, message in self.failed[:20])
+        return "\n".join(lines)
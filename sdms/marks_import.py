@@ -0,0 +1,111 @@
+"""Bulk import of exam marks sheets (CSV or XLSX, one row per student and subject).
+
+Expected columns: roll_number, semester, subject_name, marks_obtained,
+max_marks, plus optional course and grade. A blank course means the student's
+own course; a blank grade is derived from the grade bands. Existing marks for
+the same student, course, semester and subject are overwritten. If the sheet
+itself repeats that key, the last row wins and the earlier ones are reported.
+"""
+import time
+
+from sdms.db import write_transaction
+from sdms.grades import GRADE_BANDS, derive_grades
+from sdms.importer import ImportResult, RowError, iter_spreadsheet_rows
+from sdms.reference import reference_data
+
+MARKS_HEADER_ALIASES = {
+    "subject": "subject_name",
+    "marks": "marks_obtained",
+    "obtained": "marks_obtained",
+    "max": "max_marks",
+    "out_of": "max_marks",
+    "sem": "semester",
+}
+
+_UPDATE_MARK_SQL = """
+    UPDATE marks SET marks_obtained = ?, max_marks = ?, grade = ?
+    WHERE student_id = ? AND course_id = ? AND semester = ? AND subject_name = ?
+"""
+_INSERT_MARK_SQL = """
+    INSERT INTO marks (student_id, course_id, semester, subject_name, marks_obtained, max_marks, grade)
+    SELECT ?, ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (
+        SELECT 1 FROM marks WHERE student_id = ? AND course_id = ? AND semester = ? AND subject_name = ?
+    )
+"""
+
+
+class MarksImporter:
+    """Turns sheet rows into mark columns, derives grades and upserts them."""
+
+    def __init__(self, conn, bands=GRADE_BANDS):
+        self.conn = conn
+        self.bands = bands
+        # One pass over students replaces a SELECT per sheet row
+        self.students = {roll: (student_id, course_id)
+                         for roll, student_id, course_id in conn.execute("SELECT roll_number, student_id, course_id FROM students")}
+        self.course_ids = reference_data.table(conn, "courses").ids
+
+    def parse(self, row):
+        row = {MARKS_HEADER_ALIASES.get(key, key): value for key, value in row.items()}
+        missing = [f for f in ("roll_number", "semester", "subject_name", "marks_obtained", "max_marks") if not row.get(f)]
+        if missing:
+            raise RowError("Missing required field(s): " + ", ".join(missing))
+        student = self.students.get(row["roll_number"])
+        if student is None:
+            raise RowError(f"Student with Roll Number '{row['roll_number']}' not found.")
+        student_id, course_id = student
+        if row.get("course"):
+            course_id = self.course_ids.get(row["course"])
+            if course_id is None:
+                raise RowError(f"Course '{row['course']}' not found.")
+        if course_id is None:
+            raise RowError("Student has no course; give one in the course column.")
+        try:
+            semester = int(row["semester"])
+            marks_obtained = float(row["marks_obtained"])
+            max_marks = float(row["max_marks"])
+        except ValueError:
+            raise RowError("Semester, Marks, and Max Marks must be numbers.")
+        if max_marks <= 0 or not 0 <= marks_obtained <= max_marks:
+            raise RowError(f"Marks {marks_obtained} out of {max_marks} is not valid.")
+        return student_id, course_id, semester, row["subject_name"], marks_obtained, max_marks, row.get("grade", "")
+
+    def run(self, rows, job=None):
+        result = ImportResult()
+        started = time.perf_counter()
+        parsed = {}  # (student_id, course_id, semester, subject) -> (line_number, mark)
+        for line_number, row in rows:
+            result.rows_read += 1
+            try:
+                mark = self.parse(row)
+            except RowError as e:
+                result.errors.append((line_number, str(e)))
+                continue
+            key = mark[:4]
+            if key in parsed:
+                result.errors.append((parsed[key][0], f"Superseded by line {line_number} for the same subject and semester."))
+            parsed[key] = (line_number, mark)
+        parsed = [mark for _, mark in parsed.values()]
+        if job is not None:
+            job.check_cancelled()
+            job.report_progress(message=f"{len(parsed)} marks validated")
+
+        if parsed:
+            # Column layout: one list per field, grades derived for the whole sheet at once
+            student_ids, course_ids, semesters, subjects, obtained, maximum, grades = (list(c) for c in zip(*parsed))
+            derived = derive_grades(obtained, maximum, self.bands)
+            grades = [given or grade for given, grade in zip(grades, derived)]
+            keys = list(zip(student_ids, course_ids, semesters, subjects))
+            with write_transaction(self.conn, "marks"):
+                result.updated = self.conn.executemany(_UPDATE_MARK_SQL, [
+                    (o, m, g) + key for o, m, g, key in zip(obtained, maximum, grades, keys)]).rowcount
+                result.inserted = self.conn.executemany(_INSERT_MARK_SQL, [
+                    key + (o, m, g) + key for o, m, g, key in zip(obtained, maximum, grades, keys)]).rowcount
+        result.elapsed = time.perf_counter() - started
+        return result
+
+
+def import_marks(conn, path, job=None, bands=GRADE_BANDS):
+    """Imports a marks sheet and returns an ImportResult."""
+    return MarksImporter(conn, bands).run(iter_spreadsheet_rows(path), job)
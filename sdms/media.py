@@ -0,0 +1,126 @@
+"""Managed store for student photos.
+
+An uploaded photo is normalised once on the way in: rotated upright from its
+EXIF orientation, centre-cropped to the ID photo aspect ratio, bounded to
+PHOTO_MAX_SIZE and re-encoded as JPEG. The result is saved under the SHA-1 of
+its bytes, so the same photo uploaded twice is stored once, and the students
+table records only that hash instead of a path that may later move or vanish.
+"""
+import hashlib
+import io
+import os
+import re
+import tempfile
+
+MEDIA_DIR = os.path.join("media", "photos")
+PHOTO_ASPECT = (1, 1)  # width:height of the photo slot on the form and ID card
+PHOTO_MAX_SIZE = (600, 600)
+PHOTO_JPEG_QUALITY = 85
+
+_HASH_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+
+class PhotoError(Exception):
+    """Raised when a file cannot be read as a photo."""
+
+
+def is_photo_hash(value):
+    return bool(value) and _HASH_PATTERN.match(value) is not None
+
+
+def photo_path(photo_hash, media_dir=MEDIA_DIR):
+    return os.path.join(media_dir, photo_hash[:2], photo_hash + ".jpg")
+
+
+def resolve_photo(photo, media_dir=MEDIA_DIR):
+    """Returns the file to display for a stored photo value, or None if it is missing.
+
+    The value is either a hash from this store or, for rows the migration
+    could not import, the original filesystem path.
+    """
+    if not photo:
+        return None
+    path = photo_path(photo, media_dir) if is_photo_hash(photo) else photo
+    return path if os.path.exists(path) else None
+
+
+def split_photo(photo):
+    """Returns (photo_hash, legacy_path) column values for a stored photo value."""
+    if not photo:
+        return None, None
+    if is_photo_hash(photo):
+        return photo, None
+    return None, photo
+
+
+def normalise_photo(source_path):
+    """Returns the JPEG bytes of the upright, cropped and bounded photo."""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(source_path) as source:
+            source.draft("RGB", PHOTO_MAX_SIZE)  # Let large JPEGs decode at a reduced scale
+            image = ImageOps.exif_transpose(source)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            image = ImageOps.fit(image, _fit_size(image.size), Image.LANCZOS)
+    except (OSError, ValueError) as e:
+        raise PhotoError(f"Cannot read image '{source_path}': {e}") from e
+
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=PHOTO_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def _fit_size(size):
+    """Largest PHOTO_ASPECT box that fits in both the image and PHOTO_MAX_SIZE."""
+    aspect_w, aspect_h = PHOTO_ASPECT
+    scale = min(size[0] / aspect_w, size[1] / aspect_h,
+                PHOTO_MAX_SIZE[0] / aspect_w, PHOTO_MAX_SIZE[1] / aspect_h)
+    return max(1, int(aspect_w * scale)), max(1, int(aspect_h * scale))
+
+
+def ingest_photo(source_path, media_dir=MEDIA_DIR):
+    """Normalises source_path into the store and returns its hash."""
+    data = normalise_photo(source_path)
+    photo_hash = hashlib.sha1(data).hexdigest()
+    target = photo_path(photo_hash, media_dir)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Write then rename so a crash never leaves a truncated photo under a valid hash
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, target)
+    return photo_hash
+
+
+def import_legacy_photos(conn, media_dir=MEDIA_DIR):
+    """Moves students' profile_picture_path files into the store.
+
+    The files are decoded and stored first, outside any transaction, and the
+    rows updated together at the end. Rows whose file is missing, unreadable
+    or cannot be stored (read-only media folder, full disk) keep their path
+    so nothing is lost. Returns (imported, skipped).
+    """
+    rows = conn.execute("""
+        SELECT student_id, profile_picture_path FROM students
+        WHERE photo_hash IS NULL AND profile_picture_path IS NOT NULL AND profile_picture_path != ''
+    """).fetchall()
+    updates = []
+    hashes = {}  # Many students often share one placeholder image
+    for student_id, path in rows:
+        try:
+            if path not in hashes:
+                hashes[path] = ingest_photo(path, media_dir) if os.path.exists(path) else None
+        except (ImportError, PhotoError, OSError):
+            hashes[path] = None
+        if hashes[path] is not None:
+            updates.append((hashes[path], student_id, path))
+    with conn:
+        # Skip rows whose picture was changed while the files were being stored
+        imported = conn.executemany("""
+            UPDATE students SET photo_hash = ?, profile_picture_path = NULL
+            WHERE student_id = ? AND photo_hash IS NULL AND profile_picture_path = ?
+        """, updates).rowcount if updates else 0
+    return imported, len(rows) - imported
@@ -0,0 +1,227 @@
+"""Versioned schema migrations for the student database.
+
+The schema version lives in PRAGMA user_version. Every step below runs once, in
+order, inside its own transaction, so an existing student_database.db is
+upgraded in place and a half-applied step is never recorded as done.
+"""
+import sqlite3
+
+from sdms.auth import hash_password
+from sdms.media import import_legacy_photos
+from sdms.search import create_student_fts
+from sdms.summaries import create_summary_tables
+
+
+def _create_base_schema(cursor):
+    """Tables and seed rows that used to be created at import time."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            user_id TEXT PRIMARY KEY,
+            password_hash TEXT NOT NULL,
+            name TEXT NOT NULL,
+            role TEXT NOT NULL
+        )
+    ''')
+    # Default admin user (for testing)
+    cursor.execute("INSERT OR IGNORE INTO users (user_id, password_hash, name, role) VALUES (?, ?, ?, ?)",
+                   ('admin', hash_password('admin'), 'Administrator', 'admin'))
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS faculties (
+            faculty_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            faculty_name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.executemany("INSERT OR IGNORE INTO faculties (faculty_name) VALUES (?)",
+                       [('BCA',), ('BBA',), ('MCA',), ('IBCA',), ('IMCA',)])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS academic_years (
+            year_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            year_name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.executemany("INSERT OR IGNORE INTO academic_years (year_name) VALUES (?)",
+                       [('First Year',), ('Second Year',), ('Third Year',), ('Fourth Year',), ('Fifth Year',)])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            student_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            roll_number TEXT UNIQUE NOT NULL,
+            user_id TEXT UNIQUE, -- Link to users table for login
+            name TEXT NOT NULL,
+            contact_number TEXT,
+            email TEXT,
+            address TEXT,
+            aadhaar_no TEXT UNIQUE,
+            date_of_birth TEXT,
+            gender TEXT,
+            tenth_percent REAL,
+            twelfth_percent REAL,
+            blood_group TEXT,
+            mother_name TEXT,
+            enrollment_status INTEGER DEFAULT 1, -- 1 for Yes, 0 for No
+            enrollment_date TEXT NOT NULL,
+            course_id INTEGER,
+            academic_year_id INTEGER,
+            faculty_id INTEGER,
+            profile_picture_path TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+            FOREIGN KEY (course_id) REFERENCES courses(course_id),
+            FOREIGN KEY (academic_year_id) REFERENCES academic_years(year_id),
+            FOREIGN KEY (faculty_id) REFERENCES faculties(faculty_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS courses (
+            course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_name TEXT NOT NULL UNIQUE,
+            course_code TEXT UNIQUE,
+            duration TEXT,
+            department TEXT
+        )
+    ''')
+    # Sample courses (ensure these match faculties)
+    cursor.executemany("INSERT OR IGNORE INTO courses (course_name, course_code, duration, department) VALUES (?, ?, ?, ?)", [
+        ('Computer Applications', 'MCA', '2 Years', 'Computer Science'),
+        ('Business Administration', 'MBA', '2 Years', 'Management'),
+        ('Science', 'B.Sc', '3 Years', 'Science'),
+        ('Computer Applications', 'BCA', '3 Years', 'Computer Science'),
+        ('Computer Applications', 'IBCA', '5 Years', 'Computer Science'),  # Integrated BCA
+        ('Computer Applications', 'IMCA', '5 Years', 'Computer Science'),  # Integrated MCA
+    ])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS marks (
+            mark_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER,
+            course_id INTEGER,
+            subject_name TEXT,
+            semester INTEGER,
+            marks_obtained REAL,
+            max_marks REAL,
+            grade TEXT,
+            FOREIGN KEY (student_id) REFERENCES students(student_id),
+            FOREIGN KEY (course_id) REFERENCES courses(course_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS payments (
+            payment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER,
+            amount_paid REAL NOT NULL,
+            payment_date TEXT NOT NULL,
+            payment_type TEXT,
+            receipt_number TEXT UNIQUE,
+            description TEXT,
+            FOREIGN KEY (student_id) REFERENCES students(student_id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feedback (
+            feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            email TEXT,
+            feedback_text TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        )
+    ''')
+
+
+def _add_query_indexes(cursor):
+    """Indexes for the report, marks and analytics queries."""
+    # Marks Report (course + semester, ordered by subject) and Average Marks per Course;
+    # the trailing columns make both index-only scans.
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_marks_course_semester
+        ON marks (course_id, semester, student_id, subject_name, marks_obtained, max_marks, grade)
+    ''')
+    # Marks Entry tab and the per-student PDF export (student, ordered by semester/subject)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_marks_student
+        ON marks (student_id, semester, subject_name, marks_obtained, max_marks, grade)
+    ''')
+    # Payment History Report and receipt lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_date ON payments (payment_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_payments_student ON payments (student_id)")
+    # Enrollment Report
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_enrollment_date ON students (enrollment_date)")
+    # Students per Course / Faculty Academic Performance / Enrollment Status Breakdown
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_course ON students (course_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_year ON students (academic_year_id)")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_students_faculty
+        ON students (faculty_id, tenth_percent, twelfth_percent)
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_status ON students (enrollment_status)")
+    cursor.execute("ANALYZE")
+
+
+
+def _add_photo_store(cursor):
+    """Students reference photos in the managed store by hash; existing paths are imported afterwards."""
+    cursor.execute("ALTER TABLE students ADD COLUMN photo_hash TEXT")
+
+
+# (version, description, step). Append new steps; never edit or reorder applied ones.
+MIGRATIONS = [
+    (1, "base schema and seed data", _create_base_schema),
+    (2, "indexes for reports and analytics", _add_query_indexes),
+    (3, "full-text student search index", create_student_fts),
+    (4, "managed photo store", _add_photo_store),
+    (5, "trigger-maintained analytics summaries", create_summary_tables),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# (version, step(conn)) run once that migration has been applied. They work on
+# files rather than the schema, so they run outside its transaction, and a
+# failure in them leaves the data usable as it was.
+POST_MIGRATION_STEPS = [
+    (4, import_legacy_photos),
+]
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def schema_is_current(conn):
+    """True when no migration is pending, so startup can skip migrate() altogether."""
+    return get_schema_version(conn) >= LATEST_VERSION
+
+
+def migrate(conn, target=None):
+    """Applies every pending migration up to target (default: latest), then their POST_MIGRATION_STEPS.
+
+    Returns the list of versions that were applied.
+    """
+    target = LATEST_VERSION if target is None else target
+    current = get_schema_version(conn)
+    applied = []
+    for version, description, step in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+        if conn.in_transaction:
+            conn.commit()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            # Another process may have migrated while we waited for the lock.
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            step(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        applied.append(version)
+    for version, step in POST_MIGRATION_STEPS:
+        if version in applied:
+            step(conn)
+    return applied
@@ -0,0 +1,181 @@
+"""Marks report PDFs built with reportlab, for one student or a whole class."""
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import groupby
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.platypus import Flowable, PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from sdms.jobs import BatchResult
+from sdms.reports import resolve_course_id
+
+# Built once per process and shared by every document
+STYLES = getSampleStyleSheet()
+MARKS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+COHORT_MARKS_SQL = """
+    SELECT s.name, s.roll_number, m.subject_name, m.semester, m.marks_obtained, m.max_marks, m.grade
+    FROM marks m
+    JOIN students s ON m.student_id = s.student_id
+    WHERE m.course_id = ? AND m.semester = ?
+    ORDER BY s.roll_number, m.subject_name
+"""
+
+
+def fetch_cohort_marks(conn, course_name, semester):
+    """Returns [(student_name, roll_number, marks_rows)] for everyone with marks in the course and semester.
+
+    One query for the whole class; rows are grouped per student in memory.
+    """
+    course_id = resolve_course_id(conn, course_name)
+    rows = conn.execute(COHORT_MARKS_SQL, (course_id, semester)).fetchall()
+    return [(name, roll_number, [row[2:] for row in student_rows])
+            for (name, roll_number), student_rows in groupby(rows, key=lambda row: (row[0], row[1]))]
+
+
+def marks_story(student_name, roll_number, marks_data):
+    """Flowables for one student's report."""
+    story = []
+
+    # Title
+    story.append(Paragraph("Student Marks Report", STYLES['h1']))
+    story.append(Paragraph(f"Student Name: {student_name}", STYLES['h3']))
+    story.append(Paragraph(f"Roll Number: {roll_number}", STYLES['h3']))
+    story.append(Paragraph("<br/><br/>", STYLES['Normal']))  # Add some space
+
+    # Table Header
+    data = [['Subject', 'Semester', 'Marks Obtained', 'Max Marks', 'Grade']]
+    for row in marks_data:
+        data.append([row[0], str(row[1]), str(row[2]), str(row[3]), row[4]])
+
+    table = Table(data)
+    table.setStyle(MARKS_TABLE_STYLE)
+    story.append(table)
+    return story
+
+
+def build_student_marks_pdf(file_path, student_name, roll_number, marks_data):
+    doc = SimpleDocTemplate(file_path, pagesize=letter)
+    doc.build(marks_story(student_name, roll_number, marks_data))
+
+
+class _Bookmark(Flowable):
+    """Zero-size flowable that adds an outline entry pointing at the current page."""
+
+    def __init__(self, key, title):
+        super().__init__()
+        self.key = key
+        self.title = title
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=0)
+
+
+def build_merged_marks_pdf(file_path, students, title=None):
+    """Writes every student's report into one PDF, one bookmark per student."""
+    doc = SimpleDocTemplate(file_path, pagesize=letter, title=title or "Student Marks Reports")
+    story = []
+    for index, (student_name, roll_number, marks_data) in enumerate(students):
+        if index:
+            story.append(PageBreak())
+        story.append(_Bookmark(f"student{index}", f"{roll_number} - {student_name}"))
+        story.extend(marks_story(student_name, roll_number, marks_data))
+    doc.build(story, onFirstPage=lambda canvas, _: canvas.showOutline())
+
+
+def write_report_pdf(lines, file_path, font_size=8):
+    """Streams text report lines onto monospaced landscape pages.
+
+    Lines are drawn as they arrive, so a report of any length is written
+    without building it in memory first.
+    """
+    page_width, page_height = landscape(letter)
+    margin = 36
+    leading = font_size * 1.25
+    pdf = pdf_canvas.Canvas(file_path + ".part", pagesize=(page_width, page_height))
+    text = None
+    for line in lines:
+        if text is None or text.getY() < margin:
+            if text is not None:
+                pdf.drawText(text)
+                pdf.showPage()
+            text = pdf.beginText(margin, page_height - margin)
+            text.setFont("Courier", font_size, leading)
+        text.textLine(line.rstrip("\n"))
+    if text is not None:
+        pdf.drawText(text)
+    pdf.save()
+    os.replace(file_path + ".part", file_path)
+
+
+# --- Batch generation ---
+def marks_pdf_file_name(roll_number):
+    return "StudentMarksReport_" + re.sub(r"[^A-Za-z0-9._-]", "_", str(roll_number)) + ".pdf"
+
+
+def _build_marks_pdf_file(output_dir, student):
+    """Process-pool worker: writes one student's PDF into output_dir."""
+    student_name, roll_number, marks_data = student
+    file_path = os.path.join(output_dir, marks_pdf_file_name(roll_number))
+    # Build beside the target, then rename, so a failed run never leaves a truncated report
+    build_student_marks_pdf(file_path + ".part", student_name, roll_number, marks_data)
+    os.replace(file_path + ".part", file_path)
+
+
+def generate_marks_pdfs(students, output_dir=None, merged_path=None, workers=None, job=None):
+    """Builds marks PDFs for `students` (from fetch_cohort_marks).
+
+    Per-student files go to output_dir and are built in a process pool;
+    merged_path, if given, receives one bookmarked PDF with every student.
+    Returns a BatchResult.
+    """
+    result = BatchResult(len(students), unit="reports")
+    started = time.perf_counter()
+    try:
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_build_marks_pdf_file, output_dir, student): student[1] for student in students}
+                try:
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            result.failed.append((futures[future], str(e)))
+                            continue
+                        result.rendered += 1
+                        if job is not None:
+                            job.check_cancelled()
+                            done = result.rendered + len(result.failed)
+                            job.report_progress(done / len(students), f"{done}/{len(students)} reports")
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        if merged_path:
+            if job is not None:
+                job.report_progress(None, "Writing merged PDF")
+            build_merged_marks_pdf(merged_path + ".part", students)
+            os.replace(merged_path + ".part", merged_path)
+            if not output_dir:
+                result.rendered = len(students)
+    finally:
+        result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,291 @@
+"""Student, marks, payment and feedback writes shared by the Tk client and the HTTP service.
+
+Each write function validates its input, runs its statements on the given
+connection and leaves committing to the caller, so the same code runs one
+statement per transaction from the GUI and in batched transactions in
+sdms.server. Problems the user can fix raise RecordError with a message
+ready to show.
+"""
+import sqlite3
+from datetime import datetime
+
+from sdms.grades import derive_grade
+from sdms.reference import reference_data
+
+# Fields of a student record, as sent by the forms and the HTTP API.
+# Course, year and faculty are given by name and stored as ids.
+STUDENT_FIELDS = (
+    "roll_number", "name", "contact_number", "email", "address", "aadhaar_no",
+    "date_of_birth", "gender", "tenth_percent", "twelfth_percent", "blood_group",
+    "mother_name", "enrollment_status", "enrollment_date", "course_name",
+    "academic_year_name", "faculty_name", "profile_picture_path", "photo_hash",
+)
+_REQUIRED_STUDENT_FIELDS = ("roll_number", "name", "enrollment_date", "course_name", "academic_year_name", "faculty_name")
+_STUDENT_COLUMNS = (
+    "roll_number", "name", "contact_number", "email", "address", "aadhaar_no",
+    "date_of_birth", "gender", "tenth_percent", "twelfth_percent", "blood_group",
+    "mother_name", "enrollment_status", "enrollment_date", "course_id",
+    "academic_year_id", "faculty_id", "profile_picture_path", "photo_hash",
+)
+
+RECEIPT_TEMPLATE = """
+---------------------------------------------------
+        Saraswati College,Shegaon
+        PAYMENT RECEIPT
+---------------------------------------------------
+
+Receipt No:   {receipt_number}
+Date:         {payment_date}
+
+Student Name: {student_name}
+Roll Number:  {roll_number}
+Course:       {course_name}
+
+Amount Paid:  INR {amount_paid:.2f}
+Payment Type: {payment_type}
+Description:  {description}
+
+
+                                signature
+---------------------------------------------------
+Thank you for your payment!
+---------------------------------------------------
+            """
+
+
+class RecordError(Exception):
+    """The record cannot be written as given; the message is shown to the user."""
+
+
+class RecordNotFound(RecordError):
+    """The student (or other record) addressed does not exist."""
+
+
+# --- Reference data ---
+_REFERENCE_LABELS = {"courses": "Course", "academic_years": "Academic Year", "faculties": "Faculty"}
+
+
+def _lookup_id(tables, kind, name):
+    row_id = tables[kind].ids.get(name)
+    if row_id is None:
+        raise RecordError(f"{_REFERENCE_LABELS[kind]} '{name}' not found.")
+    return row_id
+
+
+def resolve_reference_ids(conn, course_name, academic_year_name, faculty_name):
+    """Returns (course_id, academic_year_id, faculty_id) for the names on a student form."""
+    tables = reference_data.tables(conn)
+    return (
+        _lookup_id(tables, "courses", course_name),
+        _lookup_id(tables, "academic_years", academic_year_name),
+        _lookup_id(tables, "faculties", faculty_name),
+    )
+
+
+def reference_names(conn):
+    """Course, academic year and faculty names for the form comboboxes, with the registry version."""
+    tables = reference_data.tables(conn)
+    names = {kind: list(table.names) for kind, table in tables.items()}
+    names["version"] = reference_data.version
+    return names
+
+
+# --- Students ---
+def _optional_float(value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return float(value)
+
+
+def _enrollment_status(value):
+    # Missing means enrolled, as the column's DEFAULT 1 and the importer have it; only an explicit No is 0
+    if isinstance(value, (int, float)):
+        return 1 if value else 0
+    text = "" if value is None else str(value).strip().lower()
+    if text in ("", "1", "yes", "y", "active", "true"):
+        return 1
+    if text in ("0", "no", "n", "inactive", "false"):
+        return 0
+    raise RecordError(f"Enrollment status '{value}' must be Yes or No.")
+
+
+def clean_student(record):
+    """Validates a student record and returns it with every field present and typed."""
+    unknown = set(record) - set(STUDENT_FIELDS)
+    if unknown:
+        raise RecordError(f"Unknown student fields: {', '.join(sorted(unknown))}.")
+    student = {}
+    for field in STUDENT_FIELDS:
+        value = record.get(field)
+        student[field] = value.strip() if isinstance(value, str) else value
+    if not all(student[field] for field in _REQUIRED_STUDENT_FIELDS):
+        raise RecordError("Roll Number, Name, Enrollment Date, Course, Academic Year, and Faculty are required fields.")
+    try:
+        student["tenth_percent"] = _optional_float(student["tenth_percent"])
+        student["twelfth_percent"] = _optional_float(student["twelfth_percent"])
+    except (TypeError, ValueError):
+        raise RecordError("10th % and 12th % must be numbers.")
+    try:
+        if student["date_of_birth"]:
+            datetime.strptime(student["date_of_birth"], "%Y-%m-%d")
+        datetime.strptime(student["enrollment_date"], "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise RecordError("Date fields must be in YYYY-MM-DD format.")
+    student["enrollment_status"] = _enrollment_status(student["enrollment_status"])
+    return student
+
+
+def _student_values(conn, record):
+    student = clean_student(record)
+    ids = resolve_reference_ids(conn, student["course_name"], student["academic_year_name"], student["faculty_name"])
+    values = [student[field] for field in STUDENT_FIELDS[:14]]
+    return values + list(ids) + [student["profile_picture_path"], student["photo_hash"]]
+
+
+def insert_student(conn, record):
+    """Adds a student and returns the new student_id."""
+    values = _student_values(conn, record)
+    try:
+        cursor = conn.execute(
+            f"INSERT INTO students ({', '.join(_STUDENT_COLUMNS)}) VALUES ({', '.join('?' * len(_STUDENT_COLUMNS))})",
+            values)
+    except sqlite3.IntegrityError:
+        raise RecordError("Roll Number or Aadhaar Number already exists.")
+    return cursor.lastrowid
+
+
+def update_student(conn, student_id, record):
+    values = _student_values(conn, record)
+    try:
+        cursor = conn.execute(
+            f"UPDATE students SET {', '.join(f'{column}=?' for column in _STUDENT_COLUMNS)} WHERE student_id=?",
+            values + [student_id])
+    except sqlite3.IntegrityError:
+        raise RecordError("Roll Number or Aadhaar Number already exists for another student.")
+    if cursor.rowcount == 0:
+        raise RecordNotFound(f"No student with ID {student_id}.")
+
+
+def delete_student(conn, student_id):
+    """Deletes a student with their marks; refuses while the student has payments on record."""
+    payments = conn.execute("SELECT COUNT(*) FROM payments WHERE student_id=?", (student_id,)).fetchone()[0]
+    if payments:
+        raise RecordError(f"Student ID {student_id} has {payments} payment(s) on record; "
+                          "payment history is kept, so the student cannot be deleted.")
+    # foreign_keys is enforced on pooled connections, so dependent rows go first
+    conn.execute("DELETE FROM marks WHERE student_id=?", (student_id,))
+    if conn.execute("DELETE FROM students WHERE student_id=?", (student_id,)).rowcount == 0:
+        raise RecordNotFound(f"No student with ID {student_id}.")
+
+
+def fetch_student(conn, student_id):
+    """Returns the student as a StudentRow, as in the student list, or None."""
+    from sdms.students import fetch_student_rows, student_select_sql
+
+    rows = fetch_student_rows(conn, student_select_sql(where="WHERE s.student_id = ?"), (student_id,))
+    return rows[0] if rows else None
+
+
+def _student_by_roll(conn, roll_number):
+    row = conn.execute("SELECT student_id, name, course_id FROM students WHERE roll_number=?", (roll_number,)).fetchone()
+    if not row:
+        raise RecordNotFound(f"No student found with Roll Number: {roll_number}")
+    return row
+
+
+# --- Marks ---
+def add_marks(conn, roll_number, course_name, subject_name, semester, marks_obtained, max_marks, grade=None):
+    """Records one subject's marks; the grade is derived from the score when not given."""
+    if not all(str(value).strip() for value in (roll_number, course_name, semester, subject_name, marks_obtained, max_marks)):
+        raise RecordError("All fields except Grade are required.")
+    try:
+        semester = int(semester)
+        marks_obtained = float(marks_obtained)
+        max_marks = float(max_marks)
+    except (TypeError, ValueError):
+        raise RecordError("Semester, Marks, and Max Marks must be numbers.")
+    if max_marks <= 0:
+        raise RecordError("Max Marks must be greater than zero.")
+    student_id = _student_by_roll(conn, roll_number)[0]
+    course_id = _lookup_id(reference_data.tables(conn), "courses", course_name)
+    cursor = conn.execute(
+        "INSERT INTO marks (student_id, course_id, subject_name, semester, marks_obtained, max_marks, grade) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (student_id, course_id, subject_name, semester, marks_obtained, max_marks, grade or derive_grade(marks_obtained, max_marks))
+    )
+    return cursor.lastrowid
+
+
+def fetch_marks_by_roll(conn, roll_number):
+    """(subject, semester, marks, max marks, grade) rows for the Marks Entry tab."""
+    return conn.execute("""
+        SELECT m.subject_name, m.semester, m.marks_obtained, m.max_marks, m.grade
+        FROM marks m
+        JOIN students s ON m.student_id = s.student_id
+        WHERE s.roll_number = ?
+        ORDER BY m.semester, m.subject_name
+    """, (roll_number,)).fetchall()
+
+
+# --- Payments ---
+def record_payment(conn, roll_number, amount_paid, payment_type, description="", payment_date=None):
+    """Records a payment and returns the receipt as a dict (see format_receipt)."""
+    if not str(roll_number).strip() or amount_paid in (None, ""):
+        raise RecordError("Please enter student Roll Number and Amount Paid.")
+    try:
+        amount_paid = float(amount_paid)
+    except (TypeError, ValueError):
+        amount_paid = 0
+    if amount_paid <= 0:
+        raise RecordError("Amount Paid must be a valid positive number.")
+    now = datetime.now()
+    payment_date = payment_date or now.strftime("%Y-%m-%d %H:%M:%S")
+    student_id, student_name, course_id = _student_by_roll(conn, roll_number)
+    # Generate a simple receipt number (e.g., timestamp + roll_number)
+    receipt_number = f"REC-{now.strftime('%Y%m%d%H%M%S')}-{roll_number}"
+    try:
+        conn.execute("""
+            INSERT INTO payments (student_id, amount_paid, payment_date, payment_type, receipt_number, description)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (student_id, amount_paid, payment_date, payment_type, receipt_number, description))
+    except sqlite3.IntegrityError:
+        raise RecordError(f"Receipt {receipt_number} already exists; try again in a second.")
+    return {
+        "receipt_number": receipt_number, "payment_date": payment_date, "student_name": student_name,
+        "roll_number": roll_number, "course_name": reference_data.name_for(conn, "courses", course_id) or "N/A",
+        "amount_paid": amount_paid, "payment_type": payment_type, "description": description,
+    }
+
+
+def format_receipt(receipt):
+    return RECEIPT_TEMPLATE.format(**dict(receipt, description=receipt["description"] or "N/A"))
+
+
+def fetch_payments_page(conn, student_id=None, before_id=None, limit=200):
+    """Payments newest first, keyset-paginated on payment_id like the student list."""
+    conditions, params = [], []
+    if student_id is not None:
+        conditions.append("p.student_id = ?")
+        params.append(student_id)
+    if before_id is not None:
+        conditions.append("p.payment_id < ?")
+        params.append(before_id)
+    query = """
+        SELECT p.payment_id, p.receipt_number, s.roll_number, s.name, p.amount_paid, p.payment_date,
+               p.payment_type, p.description
+        FROM payments p
+        JOIN students s ON p.student_id = s.student_id
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY p.payment_id DESC LIMIT ?"
+    params.append(limit)
+    return conn.execute(query, params).fetchall()
+
+
+# --- Feedback ---
+def add_feedback(conn, name, email, feedback_text, timestamp=None):
+    if not str(feedback_text).strip():
+        raise RecordError("Please enter your feedback before submitting.")
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return conn.execute("INSERT INTO feedback (name, email, feedback_text, timestamp) VALUES (?, ?, ?, ?)",
+                        (name, email, feedback_text, timestamp)).lastrowid
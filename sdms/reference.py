@@ -0,0 +1,81 @@
+"""Courses, academic years and faculties, held in memory as name <-> id maps.
+
+Forms, imports, reports and saves used to look these up with a query per
+name. The registry loads all three tables at once, per database file, and
+keeps them until one of them changes, which it learns from that database's
+change tracker in sdms.db (commits by this process, or by any other
+connection). Each reload bumps `version`, so widgets filled from the registry
+can tell when their values are stale.
+
+Callers resolving several names should take tables(conn) once and look them
+all up in it, so the change check runs once.
+"""
+import threading
+
+from sdms.db import change_tracker
+
+# kind -> (table, id column, name column)
+REFERENCE_TABLES = {
+    "courses": ("courses", "course_id", "course_name"),
+    "academic_years": ("academic_years", "year_id", "year_name"),
+    "faculties": ("faculties", "faculty_id", "faculty_name"),
+}
+
+
+class ReferenceTable:
+    """One lookup table: names in table order, plus maps both ways."""
+
+    __slots__ = ("names", "ids", "names_by_id")
+
+    def __init__(self, rows):
+        self.names = [name for _, name in rows]
+        self.ids = {name: row_id for row_id, name in rows}
+        self.names_by_id = {row_id: name for row_id, name in rows}
+
+
+_TABLE_NAMES = [table for table, _, _ in REFERENCE_TABLES.values()]
+
+
+class ReferenceData:
+    def __init__(self, tracker_for=change_tracker):
+        self.tracker_for = tracker_for
+        self.version = 0
+        self._loaded = {}  # database file -> (change token, {kind: ReferenceTable})
+        self._lock = threading.Lock()
+
+    def tables(self, conn):
+        """Returns {kind: ReferenceTable} for conn's database, reloading only if the tables changed."""
+        tracker = self.tracker_for(conn)
+        database = getattr(tracker, "database", None)
+        token = tracker.change_token(_TABLE_NAMES)
+        with self._lock:
+            loaded = self._loaded.get(database)
+            if loaded is not None and loaded[0] == token:
+                return loaded[1]
+            tables = {
+                kind: ReferenceTable(conn.execute(f"SELECT {id_column}, {name_column} FROM {table}").fetchall())
+                for kind, (table, id_column, name_column) in REFERENCE_TABLES.items()
+            }
+            self._loaded[database] = (token, tables)
+            self.version += 1
+            return tables
+
+    def table(self, conn, kind):
+        return self.tables(conn)[kind]
+
+    def names(self, conn, kind):
+        return list(self.table(conn, kind).names)
+
+    def id_for(self, conn, kind, name):
+        """The id for name, or None if there is no such entry."""
+        return self.table(conn, kind).ids.get(name)
+
+    def name_for(self, conn, kind, row_id):
+        return self.table(conn, kind).names_by_id.get(row_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded.clear()
+
+
+reference_data = ReferenceData()
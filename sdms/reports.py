@@ -0,0 +1,215 @@
+"""Text reports and analytics insights shown on the Reports and Analytics tabs.
+
+Each report is a generator of text lines over a fetchmany() cursor, so it can
+be streamed to a sink as it is produced; the plain functions of the same name
+return the finished text. Both run on a background worker.
+"""
+import os
+
+from sdms.reference import reference_data
+
+REPORT_FETCH_SIZE = 500
+REPORT_CHUNK_LINES = 200
+
+
+class ReportError(Exception):
+    """The report cannot be produced for the given parameters."""
+
+
+ENROLLMENT_REPORT_SQL = """
+    SELECT s.roll_number, s.name, s.enrollment_date, c.course_name, a.year_name, f.faculty_name,
+        CASE WHEN s.enrollment_status = 1 THEN 'Active' ELSE 'Inactive' END AS status
+    FROM students s
+    LEFT JOIN courses c ON s.course_id = c.course_id
+    LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
+    LEFT JOIN faculties f ON s.faculty_id = f.faculty_id
+    ORDER BY s.enrollment_date DESC
+"""
+
+MARKS_REPORT_SQL = """
+    SELECT s.roll_number, s.name, m.subject_name, m.marks_obtained, m.max_marks, m.grade
+    FROM marks m
+    JOIN students s ON m.student_id = s.student_id
+    WHERE m.course_id = ? AND m.semester = ?
+    ORDER BY s.name, m.subject_name
+"""
+
+PAYMENT_REPORT_SQL = """
+    SELECT s.roll_number, s.name, p.amount_paid, p.payment_date, p.payment_type, p.receipt_number, p.description
+    FROM payments p
+    JOIN students s ON p.student_id = s.student_id
+    ORDER BY p.payment_date DESC
+"""
+
+
+def resolve_course_id(conn, course_name):
+    course_id = reference_data.id_for(conn, "courses", course_name)
+    if course_id is None:
+        raise ReportError(f"Course '{course_name}' not found.")
+    return course_id
+
+
+# --- Streaming pipeline ---
+# Reports are generators of text lines fed by cursor.fetchmany(), so a sink
+# (Text widget, file, PDF) can show or write the first lines straight away
+# and memory stays flat however large the table is.
+def iter_rows(cursor, size=REPORT_FETCH_SIZE):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def iter_chunks(lines, max_lines=REPORT_CHUNK_LINES):
+    """Joins lines into strings of up to max_lines, for sinks that prefer fewer, larger writes."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= max_lines:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def write_report_file(lines, file_path):
+    """Streams report lines into a text file; the file only appears once complete."""
+    with open(file_path + ".part", "w", encoding="utf-8") as f:
+        for chunk in iter_chunks(lines):
+            f.write(chunk)
+    os.replace(file_path + ".part", file_path)
+
+
+def table_lines(title, rule, header, rows, format_row, empty_message=None):
+    yield title + "\n"
+    yield rule + "\n"
+    yield header + "\n"
+    yield rule + "\n"
+    empty = True
+    for row in rows:
+        empty = False
+        yield format_row(row) + "\n"
+    if empty and empty_message:
+        yield empty_message + "\n"
+
+
+def enrollment_report_lines(conn):
+    return table_lines(
+        "Student Enrollment Report",
+        "----------------------------------------------------------------------------------------------------",
+        f"{'Roll No':<10}{'Name':<25}{'Enroll Date':<15}{'Course':<20}{'Acad Year':<15}{'Faculty':<15}{'Status':<10}",
+        iter_rows(conn.execute(ENROLLMENT_REPORT_SQL)),
+        lambda row: f"{row[0]:<10}{row[1]:<25}{row[2]:<15}{row[3]:<20}{row[4]:<15}{row[5]:<15}{row[6]:<10}")
+
+
+def marks_report_lines(conn, course_name, semester):
+    course_id = resolve_course_id(conn, course_name)
+    return table_lines(
+        f"Marks Report for {course_name}, Semester {semester}",
+        "----------------------------------------------------------------------",
+        f"{'Roll No':<10}{'Name':<20}{'Subject':<25}{'Marks':<8}{'Max':<8}{'Grade':<8}",
+        iter_rows(conn.execute(MARKS_REPORT_SQL, (course_id, semester))),
+        lambda row: f"{row[0]:<10}{row[1]:<20}{row[2]:<25}{row[3]:<8.2f}{row[4]:<8.2f}{row[5]:<8}",
+        "No marks found for the selected criteria.")
+
+
+def payment_report_lines(conn):
+    return table_lines(
+        "Payment History Report",
+        "----------------------------------------------------------------------------------------------------",
+        f"{'Roll No':<10}{'Student Name':<25}{'Amount':<10}{'Date':<15}{'Type':<15}{'Receipt No':<15}{'Description':<25}",
+        iter_rows(conn.execute(PAYMENT_REPORT_SQL)),
+        lambda row: f"{row[0]:<10}{row[1]:<25}{row[2]:<10.2f}{row[3]:<15}{row[4]:<15}{row[5] if row[5] else 'N/A':<15}{row[6] if row[6] else 'N/A':<25}",
+        "No payment records found.")
+
+
+# --- Analytics & Insights ---
+# These read the trigger-maintained tables in sdms.summaries, one row per
+# course, faculty or status, instead of aggregating students and marks.
+def _percent(value, suffix=""):
+    return f"{value:.2f}{suffix}" if value is not None else "N/A"
+
+
+def students_per_course_lines(conn):
+    return table_lines(
+        "Students Enrolled Per Course",
+        "----------------------------------------",
+        f"{'Course':<25}{'Total Students':<15}",
+        iter_rows(conn.execute("""
+            SELECT c.course_name, COALESCE(cs.student_count, 0) AS total_students
+            FROM courses c
+            LEFT JOIN course_student_summary cs ON c.course_id = cs.course_id
+            ORDER BY total_students DESC
+        """)),
+        lambda row: f"{row[0]:<25}{row[1]:<15}")
+
+
+def average_marks_per_course_lines(conn):
+    return table_lines(
+        "Average Marks Percentage Per Course",
+        "------------------------------------------------",
+        f"{'Course':<25}{'Average Percentage':<20}",
+        iter_rows(conn.execute("""
+            SELECT c.course_name, cm.ratio_sum / NULLIF(cm.ratio_count, 0) * 100 AS average_percentage
+            FROM course_marks_summary cm
+            JOIN courses c ON cm.course_id = c.course_id
+            WHERE cm.mark_count > 0
+            ORDER BY average_percentage DESC
+        """)),
+        lambda row: f"{row[0]:<25}{_percent(row[1], '%'):<20}",
+        "No marks data available for courses.")
+
+
+def enrollment_status_breakdown_lines(conn):
+    return table_lines(
+        "Student Enrollment Status Breakdown",
+        "-----------------------------------",
+        f"{'Status':<15}{'Total Students':<15}",
+        iter_rows(conn.execute("""
+            SELECT status, student_count AS total_students
+            FROM status_student_summary
+            WHERE student_count > 0
+            ORDER BY status DESC
+        """)),
+        lambda row: f"{row[0]:<15}{row[1]:<15}")
+
+
+def faculty_academic_performance_lines(conn):
+    return table_lines(
+        "Faculty Academic Performance (Avg 10th/12th %)",
+        "----------------------------------------------------------------",
+        f"{'Faculty':<15}{'Avg 10th %':<15}{'Avg 12th %':<15}{'Total Students':<15}",
+        iter_rows(conn.execute("""
+            SELECT f.faculty_name,
+                fs.tenth_sum / NULLIF(fs.tenth_count, 0) AS avg_10th_percent,
+                fs.twelfth_sum / NULLIF(fs.twelfth_count, 0) AS avg_12th_percent,
+                COALESCE(fs.student_count, 0) AS total_students
+            FROM faculties f
+            LEFT JOIN faculty_student_summary fs ON f.faculty_id = fs.faculty_id
+            ORDER BY avg_10th_percent DESC, avg_12th_percent DESC, total_students DESC
+        """)),
+        lambda row: f"{row[0]:<15}{_percent(row[1]):<15}{_percent(row[2]):<15}{row[3]:<15}")
+
+
+# Insight name (as shown in the Analytics tab) -> line generator
+INSIGHTS = {
+    "Students per Course": students_per_course_lines,
+    "Average Marks per Course": average_marks_per_course_lines,
+    "Enrollment Status Breakdown": enrollment_status_breakdown_lines,
+    "Faculty Academic Performance": faculty_academic_performance_lines,
+}
+
+# Base tables each report reads (through the summaries for insights), so a
+# cached result is dropped only when one of them is written.
+REPORT_TABLES = {
+    "enrollment": ("students", "courses", "academic_years", "faculties"),
+    "marks": ("marks", "students", "courses"),
+    "payments": ("payments", "students"),
+}
+INSIGHT_TABLES = {
+    "Students per Course": ("students", "courses"),
+    "Average Marks per Course": ("marks", "courses"),
+    "Enrollment Status Breakdown": ("students",),
+    "Faculty Academic Performance": ("students", "faculties"),
+}
@@ -0,0 +1,98 @@
+"""Cache of finished report and insight text, dropped when the data it read changes.
+
+An entry is keyed by database file, report name and parameters and stamped
+with the change token of the tables the report reads (sdms.db.ChangeTracker):
+this process's write counters for those tables plus a counter of commits made
+by other connections, detected through PRAGMA data_version. A write therefore
+invalidates only the entries that read the written tables, while a change
+from outside, whose tables are unknown, invalidates everything.
+"""
+import threading
+from collections import OrderedDict
+
+from sdms.db import change_tracker
+
+RESULT_CACHE_MAX_CHARS = 16 * 1024 * 1024
+RESULT_CACHE_MAX_ENTRY_CHARS = 4 * 1024 * 1024  # Larger results are streamed but not kept
+
+
+class ResultCache:
+    """LRU cache of report lines, bounded by total text length."""
+
+    def __init__(self, tracker_for=change_tracker, max_chars=RESULT_CACHE_MAX_CHARS,
+                 max_entry_chars=RESULT_CACHE_MAX_ENTRY_CHARS):
+        self.tracker_for = tracker_for
+        self.max_chars = max_chars
+        self.max_entry_chars = max_entry_chars
+        self._entries = OrderedDict()  # key -> (token, lines, size)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, tables, tracker):
+        """Returns (lines or None, token); store the result of a miss under that token."""
+        token = tracker.change_token(tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == token:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], token
+            if entry is not None:
+                self._drop(key)  # Stale: one of its tables was written
+            self.misses += 1
+            return None, token
+
+    def store(self, key, token, lines, size):
+        if size > self.max_entry_chars:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (token, lines, size)
+            self._size += size
+            while self._size > self.max_chars:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+    def cached(self, name, tables, make_lines):
+        """Wraps make_lines(conn, *params) so repeated calls replay the stored lines.
+
+        On a miss the lines are streamed as they are produced and kept once the
+        report has finished, so the first run is no slower than uncached.
+        """
+        def lines(conn, *params):
+            tracker = self.tracker_for(conn)
+            key = (getattr(tracker, "database", None), name, params)
+            stored, token = self.lookup(key, tables, tracker)
+            if stored is not None:
+                yield from stored
+                return
+            collected, size = [], 0
+            for line in make_lines(conn, *params):
+                if collected is not None:
+                    size += len(line)
+                    if size > self.max_entry_chars:
+                        collected = None
+                    else:
+                        collected.append(line)
+                yield line
+            if collected is not None:
+                self.store(key, token, tuple(collected), size)
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "chars": self._size}
+
+
+result_cache = ResultCache()
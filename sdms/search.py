@@ -0,0 +1,138 @@
+"""Full-text student search backed by an FTS5 index.
+
+students_fts is an external-content FTS5 table over the searchable student
+columns, kept in sync by triggers. SQLite builds without FTS5 fall back to the
+old LIKE scan, so search keeps working everywhere.
+
+Rebuild the index of an existing database with:
+
+    python -m sdms.search rebuild
+"""
+import re
+import sqlite3
+import sys
+
+from sdms.students import STUDENT_PAGE_SIZE, fetch_student_rows, fetch_students_page, student_select_sql
+
+FTS_COLUMNS = ("name", "roll_number", "email", "contact_number", "mother_name")
+
+
+def fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def has_student_fts(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='students_fts'").fetchone() is not None
+
+
+def create_student_fts(cursor):
+    """Creates students_fts and its sync triggers. Returns False without FTS5."""
+    if not fts5_available(cursor.connection):
+        return False
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+            {columns},
+            content='students', content_rowid='student_id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN
+            INSERT INTO students_fts(rowid, {columns}) VALUES (new.student_id, {new_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN
+            INSERT INTO students_fts(students_fts, rowid, {columns}) VALUES ('delete', old.student_id, {old_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE OF {columns} ON students BEGIN
+            INSERT INTO students_fts(students_fts, rowid, {columns}) VALUES ('delete', old.student_id, {old_values});
+            INSERT INTO students_fts(rowid, {columns}) VALUES (new.student_id, {new_values});
+        END
+    """)
+    cursor.execute("INSERT INTO students_fts(students_fts) VALUES ('rebuild')")
+    return True
+
+
+def rebuild_student_fts(conn):
+    """Creates the index if missing and re-reads every student into it."""
+    with conn:
+        if not create_student_fts(conn.cursor()):
+            return False
+        conn.execute("INSERT INTO students_fts(students_fts) VALUES ('optimize')")
+    return True
+
+
+def build_match_query(search_term):
+    """Turns free text into an FTS5 query: every word must match as a prefix."""
+    words = search_term.replace('"', " ").split()
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def row_matches(student, search_term):
+    """Whether a StudentRow would be found by search_term, checked in Python as the index does it.
+
+    Every word must be a prefix of a word in one of FTS_COLUMNS. Lets a list
+    showing search results decide whether a student added meanwhile belongs in it.
+    """
+    words = {word for column in FTS_COLUMNS for word in re.findall(r"\w+", str(getattr(student, column) or "").lower())}
+    return all(any(word.startswith(term) for word in words)
+               for term in re.findall(r"\w+", search_term.lower()))
+
+
+_STUDENT_SEARCH_SQL = student_select_sql(
+    from_sql="students_fts JOIN students s ON s.student_id = students_fts.rowid",
+    where="WHERE students_fts MATCH ?",
+    order_by="ORDER BY students_fts.rank, s.student_id DESC LIMIT ? OFFSET ?",
+)
+
+
+def search_students_page(conn, search_term, cursor=None, limit=STUDENT_PAGE_SIZE):
+    """Returns (rows, next_cursor) for one page of search results.
+
+    With FTS5 the rows are ranked by bm25 and the cursor is an offset into the
+    ranking; on the LIKE fallback it is the last student_id, as for the plain
+    student list. next_cursor is None once there are no more rows.
+    """
+    match_query = build_match_query(search_term)
+    if match_query and has_student_fts(conn):
+        offset = cursor or 0
+        rows = fetch_student_rows(conn, _STUDENT_SEARCH_SQL, (match_query, limit, offset))
+        next_cursor = offset + len(rows)
+    else:
+        rows = fetch_students_page(conn, cursor, limit, search_term=search_term)
+        next_cursor = rows[-1].student_id if rows else None
+    return rows, (next_cursor if len(rows) == limit else None)
+
+
+def main(argv=None):
+    from sdms.db import get_db_connection
+    from sdms.migrations import migrate
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv != ["rebuild"]:
+        print("usage: python -m sdms.search rebuild", file=sys.stderr)
+        return 2
+    conn = get_db_connection()
+    migrate(conn)
+    if not rebuild_student_fts(conn):
+        print("This SQLite build has no FTS5; search uses the LIKE fallback.", file=sys.stderr)
+        return 1
+    count = conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+    print(f"Rebuilt student search index ({count} students).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
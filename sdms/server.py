@@ -0,0 +1,470 @@
+"""Local HTTP/JSON service that owns the database for several Tk clients.
+
+One process opens the SQLite file; front-desk machines run the application
+with SDMS_SERVER_URL pointing here and use sdms.backend.HttpBackend instead of
+opening the file themselves.
+
+- Requests are handled by a fixed pool of worker threads, each keeping its
+  pooled connection (sdms.db) for the life of the server.
+- Writes are queued to a single writer thread, which commits everything
+  queued so far in one transaction, each operation in its own savepoint so a
+  rejected write does not undo the others.
+- Lists are keyset-paginated: pass the "next" value of a page as ?cursor=.
+- Reports and insights are streamed as JSON lines, one text line each.
+- Every endpoint but /login needs the session token /login returns, sent as
+  "Authorization: Bearer <token>"; a token lapses after SESSION_IDLE_SECONDS
+  without use. Requests without a valid one get 401.
+
+    python -m sdms serve --port 8765
+
+The service listens on 127.0.0.1 unless --host says otherwise. Traffic is
+plain HTTP, passwords and tokens included, so only serve other machines
+(--host with the machine's LAN address) on a network you trust.
+
+Endpoints (all under /api):
+
+    POST /login                         {"user_id", "password"} -> {"user", "token"}
+    POST /users                         {"user_id", "password", "name"}; only with --allow-registration
+    PUT  /users/<id>/password           {"old_password", "new_password"}
+    GET  /reference                     course, academic year and faculty names
+    GET  /students?q=&cursor=&limit=    list, or ranked search with q
+    POST /students                      student record -> {"student_id"}
+    GET|PUT|DELETE /students/<id>
+    GET  /marks?roll_number=            POST /marks
+    GET  /payments?student_id=&cursor=  POST /payments -> {"receipt", "text"}
+    GET  /reports/<name>?course_name=&semester=
+    GET  /insights                      names; ?name= streams one insight
+    POST /feedback                      {"name", "email", "feedback_text"}
+
+/login, /users and /users/<id>/password take no token: the password checks
+are their authentication. Self-registration hands out a login, so it is off
+unless the server is started with --allow-registration.
+"""
+import argparse
+import json
+import queue
+import re
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from sdms.backend import WRITES, LocalBackend
+from sdms.db import commit_changes, get_db_connection, manager
+from sdms.records import RecordError, RecordNotFound, format_receipt
+from sdms.reports import ReportError
+from sdms.students import STUDENT_PAGE_SIZE
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+REQUEST_WORKERS = 8  # Threads serving requests, each with its own pooled connection
+WRITE_BATCH_SIZE = 100  # Most writes committed in one transaction
+MAX_PAGE_SIZE = 1000
+SESSION_IDLE_SECONDS = 8 * 60 * 60  # A session token stops working after this long unused
+
+
+class WriteBatcher:
+    """Single writer thread that group-commits queued WRITES operations."""
+
+    def __init__(self, batch_size=WRITE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sdms-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit(self, op, *args):
+        """Queues a write and waits until it is committed; returns its result or raises its error."""
+        future = Future()
+        self._queue.put((future, op, args))
+        return future.result()
+
+    def _run(self):
+        conn = get_db_connection()
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            # Whatever arrived while the last batch was committing goes into this one
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(conn, batch)
+        manager.close_thread_connection()
+
+    def _commit(self, conn, batch):
+        outcomes = []
+        tables = set()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for future, op, args in batch:
+                func, op_tables = WRITES[op]
+                conn.execute("SAVEPOINT write_op")
+                try:
+                    outcomes.append((future, func(conn, *args), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_op")
+                    outcomes.append((future, None, e))
+                else:
+                    tables.update(op_tables)
+                conn.execute("RELEASE write_op")
+            commit_changes(conn, *tables)
+        except Exception as e:
+            # BEGIN or COMMIT failed: nothing in this batch was stored
+            if conn.in_transaction:
+                conn.rollback()
+            for future, _, _ in batch:
+                future.set_exception(e)
+            return
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+class SessionStore:
+    """Bearer tokens issued by /api/login, each valid until left unused for idle_seconds."""
+
+    def __init__(self, idle_seconds=SESSION_IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._sessions = {}  # token -> [user, monotonic time of last use]
+        self._lock = threading.Lock()
+
+    def issue(self, user):
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            # Logins are rare, so this is a fine moment to forget lapsed sessions
+            for old in [t for t, (_, used) in self._sessions.items() if now - used > self.idle_seconds]:
+                del self._sessions[old]
+            self._sessions[token] = [user, now]
+        return token
+
+    def user_for(self, token):
+        """The user the token was issued to, or None if it is unknown or has lapsed."""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            if now - session[1] > self.idle_seconds:
+                del self._sessions[token]
+                return None
+            session[1] = now
+            return session[0]
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles requests on a fixed thread pool instead of a thread per request."""
+
+    request_queue_size = 128  # Connections waiting for a free worker before the OS refuses them
+
+    def __init__(self, address, backend, writer, workers=REQUEST_WORKERS, allow_registration=False):
+        super().__init__(address, ApiHandler)
+        self.backend = backend
+        self.writer = writer
+        self.allow_registration = allow_registration
+        self.sessions = SessionStore()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sdms-http")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "sdms/1"
+
+    # (method, path pattern, handler method name)
+    ROUTES = [
+        ("POST", r"/api/login", "login"),
+        ("POST", r"/api/users", "register_user"),
+        ("PUT", r"/api/users/([^/]+)/password", "change_password"),
+        ("GET", r"/api/reference", "reference"),
+        ("GET", r"/api/students", "list_students"),
+        ("POST", r"/api/students", "add_student"),
+        ("GET", r"/api/students/(\d+)", "get_student"),
+        ("PUT", r"/api/students/(\d+)", "update_student"),
+        ("DELETE", r"/api/students/(\d+)", "delete_student"),
+        ("GET", r"/api/marks", "list_marks"),
+        ("POST", r"/api/marks", "add_marks"),
+        ("GET", r"/api/payments", "list_payments"),
+        ("POST", r"/api/payments", "record_payment"),
+        ("GET", r"/api/reports/([^/]+)", "report"),
+        ("GET", r"/api/insights", "insight"),
+        ("POST", r"/api/feedback", "add_feedback"),
+    ]
+    PUBLIC_ROUTES = {"login", "register_user", "change_password"}  # Handlers that run without a session token
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"{self.address_string()} {format % args}\n")
+
+    # --- Plumbing ---
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path_matched = False
+        try:
+            for route_method, pattern, name in self.ROUTES:
+                match = re.fullmatch(pattern, url.path)
+                if not match:
+                    continue
+                path_matched = True
+                if route_method == method:
+                    self.user = None if name in self.PUBLIC_ROUTES else self._authenticate()
+                    getattr(self, name)(*(unquote(group) for group in match.groups()))
+                    return
+            if path_matched:
+                raise ApiError(405, f"{method} is not allowed on {url.path}.")
+            raise ApiError(404, f"No such endpoint: {url.path}")
+        except ApiError as e:
+            self._send_error(e.status, str(e))
+        except RecordNotFound as e:
+            self._send_error(404, str(e))
+        except RecordError as e:
+            self._send_error(400, str(e))
+        except ReportError as e:
+            self._send_error(400, str(e), kind="report")
+        except sqlite3.IntegrityError as e:
+            self._send_error(409, f"Conflicts with existing data: {e}")
+        except Exception as e:
+            self.log_error("%s %s failed: %r", method, self.path, e)
+            self._send_error(500, f"Internal error: {e}")
+        finally:
+            conn = get_db_connection()
+            if conn.in_transaction:
+                conn.rollback()
+
+    def _authenticate(self):
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        user = self.server.sessions.user_for(token.strip()) if scheme.lower() == "bearer" else None
+        if user is None:
+            raise ApiError(401, "Not logged in, or the session has expired; please log in again.")
+        return user
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message, kind="record"):
+        self._send_json({"error": message, "kind": kind}, status)
+
+    def _send_lines(self, lines):
+        # Pull the first line before answering, so a bad report still gets an error status
+        lines = iter(lines)
+        first = next(lines, None)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        # From here on the status is out: no error may escape to _dispatch, which would answer a second time
+        self.close_connection = True  # The body has no length; closing the connection ends it
+        if first is None:
+            return
+        try:
+            self.wfile.write((json.dumps(first) + "\n").encode("utf-8"))
+            for line in lines:
+                self.wfile.write((json.dumps(line) + "\n").encode("utf-8"))
+        except OSError as e:
+            self.log_error("%s: client went away during the stream: %r", self.path, e)
+        except Exception as e:
+            # Too late for an error status; end the stream with an error object instead
+            if not isinstance(e, (RecordError, ReportError, sqlite3.Error)):
+                self.log_error("%s failed while streaming: %r", self.path, e)
+                e = f"Internal error: {e}"
+            try:
+                self.wfile.write((json.dumps({"error": str(e)}) + "\n").encode("utf-8"))
+            except OSError:
+                pass
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise ApiError(400, "The request body is not valid JSON.")
+        if not isinstance(body, dict):
+            raise ApiError(400, "The request body must be a JSON object.")
+        return body
+
+    def _int_param(self, name, default=None):
+        value = self.query.get(name)
+        if value in (None, ""):
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ApiError(400, f"{name} must be a whole number.")
+
+    def _limit(self):
+        return max(1, min(self._int_param("limit", STUDENT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+    # --- Endpoints ---
+    def login(self):
+        body = self._body()
+        user = self.server.backend.login(body.get("user_id", ""), body.get("password", ""))
+        if user is None:
+            self._send_json({"user": None, "token": None})
+            return
+        self._send_json({"user": list(user), "token": self.server.sessions.issue(tuple(user))})
+
+    def register_user(self):
+        if not self.server.allow_registration:
+            raise ApiError(403, "Registration is turned off on this server; ask an administrator for an account.")
+        body = self._body()
+        self.server.writer.submit("register_user", body.get("user_id", ""), body.get("password", ""), body.get("name", ""))
+        self._send_json({"user_id": body.get("user_id")}, 201)
+
+    def change_password(self, user_id):
+        body = self._body()
+        self.server.writer.submit("change_password", user_id, body.get("old_password", ""), body.get("new_password", ""))
+        self._send_json({"user_id": user_id})
+
+    def reference(self):
+        self._send_json(self.server.backend.reference_names())
+
+    def list_students(self):
+        backend = self.server.backend
+        search_term = self.query.get("q", "").strip()
+        if search_term:
+            rows, next_cursor = backend.search_students(search_term, self._int_param("cursor"), self._limit())
+        else:
+            rows, next_cursor = backend.students_page(self._int_param("cursor"), self._limit())
+        self._send_json({"rows": rows, "next": next_cursor})
+
+    def add_student(self):
+        self._send_json({"student_id": self.server.writer.submit("add_student", self._body())}, 201)
+
+    def get_student(self, student_id):
+        self._send_json({"row": self.server.backend.get_student(int(student_id))})
+
+    def update_student(self, student_id):
+        self.server.writer.submit("update_student", int(student_id), self._body())
+        self._send_json({"student_id": int(student_id)})
+
+    def delete_student(self, student_id):
+        self.server.writer.submit("delete_student", int(student_id))
+        self._send_json({"student_id": int(student_id)})
+
+    def list_marks(self):
+        self._send_json({"rows": self.server.backend.student_marks(self.query.get("roll_number", ""))})
+
+    def add_marks(self):
+        body = self._body()
+        fields = ("roll_number", "course_name", "subject_name", "semester", "marks_obtained", "max_marks", "grade")
+        mark_id = self.server.writer.submit("add_marks", *(body.get(field, "") for field in fields))
+        self._send_json({"mark_id": mark_id}, 201)
+
+    def list_payments(self):
+        rows = self.server.backend.payments_page(self._int_param("student_id"), self._int_param("cursor"), self._limit())
+        self._send_json({"rows": rows, "next": rows[-1][0] if len(rows) == self._limit() else None})
+
+    def record_payment(self):
+        body = self._body()
+        receipt = self.server.writer.submit("record_payment", body.get("roll_number", ""), body.get("amount_paid"),
+                                            body.get("payment_type", ""), body.get("description", ""))
+        self._send_json({"receipt": receipt, "text": format_receipt(receipt)}, 201)
+
+    def report(self, name):
+        params = ()
+        if name == "marks":
+            params = (self.query.get("course_name", ""), self._int_param("semester"))
+        self._send_lines(self.server.backend.report_lines(name, *params))
+
+    def insight(self):
+        name = self.query.get("name")
+        if not name:
+            self._send_json({"names": self.server.backend.insight_names()})
+            return
+        self._send_lines(self.server.backend.insight_lines(name))
+
+    def add_feedback(self):
+        body = self._body()
+        feedback_id = self.server.writer.submit("add_feedback", body.get("name", ""), body.get("email", ""),
+                                                body.get("feedback_text", ""))
+        self._send_json({"feedback_id": feedback_id}, 201)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=REQUEST_WORKERS, allow_registration=False):
+    """Runs the service until interrupted."""
+    from sdms.migrations import migrate
+
+    migrate(get_db_connection())
+    writer = WriteBatcher()
+    writer.start()
+    httpd = PooledHTTPServer((host, port), LocalBackend(), writer, workers, allow_registration)
+    print(f"Serving {manager.database} on http://{host}:{httpd.server_port}/api", file=sys.stderr)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        writer.stop()
+        manager.close_all()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sdms serve", description="Serve the student database over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"default {DEFAULT_PORT}")
+    parser.add_argument("--workers", type=int, default=REQUEST_WORKERS, help="request threads")
+    parser.add_argument("--allow-registration", action="store_true",
+                        help="let anyone who can reach the server create a student login")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.allow_registration)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Startup timing for the Tk application, so cold-start cost can be tracked.
+
+Run the application with SDMS_STARTUP_PROFILE=1 to print, on stderr, how long
+it took from the first line of the script to each startup milestone (imports
+done, schema checked, login window painted, main window painted).
+
+    python -m sdms.startup              # -X importtime breakdown of the app's top-level imports
+    python -m sdms.startup --app        # also launch the app and time the login window's first paint
+    python -m sdms.startup --runs 5     # median of several runs
+"""
+import os
+import sys
+import time
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "Student Database Mangement Systems project code.py")
+PROFILE_ENV = "SDMS_STARTUP_PROFILE"  # Set to print milestones to stderr
+EXIT_ENV = "SDMS_STARTUP_EXIT"  # Set to quit as soon as the login window has painted
+MARK_PREFIX = "startup:"
+
+_started = None
+
+
+def begin():
+    """Starts the clock; call on the application's first line."""
+    global _started
+    _started = time.perf_counter()
+
+
+def mark(label):
+    """Prints the time since begin() for label, when profiling is enabled."""
+    if _started is None or not os.environ.get(PROFILE_ENV):
+        return
+    print(f"{MARK_PREFIX} {label} {(time.perf_counter() - _started) * 1000:.1f} ms", file=sys.stderr, flush=True)
+
+
+def mark_first_paint(window, label, then=None):
+    """Marks label once window has been mapped and drawn; then() runs afterwards."""
+    def painted():
+        window.update_idletasks()
+        mark(label)
+        if then is not None:
+            then()
+
+    def on_map(event):
+        if event.widget is window:
+            window.unbind("<Map>", binding)
+            window.after_idle(painted)
+
+    if window.winfo_viewable():
+        window.after_idle(painted)
+        return
+    binding = window.bind("<Map>", on_map, add="+")
+
+
+def should_exit_after_paint():
+    return bool(os.environ.get(EXIT_ENV))
+
+
+# --- Measurement ---
+# The application imports this module before anything else, so the tools
+# below import what they need themselves instead of slowing every startup.
+def app_imports(script=APP_SCRIPT):
+    """The application script's top-level import statements, as source lines."""
+    import ast
+
+    with open(script, encoding="utf-8") as f:
+        source = f.read()
+    return [ast.get_source_segment(source, node) for node in ast.parse(source).body
+            if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+_BEGIN_MARKER = "-- app imports --"
+
+
+def import_breakdown(statements):
+    """Returns ({module: cumulative microseconds}, failed statements) from a fresh interpreter.
+
+    Modules are those the statements import directly, each charged what it
+    added at that point, so shared dependencies count towards whichever module
+    pulled them in first, as at startup.
+    """
+    import re
+    import subprocess
+
+    code = f"import sys\nsys.stderr.write({_BEGIN_MARKER!r} + '\\n')\n"
+    for statement in statements:
+        code += f"try:\n    {statement}\nexcept ImportError:\n    print('failed', {statement!r})\n"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=os.path.dirname(APP_SCRIPT))
+    timings = {}
+    lines = result.stderr.splitlines()
+    if _BEGIN_MARKER in lines:
+        lines = lines[lines.index(_BEGIN_MARKER) + 1:]
+    for line in lines:
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S.*)$", line)
+        if match:  # Unindented names were imported by the statements themselves
+            timings[match.group(2)] = int(match.group(1))
+    failed = [line.split(None, 1)[1] for line in result.stdout.splitlines() if line.startswith("failed ")]
+    return timings, failed
+
+
+def app_milestones():
+    """Launches the application until its login window paints; returns {milestone: ms}."""
+    import subprocess
+
+    env = dict(os.environ, **{PROFILE_ENV: "1", EXIT_ENV: "1"})
+    result = subprocess.run([sys.executable, APP_SCRIPT], capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(APP_SCRIPT), timeout=120)
+    milestones = {}
+    for line in result.stderr.splitlines():
+        if line.startswith(MARK_PREFIX):
+            label, value, _ = line[len(MARK_PREFIX):].rsplit(None, 2)
+            milestones[label.strip()] = float(value)
+    if not milestones:
+        raise RuntimeError(f"The application did not report any milestones:\n{result.stderr.strip()}")
+    return milestones
+
+
+def _median_of(runs):
+    import statistics
+
+    return {key: statistics.median(run[key] for run in runs if key in run) for key in runs[0]}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m sdms.startup", description="Measure application startup time.")
+    parser.add_argument("--app", action="store_true", help="also launch the app and time its first paint (needs a display)")
+    parser.add_argument("--runs", type=int, default=3, help="runs to take the median of (default 3)")
+    args = parser.parse_args(argv)
+
+    statements = app_imports()
+    runs, failed = [], []
+    for _ in range(args.runs):
+        timings, failed = import_breakdown(statements)
+        runs.append(timings)
+    timings = _median_of(runs)
+    print(f"Top-level imports of {os.path.basename(APP_SCRIPT)} (median of {args.runs}, -X importtime):")
+    for name, micros in sorted(timings.items(), key=lambda item: -item[1]):
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    print(f"  {sum(timings.values()) / 1000:8.1f} ms  total")
+    for statement in failed:
+        print(f"  failed (not installed?): {statement}")
+
+    if args.app:
+        milestones = _median_of([app_milestones() for _ in range(args.runs)])
+        print("Milestones since the script's first line:")
+        for label, ms in milestones.items():
+            print(f"  {ms:8.1f} ms  {label}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
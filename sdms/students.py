@@ -0,0 +1,206 @@
+"""Queries behind the student list on the Student Management tab.
+
+Rows come back as StudentRow, a namedtuple over exactly the columns the list
+and the detail form show, in the Treeview's column order, plus the photo key
+so selecting a student needs no second query. user_id and the raw picture
+columns are not read.
+
+Compare against the old SELECT s.* rows with:
+
+    python -m sdms.students benchmark --students 50000
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+
+STUDENT_PAGE_SIZE = 200
+
+# Treeview columns, in order; StudentRow adds `photo` after them
+STUDENT_LIST_FIELDS = (
+    "student_id", "roll_number", "name", "contact_number", "email", "address", "aadhaar_no",
+    "date_of_birth", "gender", "tenth_percent", "twelfth_percent", "blood_group", "mother_name",
+    "enrollment_status", "enrollment_date", "course_name", "year_name", "faculty_name",
+)
+
+_STUDENT_COLUMNS_SQL = """
+    s.student_id, s.roll_number, s.name, s.contact_number, s.email, s.address, s.aadhaar_no,
+    s.date_of_birth, s.gender, s.tenth_percent, s.twelfth_percent, s.blood_group, s.mother_name,
+    s.enrollment_status, s.enrollment_date, c.course_name, a.year_name, f.faculty_name,
+    COALESCE(s.photo_hash, s.profile_picture_path)
+"""
+
+STUDENT_JOINS_SQL = """
+    LEFT JOIN courses c ON s.course_id = c.course_id
+    LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
+    LEFT JOIN faculties f ON s.faculty_id = f.faculty_id
+"""
+
+_STUDENT_LIST_SQL = f"SELECT {_STUDENT_COLUMNS_SQL} FROM students s {STUDENT_JOINS_SQL}"
+
+
+class StudentRow(namedtuple("StudentRow", STUDENT_LIST_FIELDS + ("photo",))):
+    """One student as listed; a plain tuple underneath, so it is as small as one and JSON-encodes as a list."""
+
+    __slots__ = ()
+
+    def list_values(self):
+        """The Treeview values: None shown as N/A and enrollment status as Yes/No."""
+        values = ["N/A" if value is None else value for value in self[:len(STUDENT_LIST_FIELDS)]]
+        values[13] = "Yes" if self.enrollment_status == 1 else "No"
+        return values
+
+
+def _student_row(cursor, row):
+    return StudentRow._make(row)
+
+
+def student_select_sql(from_sql="students s", where="", order_by=""):
+    """The projected student columns with their course, year and faculty names, from from_sql."""
+    return f"SELECT {_STUDENT_COLUMNS_SQL} FROM {from_sql} {STUDENT_JOINS_SQL} {where} {order_by}"
+
+
+def fetch_student_rows(conn, query, params=()):
+    """Runs a query built from student_select_sql and returns its rows as StudentRow."""
+    cursor = conn.cursor()
+    cursor.row_factory = _student_row
+    return cursor.execute(query, params).fetchall()
+
+
+def fetch_students_page(conn, before_id=None, limit=STUDENT_PAGE_SIZE, search_term=None):
+    """Returns up to `limit` students ordered by student_id DESC.
+
+    Keyset pagination: pass the last student_id of the previous page as
+    `before_id` to get the next one. Each page is a bounded range walk of the
+    primary key, so it costs the same however many students there are.
+    """
+    conditions = []
+    params = []
+    if before_id is not None:
+        conditions.append("s.student_id < ?")
+        params.append(before_id)
+    if search_term:
+        conditions.append("(s.roll_number LIKE ? OR s.name LIKE ?)")
+        params.extend([f"%{search_term}%", f"%{search_term}%"])
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    query = student_select_sql(where=where, order_by="ORDER BY s.student_id DESC LIMIT ?")
+    params.append(limit)
+    return fetch_student_rows(conn, query, params)
+
+
+# --- Benchmark ---
+_LEGACY_LIST_SQL = """
+    SELECT s.*, c.course_name, a.year_name, f.faculty_name
+    FROM students s
+    LEFT JOIN courses c ON s.course_id = c.course_id
+    LEFT JOIN academic_years a ON s.academic_year_id = a.year_id
+    LEFT JOIN faculties f ON s.faculty_id = f.faculty_id
+"""
+
+
+def build_benchmark_database(student_rows, seed=0):
+    """An in-memory database with the application schema and fully filled-in synthetic students."""
+    import random
+
+    from sdms.migrations import migrate
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    course_ids = [row[0] for row in conn.execute("SELECT course_id FROM courses")]
+    faculty_ids = [row[0] for row in conn.execute("SELECT faculty_id FROM faculties")]
+    year_ids = [row[0] for row in conn.execute("SELECT year_id FROM academic_years")]
+    with conn:
+        conn.executemany(
+            """INSERT INTO students (roll_number, user_id, name, contact_number, email, address, aadhaar_no,
+                   date_of_birth, gender, tenth_percent, twelfth_percent, blood_group, mother_name,
+                   enrollment_status, enrollment_date, course_id, academic_year_id, faculty_id,
+                   profile_picture_path, photo_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, '2005-01-01', ?, ?, ?, 'B+', ?, 1, '2024-06-01', ?, ?, ?, ?, ?)""",
+            ((f"B{i:07d}", f"u{i}", f"Student {i}", f"98{i:08d}", f"student{i}@example.edu",
+              f"{rng.randint(1, 999)} Long Street Name, Some Locality, City {i % 50}", f"{i:012d}",
+              rng.choice(("Male", "Female")), round(rng.uniform(35, 100), 2), round(rng.uniform(35, 100), 2),
+              f"Mother {i}", rng.choice(course_ids), rng.choice(year_ids), rng.choice(faculty_ids),
+              f"C:/Users/Office/Pictures/students/photo_{i}.jpg", f"{rng.getrandbits(128):032x}")
+             for i in range(student_rows)))
+    return conn
+
+
+def _fetch_legacy(conn, limit):
+    # The former list: every column of students, page by page
+    cursor, fetched = None, []
+    while True:
+        if cursor is None:
+            rows = conn.execute(_LEGACY_LIST_SQL + " ORDER BY s.student_id DESC LIMIT ?", (limit,)).fetchall()
+        else:
+            rows = conn.execute(_LEGACY_LIST_SQL + " WHERE s.student_id < ? ORDER BY s.student_id DESC LIMIT ?",
+                                (cursor, limit)).fetchall()
+        fetched.extend(rows)
+        if len(rows) < limit:
+            return fetched
+        cursor = rows[-1][0]
+
+
+def _legacy_values(student):
+    student_data = [str(x) if x is not None else "N/A" for x in student]
+    student_data[13] = "Yes" if student[13] == 1 else "No"
+    return student_data
+
+
+def _fetch_projected(conn, limit):
+    cursor, fetched = None, []
+    while True:
+        rows = fetch_students_page(conn, cursor, limit)
+        fetched.extend(rows)
+        if len(rows) < limit:
+            return fetched
+        cursor = rows[-1].student_id
+
+
+def run_benchmark(conn, repeat=3, limit=STUDENT_PAGE_SIZE):
+    """Returns {approach: (best seconds, bytes of fetched rows)} for listing every student page by page.
+
+    The time covers fetching the rows and turning them into Treeview values.
+    The bytes are those of the rows themselves, which the list now keeps for
+    the detail form.
+    """
+    import tracemalloc
+
+    results = {}
+    for name, fetch, values in (("SELECT s.* + str()", _fetch_legacy, _legacy_values),
+                                ("projected StudentRow", _fetch_projected, StudentRow.list_values)):
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for student in fetch(conn, limit):
+                values(student)
+            times.append(time.perf_counter() - started)
+        tracemalloc.start()
+        rows = fetch(conn, limit)
+        row_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del rows
+        results[name] = (min(times), row_bytes)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sdms.students", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    bench = commands.add_parser("benchmark", help="compare projected StudentRow pages with SELECT s.* rows")
+    bench.add_argument("--students", type=int, default=50000, help="synthetic students (default 50000)")
+    bench.add_argument("--repeat", type=int, default=3, help="runs to take the best of (default 3)")
+    args = parser.parse_args(argv)
+
+    print(f"Building {args.students} students...")
+    conn = build_benchmark_database(args.students)
+    results = run_benchmark(conn, args.repeat)
+    for name, (seconds, row_bytes) in results.items():
+        print(f"{name:22} {seconds:.3f}s  {args.students / seconds:9,.0f} rows/s  "
+              f"rows {row_bytes / 2**20:6.1f} MiB ({row_bytes / args.students:.0f} B/row)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Summary tables behind the Analytics tab, kept current by triggers.
+
+Each summary holds running counts and sums per course, faculty or enrollment
+status, so an insight reads a handful of rows instead of re-aggregating the
+students or marks tables. Every summary is declared once in SUMMARIES and
+that declaration drives its triggers, its rebuild and its consistency check.
+
+Compare the summaries with the base tables, or recompute them, with:
+
+    python -m sdms.summaries check
+    python -m sdms.summaries rebuild
+"""
+import sys
+
+_MARK_RATIO = "{p}.marks_obtained * 1.0 / {p}.max_marks"
+
+# table -> (source table, key column, key expression, [(column, contribution expression)])
+# Expressions use {p} for the row: NEW/OLD in triggers, the source table in rebuilds.
+SUMMARIES = {
+    "course_student_summary": ("students", "course_id", "{p}.course_id", [
+        ("student_count", "1"),
+    ]),
+    "status_student_summary": ("students", "status", "CASE WHEN {p}.enrollment_status = 1 THEN 'Active' ELSE 'Inactive' END", [
+        ("student_count", "1"),
+    ]),
+    "faculty_student_summary": ("students", "faculty_id", "{p}.faculty_id", [
+        ("student_count", "1"),
+        ("tenth_sum", "COALESCE({p}.tenth_percent, 0)"),
+        ("tenth_count", "{p}.tenth_percent IS NOT NULL"),
+        ("twelfth_sum", "COALESCE({p}.twelfth_percent, 0)"),
+        ("twelfth_count", "{p}.twelfth_percent IS NOT NULL"),
+    ]),
+    "course_marks_summary": ("marks", "course_id", "{p}.course_id", [
+        ("mark_count", "1"),
+        ("ratio_sum", f"COALESCE({_MARK_RATIO}, 0)"),
+        ("ratio_count", f"({_MARK_RATIO}) IS NOT NULL"),
+    ]),
+}
+
+# Base-table columns whose changes move a row between or within summaries
+TRACKED_COLUMNS = {
+    "students": ("course_id", "enrollment_status", "faculty_id", "tenth_percent", "twelfth_percent"),
+    "marks": ("course_id", "marks_obtained", "max_marks"),
+}
+
+# Sums of floats drift by rounding as rows come and go; the check allows for that
+SUM_TOLERANCE = 1e-6
+
+
+def _add_sql(table, prefix):
+    _, key_column, key_expr, columns = SUMMARIES[table]
+    key = key_expr.format(p=prefix)
+    names = ", ".join(name for name, _ in columns)
+    values = ", ".join(expr.format(p=prefix) for _, expr in columns)
+    increments = ", ".join(f"{name} = {name} + excluded.{name}" for name, _ in columns)
+    return (f"INSERT INTO {table} ({key_column}, {names}) SELECT {key}, {values} WHERE {key} IS NOT NULL "
+            f"ON CONFLICT({key_column}) DO UPDATE SET {increments};")
+
+
+def _remove_sql(table, prefix):
+    _, key_column, key_expr, columns = SUMMARIES[table]
+    decrements = ", ".join(f"{name} = {name} - ({expr.format(p=prefix)})" for name, expr in columns)
+    return f"UPDATE {table} SET {decrements} WHERE {key_column} = {key_expr.format(p=prefix)};"
+
+
+def create_summary_tables(cursor):
+    """Creates the summary tables and their triggers, then fills them."""
+    for table, (_, key_column, _, columns) in SUMMARIES.items():
+        key_type = "TEXT" if table == "status_student_summary" else "INTEGER"
+        column_defs = ", ".join(
+            f"{name} REAL NOT NULL DEFAULT 0" if name.endswith("_sum") else f"{name} INTEGER NOT NULL DEFAULT 0"
+            for name, _ in columns)
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({key_column} {key_type} PRIMARY KEY, {column_defs})")
+
+    for source, tracked in TRACKED_COLUMNS.items():
+        tables = [table for table, spec in SUMMARIES.items() if spec[0] == source]
+        add_new = "\n".join(_add_sql(table, "NEW") for table in tables)
+        remove_old = "\n".join(_remove_sql(table, "OLD") for table in tables)
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {source}_summary_ai AFTER INSERT ON {source} BEGIN\n{add_new}\nEND")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {source}_summary_ad AFTER DELETE ON {source} BEGIN\n{remove_old}\nEND")
+        cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS {source}_summary_au AFTER UPDATE OF {", ".join(tracked)} ON {source} BEGIN
+{remove_old}
+{add_new}
+END""")
+    _fill_summaries(cursor)
+
+
+def _aggregate_sql(table):
+    source, _, key_expr, columns = SUMMARIES[table]
+    key = key_expr.format(p=source)
+    sums = ", ".join(f"SUM({expr.format(p=source)})" for _, expr in columns)
+    return f"SELECT {key} AS summary_key, {sums} FROM {source} WHERE summary_key IS NOT NULL GROUP BY summary_key"
+
+
+def _fill_summaries(cursor):
+    for table, (_, key_column, _, columns) in SUMMARIES.items():
+        names = ", ".join(name for name, _ in columns)
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"INSERT INTO {table} ({key_column}, {names}) {_aggregate_sql(table)}")
+
+
+def rebuild_summaries(conn):
+    """Recomputes every summary table from the base tables."""
+    if conn.in_transaction:
+        conn.commit()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")  # Keep writers out between the DELETE and the re-fill
+        _fill_summaries(conn.cursor())
+
+
+def check_summaries(conn):
+    """Returns [(table, key, stored, expected)] for every summary row that disagrees with the base tables."""
+    mismatches = []
+    for table, (_, key_column, _, columns) in SUMMARIES.items():
+        names = ", ".join(name for name, _ in columns)
+        # Rows decremented to zero, give or take float residue in the sums, are equivalent to missing ones
+        stored = {row[0]: row[1:] for row in conn.execute(f"SELECT {key_column}, {names} FROM {table}")
+                  if any(abs(value or 0) > SUM_TOLERANCE for value in row[1:])}
+        expected = {row[0]: row[1:] for row in conn.execute(_aggregate_sql(table))}
+        for key in stored.keys() | expected.keys():
+            have = stored.get(key)
+            want = expected.get(key)
+            if have is None or want is None or any(
+                    abs((a or 0) - (b or 0)) > SUM_TOLERANCE * max(1.0, abs(b or 0)) for a, b in zip(have, want)):
+                mismatches.append((table, key, have, want))
+    return mismatches
+
+
+def main(argv=None):
+    from sdms.db import get_db_connection
+    from sdms.migrations import migrate
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv not in (["check"], ["rebuild"]):
+        print("usage: python -m sdms.summaries check|rebuild", file=sys.stderr)
+        return 2
+    conn = get_db_connection()
+    migrate(conn)
+    if argv == ["rebuild"]:
+        rebuild_summaries(conn)
+        print(f"Rebuilt {len(SUMMARIES)} summary tables.")
+        return 0
+    mismatches = check_summaries(conn)
+    for table, key, stored, expected in mismatches:
+        print(f"{table} [{key}]: stored {stored}, expected {expected}")
+    if mismatches:
+        print(f"{len(mismatches)} summary rows are out of date; run 'python -m sdms.summaries rebuild'.", file=sys.stderr)
+        return 1
+    print("Summary tables are consistent.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
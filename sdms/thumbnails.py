@@ -0,0 +1,138 @@
+"""Content-addressed cache of scaled profile photos.
+
+A thumbnail is stored on disk under the SHA-1 of the source file's bytes plus
+the target size, so the same photo is only decoded and resized once no matter
+how often, or from how many paths, it is shown. The directory is kept under
+THUMBNAIL_CACHE_MAX_BYTES by evicting the least recently used files.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+THUMBNAIL_CACHE_DIR = ".thumbnail_cache"
+THUMBNAIL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class LRUCache:
+    """Small thread-safe mapping that forgets its least recently used entries."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, max_bytes=THUMBNAIL_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # (path, mtime, size) -> content hash, so unchanged files are hashed once per session
+        self._hashes = LRUCache(4096)
+        self._lock = threading.Lock()
+        self._total_bytes = None  # Measured lazily on the first write
+
+    def content_hash(self, path):
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        digest = self._hashes.get(key)
+        if digest is None:
+            sha1 = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha1.update(chunk)
+            digest = sha1.hexdigest()
+            self._hashes.put(key, digest)
+        return digest
+
+    def key(self, path, size):
+        return f"{self.content_hash(path)}_{size[0]}x{size[1]}"
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".png")
+
+    def thumbnail_path(self, path, size):
+        """Returns the path of the cached thumbnail for path at size, creating it if needed."""
+        cache_path = self._cache_path(self.key(path, size))
+        if os.path.exists(cache_path):
+            os.utime(cache_path)  # Mark as recently used for eviction
+            return cache_path
+
+        from PIL import Image  # Imported on first use; the app imports this module at startup
+
+        with Image.open(path) as source:
+            source.draft("RGB", size)  # JPEGs decode straight to a nearby smaller scale
+            thumbnail = source.resize(size, Image.LANCZOS)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write then rename so concurrent readers (threads or batch processes) never see half a file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            thumbnail.save(f, "PNG")
+        os.replace(temp_path, cache_path)
+        self._account(os.path.getsize(cache_path))
+        return cache_path
+
+    def open(self, path, size):
+        """Returns the thumbnail as a loaded PIL image."""
+        from PIL import Image
+
+        with Image.open(self.thumbnail_path(path, size)) as thumbnail:
+            thumbnail.load()
+            return thumbnail
+
+    def _account(self, added_bytes):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._total_bytes += added_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".png"):
+                    full_path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(full_path)
+                    except OSError:
+                        continue
+                    yield full_path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        """Deletes the least recently used thumbnails until the cache is at 80% of its limit."""
+        target = self.max_bytes * 0.8
+        for full_path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(full_path)
+                self._total_bytes -= size
+            except OSError:
+                pass
+
+
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,36 @@
+import sqlite3
+
+import pytest
+
+from sdms.db import close_change_trackers
+from sdms.migrations import migrate
+
+
+def student_record(roll_number, **fields):
+    """A valid record for records.insert_student, using the seeded reference data."""
+    record = {
+        "roll_number": roll_number, "name": f"Student {roll_number}", "enrollment_date": "2024-06-01",
+        "course_name": "Computer Applications", "academic_year_name": "First Year", "faculty_name": "BCA",
+    }
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """A migrated database file; the working directory is tmp_path so nothing lands in the checkout."""
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "student_database.db")
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    conn.close()
+    yield path
+    close_change_trackers()
+
+
+@pytest.fixture
+def conn(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys=ON")
+    yield conn
+    conn.close()
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from sdms.analytics import BASELINE_SQL, INSIGHTS, NO_SUBJECT, AnalyticsSnapshot
+
+pytest.importorskip("numpy")
+
+
+def assert_rows_close(actual, expected):
+    """Compares {label: tuple} results, numbers approximately and NULLs exactly."""
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert [value is None for value in actual[key]] == [value is None for value in values], key
+        assert [v for v in actual[key] if v is not None] == pytest.approx([v for v in values if v is not None]), key
+
+
+@pytest.fixture
+def marks_conn(conn):
+    rng = random.Random(0)
+    course_ids = [row[0] for row in conn.execute("SELECT course_id FROM courses")]
+    faculty_ids = [row[0] for row in conn.execute("SELECT faculty_id FROM faculties")]
+    conn.executemany(
+        "INSERT INTO students (roll_number, name, enrollment_date, course_id, faculty_id, tenth_percent, "
+        "twelfth_percent, enrollment_status) VALUES (?, ?, '2024-06-01', ?, ?, ?, ?, ?)",
+        [(f"R{i}", f"Student {i}", rng.choice(course_ids), rng.choice(faculty_ids),
+          rng.choice((None, round(rng.uniform(35, 100), 2))), round(rng.uniform(35, 100), 2), rng.random() < 0.8)
+         for i in range(200)])
+    conn.executemany(
+        "INSERT INTO marks (student_id, course_id, subject_name, semester, marks_obtained, max_marks) "
+        "VALUES (?, ?, ?, 1, ?, ?)",
+        [(rng.randint(1, 200), rng.choice(course_ids), rng.choice(("Maths", "Physics", "English")),
+          round(rng.uniform(0, 50), 1), 50) for _ in range(1000)])
+    conn.commit()
+    return conn
+
+
+def test_snapshot_matches_per_query_sql(marks_conn):
+    snapshot = AnalyticsSnapshot.load(marks_conn)
+    per_course, average, status, faculty = (marks_conn.execute(sql).fetchall() for sql in BASELINE_SQL[:4])
+
+    assert dict(snapshot.students_per_course()) == dict(per_course)
+    assert dict(snapshot.average_marks_per_course()) == pytest.approx(dict(average))
+    assert dict(snapshot.enrollment_status_breakdown()) == dict(status)
+    assert_rows_close({row[0]: row[1:] for row in snapshot.faculty_academic_performance()},
+                      {row[0]: row[1:] for row in faculty})
+
+
+def test_subject_distribution_matches_sql(marks_conn):
+    expected = {subject: (count, mean, (mean_square - mean * mean) ** 0.5)
+                for subject, count, mean, mean_square in marks_conn.execute(BASELINE_SQL[5])}
+
+    distribution = AnalyticsSnapshot.load(marks_conn).mark_distribution("subject")
+
+    assert_rows_close({row[0]: row[1:4] for row in distribution}, expected)
+
+
+def test_histogram_matches_sql(marks_conn):
+    names = dict(marks_conn.execute("SELECT course_id, course_name FROM courses"))
+    expected = {}
+    for course_id, band, count in marks_conn.execute(BASELINE_SQL[6]):
+        expected.setdefault(names[course_id], [0] * 10)[band] = count
+
+    assert dict(AnalyticsSnapshot.load(marks_conn).mark_histogram("course")) == expected
+
+
+def test_marks_without_a_subject_are_grouped_not_fatal(marks_conn):
+    marks_conn.execute("INSERT INTO marks (student_id, course_id, subject_name, semester, marks_obtained, max_marks) "
+                       "VALUES (1, 1, NULL, 1, 30, 50)")
+    marks_conn.commit()
+
+    distribution = AnalyticsSnapshot.load(marks_conn).mark_distribution("subject")
+
+    assert [row[1] for row in distribution if row[0] == NO_SUBJECT] == [1]
+    for name in INSIGHTS:
+        assert "".join(INSIGHTS[name](marks_conn))
@@ -0,0 +1,113 @@
+import csv
+import os
+import sqlite3
+
+import pytest
+
+from sdms import cli, records
+from sdms.db import manager
+
+from conftest import student_record
+
+
+@pytest.fixture
+def cli_db(conn, db_path, monkeypatch):
+    monkeypatch.setattr(manager, "database", db_path)
+    records.insert_student(conn, student_record("R1"))
+    records.insert_student(conn, student_record("R2", course_name="Science"))
+    records.add_marks(conn, "R1", "Computer Applications", "Maths", 1, 40, 50)
+    conn.commit()
+    yield db_path
+    manager.close_all()
+
+
+def test_report_prints_to_stdout(cli_db, capsys):
+    assert cli.main(["report", "enrollment"]) == 0
+
+    out = capsys.readouterr().out
+    assert "Student Enrollment Report" in out
+    assert "R1" in out and "R2" in out
+
+
+def test_marks_report_as_csv(cli_db, tmp_path):
+    path = str(tmp_path / "marks.csv")
+
+    assert cli.main(["report", "marks", "--course", "Computer Applications", "--semester", "1",
+                     "--format", "csv", "-o", path]) == 0
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[1][:3] == ["R1", "Student R1", "Maths"]
+
+
+def test_report_pdf_from_the_output_extension(cli_db, tmp_path):
+    path = str(tmp_path / "enrollment.pdf")
+
+    assert cli.main(["report", "enrollment", "-o", path]) == 0
+
+    with open(path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["report", "marks"], "needs --course and --semester"),
+    (["report", "payments", "--format", "csv"], "needs an output file"),
+    (["insights", "--name", "no-such-insight"], "Unknown insight no-such-insight"),
+    (["marks-pdfs", "--course", "Science", "--semester", "1"], "Give --output-dir, --merged or both."),
+    (["idcards", "cards.zip", "--faculty", "MCA"], "No students match"),
+])
+def test_command_errors_exit_with_status_1(cli_db, capsys, argv, message):
+    assert cli.main(argv) == 1
+
+    assert message in capsys.readouterr().err
+
+
+def test_insights_list_and_named(cli_db, capsys):
+    assert cli.main(["insights", "--list"]) == 0
+    slugs = [line.split()[0] for line in capsys.readouterr().out.splitlines()]
+    assert "students-per-course" in slugs
+
+    assert cli.main(["insights", "--name", "students-per-course"]) == 0
+    assert "Science" in capsys.readouterr().out
+
+
+def test_strict_marks_import_fails_on_rejected_rows(cli_db, tmp_path, capsys):
+    path = tmp_path / "marks.csv"
+    path.write_text("Roll No,Sem,Subject,Marks,Out Of\nR1,1,Physics,30,50\nR9,1,Physics,30,50\n")
+
+    assert cli.main(["import", str(path), "--marks"]) == 0
+    out = capsys.readouterr().out
+    assert "Imported: 1" in out and "Rejected: 1" in out
+    assert cli.main(["import", str(path), "--marks", "--strict"]) == 1
+    assert "1 rows were rejected." in capsys.readouterr().err
+
+
+def test_marks_pdfs_and_idcards(cli_db, tmp_path):
+    reports_dir = tmp_path / "reports"
+    cards = tmp_path / "cards.zip"
+
+    assert cli.main(["marks-pdfs", "--course", "Computer Applications", "--semester", "1",
+                     "--output-dir", str(reports_dir), "--workers", "1"]) == 0
+    assert cli.main(["idcards", str(cards), "--course", "Science", "--workers", "1"]) == 0
+
+    assert os.listdir(reports_dir) == ["StudentMarksReport_R1.pdf"]
+    assert cards.exists()
+
+
+def test_db_option_picks_and_migrates_the_database(cli_db, tmp_path, capsys):
+    other = str(tmp_path / "other.db")
+
+    assert cli.main(["--db", other, "report", "enrollment"]) == 0
+
+    assert "R1" not in capsys.readouterr().out
+    with sqlite3.connect(other) as other_conn:
+        assert other_conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0] > 0
+
+
+def test_module_commands_are_forwarded(cli_db, tmp_path):
+    path = str(tmp_path / "students.jsonl")
+
+    assert cli.main(["export", "table:students", path]) == 0
+
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+
+import pytest
+
+from sdms import records
+from sdms.export import ExportError, declared_column_types, detect_format, export
+from sdms.jobs import Job, JobCancelled
+from sdms.reports import MARKS_REPORT_SQL
+
+from conftest import student_record
+
+
+@pytest.fixture
+def out_dir(tmp_path):
+    path = tmp_path / "out"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def export_conn(conn):
+    for i in range(25):
+        records.insert_student(conn, student_record(f"R{i:02d}", tenth_percent=None if i % 2 == 0 else 70 + i))
+        records.add_marks(conn, f"R{i:02d}", "Computer Applications", "Maths", 1, 20 + i, 50)
+    conn.commit()
+    return conn
+
+
+def test_csv_export_streams_every_row(export_conn, out_dir):
+    path = str(out_dir / "students.csv")
+
+    count = export(export_conn, "table:students", path, batch_size=10)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert count == 25
+    assert rows[0][:2] == ["student_id", "roll_number"]
+    assert len(rows) == 26
+    assert os.listdir(out_dir) == ["students.csv"]
+
+
+def test_jsonl_marks_export(export_conn, out_dir):
+    path = str(out_dir / "marks.jsonl")
+
+    count = export(export_conn, "marks", path, course_name="Computer Applications", semester=1)
+
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert count == len(lines) == 25
+    assert lines[0].keys() == {"roll_number", "name", "subject_name", "marks_obtained", "max_marks", "grade"}
+
+
+def test_failed_export_leaves_no_part_file_and_keeps_the_old_one(export_conn, out_dir):
+    path = out_dir / "students.csv"
+    path.write_text("previous export")
+    job = Job("export")
+    job.cancel()
+
+    with pytest.raises(JobCancelled):
+        export(export_conn, "table:students", str(path), job=job)
+
+    assert os.listdir(out_dir) == ["students.csv"]
+    assert path.read_text() == "previous export"
+
+
+def test_unknown_export_and_format_are_rejected(export_conn, out_dir):
+    with pytest.raises(ExportError):
+        export(export_conn, "table:users", str(out_dir / "users.csv"))
+    with pytest.raises(ExportError):
+        export(export_conn, "table:students", str(out_dir / "students.xml"))
+    with pytest.raises(ExportError):
+        export(export_conn, "marks", str(out_dir / "marks.csv"))
+    assert os.listdir(out_dir) == []
+
+
+def test_detect_format():
+    assert [detect_format(p) for p in ("a.CSV", "a.json", "a.ndjson", "a.pq", "a.parquet")] == [
+        "csv", "jsonl", "jsonl", "parquet", "parquet"]
+
+
+def test_declared_column_types(export_conn):
+    assert declared_column_types(export_conn, MARKS_REPORT_SQL) == ["TEXT", "TEXT", "TEXT", "REAL", "REAL", "TEXT"]
+    assert declared_column_types(export_conn, "SELECT COUNT(*) AS n FROM students") == [""]
+    assert export_conn.execute("SELECT COUNT(*) FROM sqlite_temp_master").fetchone() == (0,)
+
+
+def test_parquet_schema_comes_from_declared_types(export_conn, out_dir):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(out_dir / "students.parquet")
+
+    # The first one-row batch has a NULL 10th percentage; the column type must not depend on it
+    export(export_conn, "table:students", path, batch_size=1)
+
+    schema = pq.read_schema(path)
+    assert str(schema.field("student_id").type) == "int64"
+    assert str(schema.field("tenth_percent").type) == "double"
+    assert str(schema.field("roll_number").type) == "string"
+    assert pq.read_table(path).num_rows == 25
+
+
+def test_parquet_without_pyarrow_is_an_export_error(export_conn, out_dir):
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        pytest.skip("pyarrow is installed")
+
+    with pytest.raises(ExportError):
+        export(export_conn, "table:students", str(out_dir / "students.parquet"))
+    assert os.listdir(out_dir) == []
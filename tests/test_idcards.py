@@ -0,0 +1,128 @@
+import os
+import zipfile
+
+import pytest
+from PIL import Image
+
+from sdms import records
+from sdms.idcards import (CARD_HEIGHT, CARD_WIDTH, card_file_name, fetch_id_card_students, generate_id_cards,
+                          get_id_card_template, render_id_card)
+from sdms.jobs import Job, JobCancelled
+
+from conftest import student_record
+
+
+def _students(count):
+    return [(f"Student {i}", f"R{i}", "Computer Applications", "First Year", "2005-01-01", "B+", "9800000000",
+             None, "2024-06-01") for i in range(count)]
+
+
+@pytest.fixture
+def out_dir(tmp_path):
+    path = tmp_path / "out"
+    path.mkdir()
+    return path
+
+
+def test_fetch_id_card_students_filters_by_names(conn):
+    records.insert_student(conn, student_record("R1"))
+    records.insert_student(conn, student_record("R2", course_name="Science"))
+    conn.commit()
+
+    assert [row[1] for row in fetch_id_card_students(conn)] == ["R1", "R2"]
+    assert [row[1] for row in fetch_id_card_students(conn, course_name="Science")] == ["R2"]
+    assert fetch_id_card_students(conn, faculty_name="MCA") == []
+
+
+def test_cards_to_a_folder_resume(out_dir):
+    first = generate_id_cards(_students(2), str(out_dir), "no-background.png", workers=2)
+    second = generate_id_cards(_students(4), str(out_dir), "no-background.png", workers=2)
+
+    assert (first.rendered, second.rendered, second.skipped) == (2, 2, 2)
+    assert sorted(os.listdir(out_dir)) == sorted(card_file_name(f"R{i}") for i in range(4))
+
+
+def test_zip_is_built_under_a_temporary_name(out_dir):
+    path = str(out_dir / "cards.zip")
+
+    result = generate_id_cards(_students(3), path, "no-background.png", workers=2)
+
+    assert result.rendered == 3
+    assert os.listdir(out_dir) == ["cards.zip"]
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == sorted(card_file_name(f"R{i}") for i in range(3))
+
+
+def test_resume_rebuilds_the_zip_from_intact_cards(out_dir):
+    path = str(out_dir / "cards.zip")
+    generate_id_cards(_students(3), path, "no-background.png", workers=2)
+    # Damage one card's data; its CRC no longer matches
+    data = bytearray(open(path, "rb").read())
+    position = data.find(b"IDAT")
+    data[position + 10] ^= 0xFF
+    open(path, "wb").write(data)
+
+    result = generate_id_cards(_students(5), path, "no-background.png", workers=2)
+
+    assert (result.skipped, result.rendered) == (2, 3)
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert len(archive.namelist()) == 5
+
+
+def test_interrupted_zip_keeps_the_old_archive_and_its_progress(out_dir):
+    path = str(out_dir / "cards.zip")
+    generate_id_cards(_students(2), path, "no-background.png", workers=2)
+    job = Job("cards")
+    job.cancel()
+
+    with pytest.raises(JobCancelled):
+        generate_id_cards(_students(4), path, "no-background.png", workers=1, job=job)
+
+    with zipfile.ZipFile(path) as archive:
+        assert len(archive.namelist()) == 2
+    assert os.path.exists(path + ".part")
+
+    result = generate_id_cards(_students(4), path, "no-background.png", workers=2)
+
+    assert result.skipped >= 2
+    assert os.listdir(out_dir) == ["cards.zip"]
+    with zipfile.ZipFile(path) as archive:
+        assert len(archive.namelist()) == 4
+
+
+def test_unreadable_leftover_part_is_ignored(out_dir):
+    path = str(out_dir / "cards.zip")
+    (out_dir / "cards.zip.part").write_bytes(b"not a zip")
+
+    result = generate_id_cards(_students(2), path, "no-background.png", workers=2)
+
+    assert result.rendered == 2
+    assert os.listdir(out_dir) == ["cards.zip"]
+
+
+def test_template_is_reused_until_the_background_changes(tmp_path):
+    background = tmp_path / "background.png"
+    Image.new("RGB", (800, 500), "white").save(background)
+    template = get_id_card_template(str(background))
+
+    assert get_id_card_template(str(background)) is template
+
+    Image.new("RGB", (800, 500), "yellow").save(background)
+    os.utime(background, ns=(0, 0))
+    rebuilt = get_id_card_template(str(background))
+
+    assert rebuilt is not template
+    assert rebuilt.static_layer.getpixel((5, 5)) == (255, 255, 0)
+
+
+def test_render_does_not_touch_the_cached_layer(tmp_path):
+    template = get_id_card_template(str(tmp_path / "missing.png"))
+    before = template.static_layer.tobytes()
+
+    card = render_id_card(_students(1)[0], str(tmp_path / "missing.png"))
+
+    assert card.size == (CARD_WIDTH, CARD_HEIGHT)
+    assert card.tobytes() != before
+    assert template.static_layer.tobytes() == before
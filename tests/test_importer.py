@@ -0,0 +1,76 @@
+import pytest
+
+from sdms.importer import RowError, StudentImporter, import_students, normalise_header
+
+
+def _row(roll_number, **fields):
+    row = {"roll_number": roll_number, "name": f"Student {roll_number}", "enrollment_date": "2024-06-01",
+           "course": "Computer Applications", "academic_year": "First Year", "faculty": "BCA"}
+    row.update(fields)
+    return row
+
+
+def test_normalise_header_applies_aliases():
+    assert normalise_header(" Roll No ") == "roll_number"
+    assert normalise_header("10th %") == "tenth_percent"
+    assert normalise_header("Unknown Column") == "unknown_column"
+
+
+@pytest.mark.parametrize("fields, message", [
+    ({"name": ""}, "Missing required field(s): name"),
+    ({"course": "Astrology"}, "Course 'Astrology' not found."),
+    ({"academic_year": "Tenth Year"}, "Academic Year 'Tenth Year' not found."),
+    ({"faculty": "XYZ"}, "Faculty 'XYZ' not found."),
+    ({"enrollment_date": "01/06/2024"}, "Enrollment Date '01/06/2024' is not in YYYY-MM-DD format."),
+    ({"date_of_birth": "2005-13-01"}, "Date of Birth '2005-13-01' is not in YYYY-MM-DD format."),
+    ({"tenth_percent": "abc"}, "10th % 'abc' is not a number."),
+    ({"twelfth_percent": "101"}, "12th % 101.0 is outside 0-100."),
+    ({"enrollment_status": "maybe"}, "Enrollment status 'maybe' must be Yes or No."),
+])
+def test_validate_rejects_bad_rows(conn, fields, message):
+    with pytest.raises(RowError) as excinfo:
+        StudentImporter(conn).validate(_row("R1", **fields))
+    assert str(excinfo.value) == message
+
+
+def test_validate_parses_values(conn):
+    params = StudentImporter(conn).validate(_row("R1", tenth_percent="87.5%", enrollment_status="No"))
+    assert params[0] == "R1"
+    assert params[8] == 87.5
+    assert params[12] == 0
+
+
+def test_run_reports_duplicates_within_and_against_the_table(conn):
+    conn.execute("INSERT INTO students (roll_number, name, enrollment_date, aadhaar_no) "
+                 "VALUES ('R0', 'Existing', '2024-06-01', '111122223333')")
+    conn.commit()
+    rows = [
+        (2, _row("R1")),
+        (3, _row("R1")),
+        (4, _row("R0")),
+        (5, _row("R2", aadhaar_no="111122223333")),
+        (6, _row("R3", course="Astrology")),
+        (7, _row("R4")),
+    ]
+
+    result = StudentImporter(conn, batch_size=2).run(rows)
+
+    assert result.rows_read == 6
+    assert result.inserted == 2
+    assert [line for line, _ in result.errors] == [3, 4, 5, 6]
+    assert result.errors[0][1] == "Roll Number 'R1' already exists."
+    assert {r for (r,) in conn.execute("SELECT roll_number FROM students")} == {"R0", "R1", "R4"}
+
+
+def test_import_students_reads_csv_with_aliased_headers(conn, tmp_path):
+    path = tmp_path / "students.csv"
+    path.write_text("Roll No,Student Name,Enroll Date,Course Name,Year,Faculty Name,Status\n"
+                    "R1,Asha,2024-06-01,Computer Applications,First Year,BCA,Yes\n"
+                    "\n"
+                    "R2,Ravi,2024-06-01,Science,Second Year,BBA,Inactive\n", encoding="utf-8")
+
+    result = import_students(conn, str(path))
+
+    assert (result.rows_read, result.inserted, result.errors) == (2, 2, [])
+    assert conn.execute("SELECT name, enrollment_status FROM students ORDER BY roll_number").fetchall() == [
+        ("Asha", 1), ("Ravi", 0)]
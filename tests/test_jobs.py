@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+
+from sdms.jobs import BatchResult, JobRunner
+
+
+class Scheduler:
+    """Stands in for root.after: callbacks run when the test pumps it, on the test's thread."""
+
+    def __init__(self):
+        self.pending = []
+
+    def __call__(self, ms, callback, *args):
+        self.pending.append((callback, args))
+
+    def pump(self, until, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not until():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.005)
+            pending, self.pending = self.pending, []
+            for callback, args in pending:
+                callback(*args)
+
+
+@pytest.fixture
+def runner():
+    scheduler = Scheduler()
+    runner = JobRunner(scheduler, max_workers=2)
+    runner.scheduler = scheduler
+    yield runner
+    runner.shutdown()
+
+
+def test_result_and_progress_reach_the_ui_thread(runner):
+    ui_thread = threading.get_ident()
+    delivered = []
+
+    def work(job, value):
+        job.report_progress(0.5, "half way")
+        return value * 2
+
+    runner.submit("double", work, 21,
+                  on_progress=lambda job: delivered.append(("progress", job.describe(), threading.get_ident())),
+                  on_done=lambda result: delivered.append(("done", result, threading.get_ident())))
+    runner.scheduler.pump(lambda: any(kind == "done" for kind, _, _ in delivered))
+
+    assert delivered[-1] == ("done", 42, ui_thread)
+    assert ("progress", "double (50%) - half way", ui_thread) in delivered
+    assert runner.jobs == []
+
+
+def test_error_goes_to_on_error(runner):
+    errors = []
+
+    def fail(job):
+        raise ValueError("broken")
+
+    runner.submit("fail", fail, on_done=lambda result: errors.append("done"), on_error=errors.append)
+    runner.scheduler.pump(lambda: errors)
+
+    assert [str(e) for e in errors] == ["broken"]
+
+
+def test_cancelled_job_stops_at_its_next_check(runner):
+    started = threading.Event()
+    outcomes = []
+
+    def long_job(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+            time.sleep(0.001)
+
+    job = runner.submit("long", long_job, on_done=outcomes.append, on_error=outcomes.append)
+    started.wait(5)
+    job.cancel()
+    runner.scheduler.pump(lambda: not runner.jobs)
+
+    assert outcomes == []
+
+
+def test_shutdown_cancels_running_jobs():
+    scheduler = Scheduler()
+    runner = JobRunner(scheduler, max_workers=1)
+    started = threading.Event()
+    stopped = threading.Event()
+
+    def long_job(job):
+        started.set()
+        try:
+            while True:
+                job.check_cancelled()
+                time.sleep(0.001)
+        finally:
+            stopped.set()
+
+    runner.submit("long", long_job)
+    queued = runner.submit("queued", lambda job: None)
+    started.wait(5)
+    runner.shutdown()
+
+    assert stopped.wait(5)
+    assert queued.future.cancelled()
+
+
+def test_batch_result_summary_counts():
+    result = BatchResult(5, unit="cards")
+    result.rendered, result.skipped, result.failed = 3, 1, [("R9", "bad photo")]
+
+    summary = result.summary()
+
+    assert "Cards rendered: 3" in summary
+    assert "R9: bad photo" in summary
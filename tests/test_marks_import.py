@@ -0,0 +1,112 @@
+import sys
+
+import pytest
+
+from sdms import records
+from sdms.grades import derive_grade, derive_grades
+from sdms.marks_import import MarksImporter, import_marks
+
+from conftest import student_record
+
+# Percentages on and either side of every band edge
+BAND_EDGES = [
+    (100, "O"), (90, "O"), (89.99, "A+"), (80, "A+"), (79.99, "A"), (70, "A"), (69.99, "B+"), (60, "B+"),
+    (59.99, "B"), (50, "B"), (49.99, "C"), (45, "C"), (44.99, "P"), (40, "P"), (39.99, "F"), (0, "F"),
+]
+
+
+@pytest.fixture(params=["numpy", "bisect"])
+def grade_engine(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setitem(sys.modules, "numpy", None)  # import numpy now raises ImportError
+    return request.param
+
+
+def test_derive_grades_band_edges(grade_engine):
+    percents = [percent for percent, _ in BAND_EDGES]
+
+    assert derive_grades(percents, [100] * len(percents)) == [grade for _, grade in BAND_EDGES]
+
+
+def test_derive_grades_scales_by_max_marks(grade_engine):
+    assert derive_grades([45, 22.5, 19.9], [50, 50, 50]) == ["O", "C", "F"]
+    assert derive_grade(36, 40) == "O"
+
+
+def test_derive_grades_with_custom_bands(grade_engine):
+    assert derive_grades([30, 60], [100, 100], bands=((50, "Pass"), (0, "Fail"))) == ["Fail", "Pass"]
+
+
+@pytest.fixture
+def marks_conn(conn):
+    records.insert_student(conn, student_record("R1"))
+    records.insert_student(conn, student_record("R2"))
+    conn.commit()
+    return conn
+
+
+def _row(roll_number, subject, marks, **fields):
+    row = {"roll_number": roll_number, "semester": "1", "subject": subject, "marks": str(marks), "max": "50"}
+    row.update(fields)
+    return row
+
+
+def _marks(conn):
+    return conn.execute("""
+        SELECT s.roll_number, m.subject_name, m.marks_obtained, m.grade FROM marks m
+        JOIN students s ON s.student_id = m.student_id ORDER BY 1, 2
+    """).fetchall()
+
+
+def test_repeated_key_keeps_the_last_row(marks_conn):
+    result = MarksImporter(marks_conn).run([
+        (2, _row("R1", "Maths", 10)),
+        (3, _row("R1", "Physics", 30)),
+        (4, _row("R1", "Maths", 45)),
+    ])
+
+    assert _marks(marks_conn) == [("R1", "Maths", 45.0, "O"), ("R1", "Physics", 30.0, "B+")]
+    assert (result.rows_read, result.inserted, result.updated) == (3, 2, 0)
+    assert [line for line, _ in result.errors] == [2]
+    assert "line 4" in result.errors[0][1]
+
+
+def test_counts_inserts_and_updates_separately(marks_conn):
+    MarksImporter(marks_conn).run([(2, _row("R1", "Maths", 10)), (3, _row("R2", "Maths", 20))])
+
+    result = MarksImporter(marks_conn).run([
+        (2, _row("R1", "Maths", 40)),
+        (3, _row("R2", "Physics", 25)),
+        (4, _row("R2", "Physics", 26)),
+    ])
+
+    assert (result.inserted, result.updated) == (1, 1)
+    assert "Updated: 1" in result.summary()
+    assert _marks(marks_conn) == [("R1", "Maths", 40.0, "A+"), ("R2", "Maths", 20.0, "P"),
+                                  ("R2", "Physics", 26.0, "B")]
+
+
+@pytest.mark.parametrize("row, message", [
+    (_row("R9", "Maths", 10), "Student with Roll Number 'R9' not found."),
+    (_row("R1", "Maths", 60), "Marks 60.0 out of 50.0 is not valid."),
+    (_row("R1", "Maths", "ten"), "Semester, Marks, and Max Marks must be numbers."),
+    (_row("R1", "Maths", 10, course="Astrology"), "Course 'Astrology' not found."),
+    (_row("R1", "", 10), "Missing required field(s): subject_name"),
+])
+def test_bad_rows_are_rejected(marks_conn, row, message):
+    result = MarksImporter(marks_conn).run([(2, row)])
+
+    assert result.errors == [(2, message)]
+    assert _marks(marks_conn) == []
+
+
+def test_given_grade_is_kept(marks_conn, tmp_path):
+    path = tmp_path / "marks.csv"
+    path.write_text("Roll No,Sem,Subject,Marks,Out Of,Grade\nR1,1,Maths,10,50,AB\nR2,1,Maths,50,50,\n")
+
+    result = import_marks(marks_conn, str(path))
+
+    assert (result.inserted, result.errors) == (2, [])
+    assert _marks(marks_conn) == [("R1", "Maths", 10.0, "AB"), ("R2", "Maths", 50.0, "O")]
@@ -0,0 +1,76 @@
+import os
+import sqlite3
+
+import pytest
+from PIL import Image
+
+from sdms.media import PhotoError, ingest_photo, is_photo_hash, photo_path, resolve_photo
+from sdms.migrations import migrate
+
+
+def _save_image(path, color, size=(800, 600)):
+    Image.new("RGB", size, color).save(path)
+    return str(path)
+
+
+def test_same_photo_is_stored_once(tmp_path):
+    media_dir = str(tmp_path / "media")
+    first = ingest_photo(_save_image(tmp_path / "a.png", "red"), media_dir)
+    again = ingest_photo(_save_image(tmp_path / "b.png", "red"), media_dir)
+    other = ingest_photo(_save_image(tmp_path / "c.png", "blue"), media_dir)
+
+    assert first == again != other
+    assert is_photo_hash(first)
+    stored = [name for _, _, names in os.walk(media_dir) for name in names]
+    assert sorted(stored) == sorted([first + ".jpg", other + ".jpg"])
+
+
+def test_stored_photo_is_cropped_and_bounded(tmp_path):
+    media_dir = str(tmp_path / "media")
+    photo_hash = ingest_photo(_save_image(tmp_path / "wide.png", "green", (2000, 1000)), media_dir)
+
+    with Image.open(resolve_photo(photo_hash, media_dir)) as stored:
+        assert stored.size == (600, 600)
+        assert stored.format == "JPEG"
+
+
+def test_unreadable_file_raises_photo_error(tmp_path):
+    path = tmp_path / "notes.png"
+    path.write_text("not an image")
+
+    with pytest.raises(PhotoError):
+        ingest_photo(str(path), str(tmp_path / "media"))
+
+
+def _database_with_legacy_photo(tmp_path, picture_path):
+    conn = sqlite3.connect(str(tmp_path / "student_database.db"))
+    migrate(conn, target=3)
+    conn.execute("INSERT INTO students (roll_number, name, enrollment_date, profile_picture_path) "
+                 "VALUES ('R1', 'A', '2024-06-01', ?)", (picture_path,))
+    conn.commit()
+    return conn
+
+
+def test_migration_imports_legacy_photos(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conn = _database_with_legacy_photo(tmp_path, _save_image(tmp_path / "old.png", "red"))
+
+    migrate(conn)
+
+    photo_hash, legacy_path = conn.execute("SELECT photo_hash, profile_picture_path FROM students").fetchone()
+    assert legacy_path is None
+    assert os.path.exists(photo_path(photo_hash))
+    conn.close()
+
+
+def test_migration_survives_an_unwritable_media_folder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    picture = _save_image(tmp_path / "old.png", "red")
+    (tmp_path / "media").write_text("a file where the media folder should be")
+    conn = _database_with_legacy_photo(tmp_path, picture)
+
+    migrate(conn)
+
+    assert conn.execute("SELECT photo_hash, profile_picture_path FROM students").fetchone() == (None, picture)
+    assert resolve_photo(picture) == picture
+    conn.close()
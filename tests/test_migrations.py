@@ -0,0 +1,38 @@
+import sqlite3
+
+import pytest
+
+from sdms.migrations import LATEST_VERSION, get_schema_version, migrate, schema_is_current
+from sdms.search import has_student_fts
+from sdms.summaries import check_summaries
+
+
+@pytest.mark.parametrize("start_version", range(LATEST_VERSION))
+def test_migrate_upgrades_from_every_version(tmp_path, monkeypatch, start_version):
+    monkeypatch.chdir(tmp_path)
+    conn = sqlite3.connect(str(tmp_path / "student_database.db"))
+    migrate(conn, target=start_version)
+    assert get_schema_version(conn) == start_version
+    if start_version >= 1:
+        # Data written under the old schema must survive and be picked up by later steps
+        conn.execute("INSERT INTO students (roll_number, name, enrollment_date, course_id, faculty_id) "
+                     "VALUES ('R1', 'Asha Patil', '2024-06-01', 1, 1)")
+        conn.execute("INSERT INTO marks (student_id, course_id, semester, subject_name, marks_obtained, max_marks) "
+                     "VALUES (1, 1, 1, 'Maths', 40, 50)")
+        conn.commit()
+
+    applied = migrate(conn)
+
+    assert applied == list(range(start_version + 1, LATEST_VERSION + 1))
+    assert schema_is_current(conn)
+    assert check_summaries(conn) == []
+    if start_version >= 1:
+        assert conn.execute("SELECT name FROM students WHERE roll_number = 'R1'").fetchone() == ("Asha Patil",)
+        if has_student_fts(conn):
+            assert conn.execute("SELECT COUNT(*) FROM students_fts WHERE students_fts MATCH 'asha'").fetchone() == (1,)
+    conn.close()
+
+
+def test_migrate_is_idempotent(conn):
+    assert migrate(conn) == []
+    assert get_schema_version(conn) == LATEST_VERSION
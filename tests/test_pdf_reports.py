@@ -0,0 +1,73 @@
+import os
+import re
+
+import pytest
+
+from sdms import records
+from sdms.pdf_reports import fetch_cohort_marks, generate_marks_pdfs, marks_pdf_file_name, write_report_pdf
+
+from conftest import student_record
+
+
+def _page_count(path):
+    with open(path, "rb") as f:
+        return len(re.findall(rb"/Type /Page\b", f.read()))
+
+
+@pytest.fixture
+def cohort_conn(conn):
+    for roll_number in ("R2", "R1"):
+        records.insert_student(conn, student_record(roll_number, name=f"Student {roll_number}"))
+        records.add_marks(conn, roll_number, "Computer Applications", "Physics", 1, 30, 50)
+        records.add_marks(conn, roll_number, "Computer Applications", "Maths", 1, 40, 50)
+    records.add_marks(conn, "R1", "Computer Applications", "Maths", 2, 45, 50)
+    records.insert_student(conn, student_record("R3"))
+    conn.commit()
+    return conn
+
+
+def test_fetch_cohort_marks_groups_rows_per_student(cohort_conn):
+    cohort = fetch_cohort_marks(cohort_conn, "Computer Applications", 1)
+
+    assert [(name, roll_number, [row[0] for row in rows]) for name, roll_number, rows in cohort] == [
+        ("Student R1", "R1", ["Maths", "Physics"]),
+        ("Student R2", "R2", ["Maths", "Physics"]),
+    ]
+    assert cohort[0][2][0] == ("Maths", 1, 40.0, 50.0, "A+")
+
+
+def test_per_student_and_merged_pdfs(cohort_conn, tmp_path):
+    cohort = fetch_cohort_marks(cohort_conn, "Computer Applications", 1)
+    output_dir = tmp_path / "reports"
+    merged_path = str(tmp_path / "all.pdf")
+
+    result = generate_marks_pdfs(cohort, str(output_dir), merged_path, workers=2)
+
+    assert (result.rendered, result.failed) == (2, [])
+    assert sorted(os.listdir(output_dir)) == [marks_pdf_file_name("R1"), marks_pdf_file_name("R2")]
+    assert _page_count(merged_path) == 2
+    with open(merged_path, "rb") as f:
+        assert b"R2 - Student R2" in f.read()
+
+
+def test_merged_pdf_alone(cohort_conn, tmp_path):
+    cohort = fetch_cohort_marks(cohort_conn, "Computer Applications", 1)
+
+    result = generate_marks_pdfs(cohort, merged_path=str(tmp_path / "all.pdf"))
+
+    assert result.rendered == 2
+    assert _page_count(str(tmp_path / "all.pdf")) == 2
+    assert not os.path.exists(str(tmp_path / "all.pdf.part"))
+
+
+def test_marks_pdf_file_name_is_safe():
+    assert marks_pdf_file_name("BCA/21 01") == "StudentMarksReport_BCA_21_01.pdf"
+
+
+def test_write_report_pdf_paginates(tmp_path):
+    path = str(tmp_path / "report.pdf")
+
+    write_report_pdf((f"line {i}\n" for i in range(200)), path)
+
+    assert _page_count(path) == 4
+    assert not os.path.exists(path + ".part")
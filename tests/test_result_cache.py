@@ -0,0 +1,89 @@
+import sqlite3
+
+from sdms import records
+from sdms.db import commit_changes
+from sdms.result_cache import ResultCache
+
+from conftest import student_record
+
+
+def _student_count_report(cache):
+    def make_lines(conn):
+        yield str(conn.execute("SELECT COUNT(*) FROM students").fetchone()[0])
+    return cache.cached("student_count", ("students",), make_lines)
+
+
+def test_repeated_report_is_served_from_cache(conn):
+    cache = ResultCache()
+    report = _student_count_report(cache)
+
+    assert list(report(conn)) == ["0"]
+    assert list(report(conn)) == ["0"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_commit_to_a_read_table_invalidates(conn):
+    cache = ResultCache()
+    report = _student_count_report(cache)
+    list(report(conn))
+
+    records.insert_student(conn, student_record("R1"))
+    commit_changes(conn, "students")
+
+    assert list(report(conn)) == ["1"]
+    assert cache.stats()["misses"] == 2
+
+
+def test_commit_to_another_table_keeps_the_entry(conn):
+    cache = ResultCache()
+    report = _student_count_report(cache)
+    list(report(conn))
+
+    records.add_feedback(conn, "A", "a@example.edu", "Looks good")
+    commit_changes(conn, "feedback")
+
+    assert list(report(conn)) == ["0"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_commit_from_another_connection_invalidates(conn, db_path):
+    cache = ResultCache()
+    report = _student_count_report(cache)
+    list(report(conn))
+
+    other = sqlite3.connect(db_path)
+    records.insert_student(other, student_record("R1"))
+    other.commit()  # Not through commit_changes: only data_version sees it
+    other.close()
+
+    assert list(report(conn)) == ["1"]
+
+
+def test_databases_are_cached_separately(conn, tmp_path):
+    cache = ResultCache()
+    report = _student_count_report(cache)
+    records.insert_student(conn, student_record("R1"))
+    commit_changes(conn, "students")
+    list(report(conn))
+
+    from sdms.migrations import migrate
+    other = sqlite3.connect(str(tmp_path / "other.db"))
+    migrate(other)
+
+    assert list(report(other)) == ["0"]
+    assert list(report(conn)) == ["1"]
+    other.close()
+
+
+def test_in_memory_database_is_never_cached():
+    cache = ResultCache()
+    report = _student_count_report(cache)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE students (student_id INTEGER PRIMARY KEY)")
+
+    list(report(conn))
+    conn.execute("INSERT INTO students DEFAULT VALUES")
+    conn.commit()
+
+    assert list(report(conn)) == ["1"]
+    assert cache.stats()["hits"] == 0
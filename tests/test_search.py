@@ -0,0 +1,21 @@
+import pytest
+
+from sdms import records
+from sdms.search import has_student_fts, row_matches, search_students_page
+
+from conftest import student_record
+
+
+@pytest.mark.parametrize("search_term", ["asha", "pat as", "bca-2024", "sun", "98765", "ravi", "patil ravi", "example"])
+def test_row_matches_agrees_with_the_index(conn, search_term):
+    if not has_student_fts(conn):
+        pytest.skip("SQLite built without FTS5")
+    records.insert_student(conn, student_record("BCA-2024-07", name="Asha Patil", email="asha.p@example.edu",
+                                                contact_number="9876543210", mother_name="Sunita Patil"))
+    records.insert_student(conn, student_record("BBA-2023-01", name="Ravi Kumar", email="ravi@college.edu"))
+    conn.commit()
+
+    found, _ = search_students_page(conn, search_term)
+    students, _ = search_students_page(conn, "edu")
+
+    assert {s.student_id for s in students if row_matches(s, search_term)} == {s.student_id for s in found}
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from sdms import db
+from sdms.records import RecordError, fetch_student
+from sdms.server import WriteBatcher
+
+from conftest import student_record
+
+
+@pytest.fixture
+def batcher(db_path, monkeypatch):
+    # The writer thread opens its connection from the shared pool, pointed at the test database
+    monkeypatch.setattr(db.manager, "database", db_path)
+    batcher = WriteBatcher(batch_size=10)
+    batcher.start()
+    yield batcher
+    batcher.stop()
+    db.manager.close_all()
+
+
+def test_write_batcher_round_trip(batcher, conn):
+    student_id = batcher.submit("add_student", student_record("R1"))
+    batcher.submit("add_marks", "R1", "Computer Applications", "Maths", 1, 40, 50)
+    receipt = batcher.submit("record_payment", "R1", 1500.0, "Cash")
+
+    assert fetch_student(conn, student_id).roll_number == "R1"
+    assert conn.execute("SELECT subject_name, grade FROM marks WHERE student_id = ?", (student_id,)).fetchall() == [
+        ("Maths", "A+")]
+    assert receipt["amount_paid"] == 1500.0
+
+
+def test_failed_write_does_not_undo_its_batch(batcher, conn):
+    errors = []
+
+    def submit(roll_number):
+        try:
+            batcher.submit("add_student", student_record(roll_number))
+        except RecordError as e:
+            errors.append(e)
+
+    # Concurrent submissions land in the same group commit; the duplicate roll number fails alone
+    threads = [threading.Thread(target=submit, args=(roll,)) for roll in ("R1", "R2", "R2", "R3")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 1
+    assert {r for (r,) in conn.execute("SELECT roll_number FROM students")} == {"R1", "R2", "R3"}
+
+
+def test_write_batcher_raises_the_operation_error(batcher):
+    with pytest.raises(RecordError):
+        batcher.submit("add_student", student_record("R1", name=""))
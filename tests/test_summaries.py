@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from sdms.summaries import check_summaries, rebuild_summaries
+
+
+def _random_student_values(rng, course_ids, faculty_ids):
+    return {
+        "course_id": rng.choice(course_ids + [None]),
+        "faculty_id": rng.choice(faculty_ids + [None]),
+        "enrollment_status": rng.choice((0, 1)),
+        "tenth_percent": rng.choice((None, round(rng.uniform(35, 100), 2))),
+        "twelfth_percent": rng.choice((None, round(rng.uniform(35, 100), 2))),
+    }
+
+
+def _random_mark_values(rng, course_ids):
+    max_marks = rng.choice((50.0, 100.0))
+    return {
+        "course_id": rng.choice(course_ids),
+        "marks_obtained": round(rng.uniform(0, max_marks), 1),
+        "max_marks": max_marks,
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_summaries_follow_random_writes(conn, seed):
+    rng = random.Random(seed)
+    course_ids = [row[0] for row in conn.execute("SELECT course_id FROM courses")]
+    faculty_ids = [row[0] for row in conn.execute("SELECT faculty_id FROM faculties")]
+    next_roll = 0
+
+    for _ in range(400):
+        student_ids = [row[0] for row in conn.execute("SELECT student_id FROM students")]
+        mark_ids = [row[0] for row in conn.execute("SELECT mark_id FROM marks")]
+        action = rng.choice(("insert_student", "update_student", "delete_student",
+                             "insert_mark", "update_mark", "delete_mark"))
+        if action == "insert_student" or not student_ids:
+            values = _random_student_values(rng, course_ids, faculty_ids)
+            next_roll += 1
+            conn.execute(f"INSERT INTO students (roll_number, name, enrollment_date, {', '.join(values)}) "
+                         f"VALUES (?, ?, '2024-06-01', {', '.join('?' * len(values))})",
+                         [f"R{next_roll}", f"Student {next_roll}"] + list(values.values()))
+        elif action == "update_student":
+            values = _random_student_values(rng, course_ids, faculty_ids)
+            columns = rng.sample(sorted(values), rng.randint(1, len(values)))
+            conn.execute(f"UPDATE students SET {', '.join(f'{c} = ?' for c in columns)} WHERE student_id = ?",
+                         [values[c] for c in columns] + [rng.choice(student_ids)])
+        elif action == "delete_student":
+            student_id = rng.choice(student_ids)
+            conn.execute("DELETE FROM marks WHERE student_id = ?", (student_id,))
+            conn.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
+        elif action == "insert_mark" or not mark_ids:
+            values = _random_mark_values(rng, course_ids)
+            conn.execute("INSERT INTO marks (student_id, semester, subject_name, course_id, marks_obtained, max_marks) "
+                         "VALUES (?, 1, 'Maths', ?, ?, ?)", [rng.choice(student_ids)] + list(values.values()))
+        elif action == "update_mark":
+            values = _random_mark_values(rng, course_ids)
+            columns = rng.sample(sorted(values), rng.randint(1, len(values)))
+            conn.execute(f"UPDATE marks SET {', '.join(f'{c} = ?' for c in columns)} WHERE mark_id = ?",
+                         [values[c] for c in columns] + [rng.choice(mark_ids)])
+        else:
+            conn.execute("DELETE FROM marks WHERE mark_id = ?", (rng.choice(mark_ids),))
+        if rng.random() < 0.1:
+            conn.commit()
+    conn.commit()
+
+    assert check_summaries(conn) == []
+
+
+def test_rebuild_repairs_summaries(conn):
+    conn.execute("INSERT INTO students (roll_number, name, enrollment_date, course_id) VALUES ('R1', 'A', '2024-06-01', 1)")
+    conn.execute("UPDATE course_student_summary SET student_count = student_count + 5")
+    conn.commit()
+    assert check_summaries(conn)
+
+    rebuild_summaries(conn)
+    assert check_summaries(conn) == []
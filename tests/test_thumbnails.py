@@ -0,0 +1,71 @@
+import os
+import shutil
+
+from PIL import Image
+
+from sdms.thumbnails import LRUCache, ThumbnailCache
+
+
+def _save_noise(path, size=(200, 200)):
+    # Random pixels keep every photo distinct and its PNG thumbnail about the same size
+    Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(path)
+    return str(path)
+
+
+def _cached_files(cache_dir):
+    return sorted(name for _, _, names in os.walk(cache_dir) for name in names)
+
+
+def test_lru_cache_drops_the_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert len(cache) == 2
+
+
+def test_same_photo_under_two_paths_is_scaled_once(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "cache"))
+    first = _save_noise(tmp_path / "a.png")
+    copy = str(tmp_path / "copy.png")
+    shutil.copyfile(first, copy)
+
+    path = cache.thumbnail_path(first, (80, 80))
+
+    assert cache.thumbnail_path(copy, (80, 80)) == path
+    assert cache.thumbnail_path(first, (40, 40)) != path
+    assert len(_cached_files(tmp_path / "cache")) == 2
+    with Image.open(path) as thumbnail:
+        assert thumbnail.size == (80, 80)
+
+
+def test_changed_file_gets_a_new_thumbnail(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "cache"))
+    photo = _save_noise(tmp_path / "a.png")
+    before = cache.thumbnail_path(photo, (80, 80))
+
+    _save_noise(photo)
+    os.utime(photo, ns=(0, 0))
+
+    assert cache.thumbnail_path(photo, (80, 80)) != before
+
+
+def test_least_recently_used_thumbnails_are_evicted(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    photos = [_save_noise(tmp_path / f"{i}.png") for i in range(3)]
+    sizing = ThumbnailCache(str(tmp_path / "sizing"))
+    size = os.path.getsize(sizing.thumbnail_path(photos[0], (100, 100)))
+    cache = ThumbnailCache(cache_dir, max_bytes=int(size * 2.8))
+
+    oldest = cache.thumbnail_path(photos[0], (100, 100))
+    os.utime(oldest, (1, 1))
+    kept = cache.thumbnail_path(photos[1], (100, 100))
+    os.utime(kept, (2, 2))
+    newest = cache.thumbnail_path(photos[2], (100, 100))
+
+    assert not os.path.exists(oldest)
+    assert os.path.exists(kept) and os.path.exists(newest)
+    assert sum(os.path.getsize(p) for p in (kept, newest)) <= cache.max_bytes